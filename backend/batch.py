@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+from urllib.parse import urlencode
+
+from starlette.middleware.exceptions import ExceptionMiddleware
+
+from fastjson import dumps
+
+logger = logging.getLogger(__name__)
+
+# Request headers that describe the enclosing request's own body or transport
+# rather than the client, so sub-requests don't inherit them
+HOP_HEADERS = frozenset((
+    b"content-length", b"content-type", b"content-encoding", b"accept-encoding",
+    b"transfer-encoding", b"connection", b"expect",
+))
+# Scope keys a sub-request shares with the enclosing request
+SHARED_SCOPE = ("asgi", "http_version", "scheme", "server", "client", "root_path", "app", "state")
+
+
+def query_string(params: Mapping[str, Any], query: str = "") -> str:
+    """Encode ``params`` (a list value repeats the key) after any query already in the path"""
+    pairs = []
+    for key, value in params.items():
+        for item in value if isinstance(value, (list, tuple)) else (value,):
+            pairs.append((key, str(item).lower() if isinstance(item, bool) else str(item)))
+    encoded = urlencode(pairs)
+    return f"{query}&{encoded}" if query and encoded else query or encoded
+
+
+class BatchDispatcher:
+    """Run API requests given as data through an app's routes, concurrently.
+
+    Each sub-request is its own ASGI call to ``app.router``: it skips the
+    middleware (CORS, compression, metrics) the enclosing request has
+    already been through, but errors are turned into responses by the app's
+    exception handlers just as they would be for a direct request. Each one
+    gets ``timeout`` seconds, so a streaming endpoint can't hold up the rest.
+    """
+
+    def __init__(self, app, timeout: float = 10.0):
+        self.app = app
+        self.timeout = timeout
+        self._handler = None
+        self.batches = 0
+        self.requests = 0
+        self.timeouts = 0
+
+    @property
+    def handler(self):
+        # Built on first use, once every route and exception handler is registered
+        if self._handler is None:
+            handlers = {
+                key: value for key, value in self.app.exception_handlers.items()
+                if key not in (500, Exception)
+            }
+            self._handler = ExceptionMiddleware(self.app.router, handlers=handlers)
+        return self._handler
+
+    async def run(self, scope: dict, requests: Sequence[dict]) -> bytes:
+        """JSON body listing the response to each of ``requests``, in order.
+
+        ``scope`` is the enclosing request's; its headers are passed on to
+        every sub-request, overridden by the sub-request's own. JSON response
+        bodies are embedded as they were rendered, without decoding them.
+        """
+        self.batches += 1
+        self.requests += len(requests)
+        results = await asyncio.gather(*(self._dispatch(scope, request) for request in requests))
+        return b'{"responses":[' + b",".join(results) + b"]}"
+
+    async def _dispatch(self, outer: dict, request: dict) -> bytes:
+        try:
+            status, headers, body = await asyncio.wait_for(self._call(outer, request), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            status, body = 504, dumps({"detail": "Batched request timed out"})
+            headers = {"content-type": "application/json"}
+        except Exception as e:
+            logger.error(f"Batched {request['method']} {request['path']} failed: {str(e)}")
+            status, body = 500, dumps({"detail": "Internal Server Error"})
+            headers = {"content-type": "application/json"}
+
+        content_type = headers.pop("content-type", "")
+        if not body:
+            body = b"null"
+        elif not content_type.startswith("application/json"):
+            body = dumps(body.decode("utf-8", "replace"))
+        head = dumps({"id": request.get("id"), "status": status, "headers": headers})
+        return head[:-1] + b',"body":' + body + b"}"
+
+    async def _call(self, outer: dict, request: dict) -> Tuple[int, Dict[str, str], bytes]:
+        path, _, query = request["path"].partition("?")
+        headers: Dict[bytes, bytes] = {
+            name: value for name, value in outer["headers"] if name not in HOP_HEADERS
+        }
+        for name, value in (request.get("headers") or {}).items():
+            headers[name.lower().encode("latin-1")] = value.encode("latin-1")
+        body = b""
+        if request.get("body") is not None:
+            body = dumps(request["body"])
+            headers[b"content-type"] = b"application/json"
+            headers[b"content-length"] = str(len(body)).encode()
+
+        scope = {key: outer[key] for key in SHARED_SCOPE if key in outer}
+        scope.update({
+            "type": "http",
+            "method": request["method"],
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query_string(request.get("params") or {}, query).encode(),
+            "headers": list(headers.items()),
+        })
+
+        received = False
+        finished = asyncio.Event()
+
+        async def receive() -> dict:
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Like a client that stays connected until the response is complete
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        status = 500
+        response_headers: Dict[str, str] = {}
+        chunks: List[bytes] = []
+
+        async def send(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", []):
+                    if name != b"content-length":
+                        response_headers[name.decode("latin-1")] = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.handler(scope, receive, send)
+        finally:
+            finished.set()
+        return status, response_headers, b"".join(chunks)
+
+    def stats(self) -> dict:
+        return {"batches": self.batches, "requests": self.requests, "timeouts": self.timeouts}
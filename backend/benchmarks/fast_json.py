@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Requests/sec for GET /api/projects with and without FAST_RESPONSES.
+
+Drives the ASGI app in-process (no network, no Mongo) against an in-memory
+projects collection, so the numbers isolate validation and JSON encoding.
+
+    python benchmarks/fast_json.py --projects 10000 --requests 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("STORAGE_ENGINE", "memory")
+os.environ.setdefault("DB_NAME", "portfolio_benchmark")
+
+import fastjson  # noqa: E402
+import server  # noqa: E402
+from database import DatabaseManager  # noqa: E402
+from models import Project  # noqa: E402
+
+
+class StaticCursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, *args, **kwargs):
+        return self
+
+    async def __aiter__(self):
+        for doc in self._docs:
+            # Motor hands out a fresh dict per document
+            yield dict(doc)
+
+
+class StaticCollection:
+    def __init__(self, docs=()):
+        self._docs = list(docs)
+
+    async def find_one(self, *args, **kwargs):
+        return dict(self._docs[0]) if self._docs else None
+
+    def find(self, *args, **kwargs):
+        return StaticCursor(self._docs)
+
+
+class StaticDatabase:
+    def __init__(self, projects):
+        self.projects = StaticCollection(projects)
+        self.portfolio = StaticCollection()
+        self.skills = StaticCollection()
+        self.experience = StaticCollection()
+        self.contact_messages = StaticCollection()
+        self.portfolio_snapshot = StaticCollection()
+        self.content_versions = StaticCollection()
+        self.project_facets = StaticCollection()
+        self.tombstones = StaticCollection()
+
+
+async def asgi_get(app, path):
+    """Minimal ASGI GET returning (status, body length)"""
+    status = 0
+    size = 0
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, size
+
+
+async def run(fast, requests):
+    server.FAST_RESPONSES = fast
+    status, size = await asgi_get(server.app, "/api/projects")
+    assert status == 200, status
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await asgi_get(server.app, "/api/projects")
+    elapsed = time.perf_counter() - start
+    return requests / elapsed, elapsed / requests * 1000, size
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    projects = [
+        Project(
+            title=f"Project {i}",
+            description="Integrated marketing campaign with performance tracking and optimization.",
+            technologies=["Social Media", "Campaign Management", "ROI Analysis"],
+            category=("Strategy", "Campaign", "Design", "Analytics")[i % 4],
+            image="https://images.unsplash.com/photo-1611224923853-80b023f02d71?w=500&q=80",
+        ).dict()
+        for i in range(args.projects)
+    ]
+    server.db_manager = DatabaseManager(StaticDatabase(projects))
+
+    print(f"GET /api/projects with {args.projects} documents, {args.requests} requests "
+          f"(orjson {'available' if fastjson.orjson is not None else 'missing'})")
+    print(f"{'mode':<10}{'req/s':>10}{'ms/req':>10}{'bytes':>12}")
+    for label, fast in (("stock", False), ("fast", True)):
+        rps, latency, size = await run(fast, args.requests)
+        print(f"{label:<10}{rps:>10.1f}{latency:>10.1f}{size:>12}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
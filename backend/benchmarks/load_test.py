@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Load test: mixed read/write workloads against the API at fixed concurrency.
+
+Closed-loop workers issue portfolio reads, project listings, message pages
+and contact submissions in the proportions of a workload, either straight
+into the ASGI app (in-process, no network) or over HTTP to a local uvicorn
+process. Storage is seeded with N projects and N contact messages for each
+dataset scale. Each run reports requests/sec, p50/p95/p99 latency and the
+server process's memory, and writes a JSON results file; --compare checks
+it against an earlier one and exits 1 on regressions.
+
+    python benchmarks/load_test.py --scales 10,1000,100000 --concurrency 1,10,50
+    python benchmarks/load_test.py --target uvicorn --workloads mixed --duration 10
+    python benchmarks/load_test.py --compare benchmarks/results/<earlier run>.json
+
+The memory engine is used unless STORAGE_ENGINE is set. Against MongoDB,
+DB_NAME is emptied and reseeded, so point it at a scratch database.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import random
+import resource
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCHMARKS_DIR.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("STORAGE_ENGINE", "memory")
+os.environ.setdefault("DB_NAME", "portfolio_benchmark")
+os.environ.setdefault("CONTACT_SPOOL_DIR", str(Path(tempfile.gettempdir()) / "portfolio_load_test_spool"))
+# Every worker shares one client address and few senders; keep the abuse controls out of the way
+for name in ("CONTACT_IP_BURST", "CONTACT_IP_RATE_PER_MINUTE", "CONTACT_EMAIL_BURST", "CONTACT_EMAIL_RATE_PER_MINUTE"):
+    os.environ.setdefault(name, "1000000000")
+
+from fastjson import dumps  # noqa: E402
+from models import ContactMessage, Experience, Portfolio, Project, Skills  # noqa: E402
+from seed_data import SEED_EXPERIENCE_DATA, SEED_PORTFOLIO_DATA, SEED_SKILLS_DATA  # noqa: E402
+
+# Relative weights of each operation
+WORKLOADS = {
+    "read": {"portfolio": 70, "projects": 20, "messages": 10},
+    "mixed": {"portfolio": 55, "projects": 20, "messages": 5, "contact": 20},
+    "write": {"contact": 100},
+}
+SEED_CHUNK = 1000
+
+Send = Callable[[str, str, Optional[bytes]], Awaitable[int]]
+
+
+def build_request(op: str, worker: int, seq: int) -> Tuple[str, str, Optional[bytes]]:
+    if op == "portfolio":
+        return "GET", "/api/portfolio", None
+    if op == "projects":
+        return "GET", "/api/projects", None
+    if op == "messages":
+        return "GET", "/api/contact/messages?limit=50", None
+    if op == "contact":
+        # Unique per request so duplicate suppression never answers from memory
+        return "POST", "/api/contact/messages", dumps({
+            "name": f"Load Test {worker}",
+            "email": f"load{worker}-{seq}@example.com",
+            "subject": "Benchmark enquiry",
+            "message": f"Message {seq} from worker {worker}. " * 4,
+        })
+    raise ValueError(f"Unknown operation {op!r}")
+
+
+# Seeding
+
+def generated_projects(start: int, stop: int) -> List[dict]:
+    return [
+        Project(
+            title=f"Project {i}",
+            description="Integrated marketing campaign with performance tracking and optimization.",
+            technologies=["Social Media", "Campaign Management", "ROI Analysis"],
+            category=("Strategy", "Campaign", "Design", "Analytics")[i % 4],
+            image="https://images.unsplash.com/photo-1611224923853-80b023f02d71?w=500&q=80",
+        ).dict()
+        for i in range(start, stop)
+    ]
+
+
+def generated_messages(start: int, stop: int, now: datetime) -> List[dict]:
+    return [
+        ContactMessage(
+            name=f"Visitor {i}",
+            email=f"visitor{i}@example.com",
+            subject="Collaboration",
+            message="I'd love to talk about a campaign for our product launch next quarter.",
+            created_at=now - timedelta(seconds=i),
+            status=("unread", "read", "replied")[i % 3],
+        ).dict()
+        for i in range(start, stop)
+    ]
+
+
+async def seed_storage(db_manager, scale: int) -> None:
+    """Replace all content with the seed portfolio plus ``scale`` projects and messages"""
+    for collection in (
+        db_manager.portfolio_collection,
+        db_manager.skills_collection,
+        db_manager.experience_collection,
+        db_manager.projects_collection,
+        db_manager.messages_collection,
+        db_manager.facets_collection,
+        db_manager.tombstones_collection,
+    ):
+        await collection.delete_many({})
+    await db_manager.delete_portfolio_snapshot()
+
+    await db_manager.create_or_update_portfolio(Portfolio(**SEED_PORTFOLIO_DATA).dict())
+    await db_manager.create_or_update_skills(Skills(**SEED_SKILLS_DATA).dict())
+    await db_manager.create_experience_many([Experience(**exp).dict() for exp in SEED_EXPERIENCE_DATA])
+    now = datetime.utcnow()
+    for start in range(0, scale, SEED_CHUNK):
+        stop = min(start + SEED_CHUNK, scale)
+        await db_manager.create_projects_many(generated_projects(start, stop))
+        await db_manager.create_contact_messages_many(generated_messages(start, stop, now))
+
+
+async def prepare_server(server, scale: int) -> None:
+    # Let submissions from the previous scale land before their collection is emptied
+    while server.contact_queue.stats()["unflushed"]:
+        await asyncio.sleep(0.05)
+    await seed_storage(server.db_manager, scale)
+    server.contact_dedup._seen.clear()
+    await server.refresh_portfolio_snapshot()
+
+
+def create_app():
+    """uvicorn --factory entry point: the server app, seeded to $LOAD_TEST_SCALE on startup"""
+    import server
+
+    async def seed_for_load_test():
+        await prepare_server(server, int(os.environ.get("LOAD_TEST_SCALE", "10")))
+
+    server.app.add_event_handler("startup", seed_for_load_test)
+    return server.app
+
+
+# Transports
+
+def asgi_sender(app, accept_encoding: str) -> Send:
+    """Call the ASGI app directly, reading (and discarding) the whole body"""
+    headers = [
+        (b"host", b"benchmark"),
+        (b"content-type", b"application/json"),
+        (b"accept-encoding", accept_encoding.encode()),
+    ]
+
+    async def send_request(method: str, target: str, body: Optional[bytes]) -> int:
+        path, _, query = target.partition("?")
+        status = 0
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("benchmark", 80),
+        }
+        received = False
+
+        async def receive():
+            nonlocal received
+            if received:
+                # Only reached by streaming responses watching for a disconnect
+                await asyncio.Event().wait()
+            received = True
+            return {"type": "http.request", "body": body or b"", "more_body": False}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await app(scope, receive, send)
+        return status
+
+    return send_request
+
+
+def http_sender(client, accept_encoding: str) -> Send:
+    headers = {"content-type": "application/json", "accept-encoding": accept_encoding}
+
+    async def send_request(method: str, target: str, body: Optional[bytes]) -> int:
+        async with client.stream(method, target, content=body, headers=headers) as response:
+            # Raw bytes, so the client never spends time decompressing
+            async for _ in response.aiter_raw():
+                pass
+            return response.status_code
+
+    return send_request
+
+
+# Measurement
+
+def process_memory(pid: int) -> Dict[str, Optional[float]]:
+    """Resident and peak resident set size in MiB"""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            fields = dict(line.split(":", 1) for line in status if ":" in line)
+        return {
+            "rss_mb": round(int(fields["VmRSS"].split()[0]) / 1024, 1),
+            "peak_mb": round(int(fields["VmHWM"].split()[0]) / 1024, 1),
+        }
+    except (OSError, KeyError, ValueError):
+        if pid != os.getpid():
+            return {"rss_mb": None, "peak_mb": None}
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak /= 1024 * 1024 if sys.platform == "darwin" else 1024
+        return {"rss_mb": None, "peak_mb": round(peak, 1)}
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    if len(samples) == 1:
+        cuts = samples * 99
+    else:
+        cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "mean": round(statistics.fmean(samples), 3),
+        "p50": round(cuts[49], 3),
+        "p95": round(cuts[94], 3),
+        "p99": round(cuts[98], 3),
+        "max": round(max(samples), 3),
+    }
+
+
+async def run_workload(
+    send: Send, workload: str, concurrency: int, duration: float, max_requests: int, seed: int
+) -> dict:
+    ops = list(WORKLOADS[workload])
+    weights = [WORKLOADS[workload][op] for op in ops]
+    latencies: Dict[str, List[float]] = {op: [] for op in ops}
+    errors: Dict[str, int] = {op: 0 for op in ops}
+    issued = 0
+
+    async def worker(index: int) -> None:
+        nonlocal issued
+        rng = random.Random(seed * 1000 + index)
+        seq = 0
+        while time.perf_counter() < deadline and (not max_requests or issued < max_requests):
+            issued += 1
+            seq += 1
+            op = rng.choices(ops, weights)[0]
+            method, target, body = build_request(op, index, seq)
+            began = time.perf_counter()
+            try:
+                status = await send(method, target, body)
+            except Exception:
+                status = 0
+            latencies[op].append((time.perf_counter() - began) * 1000)
+            if not 200 <= status < 300:
+                errors[op] += 1
+
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    every = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "requests": len(every),
+        "errors": sum(errors.values()),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(every) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": percentiles(every),
+        "ops": {
+            op: {"requests": len(latencies[op]), "errors": errors[op], **percentiles(latencies[op])}
+            for op in ops
+            if latencies[op]
+        },
+    }
+
+
+async def warm_up(send: Send, workload: str) -> None:
+    """One request per operation so snapshot, caches and lazy imports are ready"""
+    for op in WORKLOADS[workload]:
+        await send(*build_request(op, -1, 0))
+
+
+async def run_matrix(send: Send, pid: int, target: str, scale: int, args) -> List[dict]:
+    rows = []
+    for workload in args.workloads:
+        await warm_up(send, workload)
+        for concurrency in args.concurrency:
+            result = await run_workload(
+                send, workload, concurrency, args.duration, args.max_requests, args.seed
+            )
+            row = {
+                "target": target,
+                "scale": scale,
+                "workload": workload,
+                "concurrency": concurrency,
+                **result,
+                "memory": process_memory(pid),
+            }
+            print_row(row)
+            rows.append(row)
+    return rows
+
+
+# Targets
+
+async def run_inprocess(args) -> List[dict]:
+    import server
+
+    for handler in server.app.router.on_startup:
+        await handler()
+    send = asgi_sender(server.app, args.accept_encoding)
+    rows = []
+    try:
+        for scale in args.scales:
+            await prepare_server(server, scale)
+            rows += await run_matrix(send, os.getpid(), "inprocess", scale, args)
+    finally:
+        for handler in server.app.router.on_shutdown:
+            await handler()
+    return rows
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_ready(client, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+        try:
+            if (await client.get("/api/")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"uvicorn did not become ready within {timeout:.0f}s")
+
+
+async def run_uvicorn(args) -> List[dict]:
+    import httpx
+
+    rows = []
+    for scale in args.scales:
+        port = free_port()
+        process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "load_test:create_app", "--factory",
+                "--app-dir", str(BENCHMARKS_DIR), "--host", "127.0.0.1", "--port", str(port),
+                "--log-level", "warning", "--no-access-log",
+            ],
+            cwd=BACKEND_DIR,
+            env={**os.environ, "LOAD_TEST_SCALE": str(scale)},
+        )
+        limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+        try:
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=args.timeout
+            ) as client:
+                await wait_until_ready(client, process, args.startup_timeout)
+                send = http_sender(client, args.accept_encoding)
+                rows += await run_matrix(send, process.pid, "uvicorn", scale, args)
+        finally:
+            process.send_signal(signal.SIGINT)
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return rows
+
+
+# Reporting
+
+def print_header() -> None:
+    print(f"{'target':<10}{'scale':>8} {'workload':<8}{'conc':>5}{'req/s':>10}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}{'rss MiB':>9}")
+
+
+def print_row(row: dict) -> None:
+    latency = row["latency_ms"]
+    rss = row["memory"]["rss_mb"]
+    print(f"{row['target']:<10}{row['scale']:>8} {row['workload']:<8}{row['concurrency']:>5}"
+          f"{row['rps']:>10.1f}{latency['p50']:>9.2f}{latency['p95']:>9.2f}{latency['p99']:>9.2f}"
+          f"{row['errors']:>8}{rss if rss is not None else '-':>9}", flush=True)
+
+
+def git_state() -> Dict[str, Optional[object]]:
+    def git(*command):
+        try:
+            return subprocess.run(
+                ["git", *command], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(status) if status is not None else None}
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "storage_engine": os.environ["STORAGE_ENGINE"],
+        "orjson": importlib.util.find_spec("orjson") is not None,
+        "brotli": importlib.util.find_spec("brotli") is not None,
+        "fast_responses": os.environ.get("FAST_RESPONSES", "0") == "1",
+    }
+
+
+def row_key(row: dict) -> Tuple:
+    return row["target"], row["scale"], row["workload"], row["concurrency"]
+
+
+def compare(baseline: dict, rows: List[dict], threshold: float) -> int:
+    """Print throughput and p95 changes against ``baseline``; returns the number of regressions"""
+    previous = {row_key(row): row for row in baseline.get("results", [])}
+    base_commit = (baseline.get("git") or {}).get("commit") or "unknown"
+    print(f"\nCompared with {base_commit[:12]} (regression: req/s down or p95 up by more than {threshold:.0%})")
+    print(f"{'target':<10}{'scale':>8} {'workload':<8}{'conc':>5}{'req/s':>10}{'p95':>10}")
+    regressions = 0
+    compared = 0
+    for row in rows:
+        old = previous.get(row_key(row))
+        if old is None or not old["rps"] or not old["latency_ms"]["p95"]:
+            continue
+        compared += 1
+        rps_change = row["rps"] / old["rps"] - 1
+        p95_change = row["latency_ms"]["p95"] / old["latency_ms"]["p95"] - 1
+        regressed = rps_change < -threshold or p95_change > threshold
+        regressions += regressed
+        print(f"{row['target']:<10}{row['scale']:>8} {row['workload']:<8}{row['concurrency']:>5}"
+              f"{rps_change:>+10.1%}{p95_change:>+10.1%}{'  REGRESSION' if regressed else ''}")
+    if not compared:
+        print("(no runs with the same target, scale, workload and concurrency)")
+    return regressions
+
+
+def int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def workload_list(value: str) -> List[str]:
+    names = [part for part in value.split(",") if part]
+    unknown = [name for name in names if name not in WORKLOADS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown workload(s) {', '.join(unknown)}; choose from {', '.join(WORKLOADS)}")
+    return names
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", choices=("inprocess", "uvicorn", "both"), default="inprocess")
+    parser.add_argument("--scales", type=int_list, default=[10, 1000, 100000], help="projects and messages to seed, comma separated")
+    parser.add_argument("--workloads", type=workload_list, default=list(WORKLOADS), help=f"any of {', '.join(WORKLOADS)}")
+    parser.add_argument("--concurrency", type=int_list, default=[1, 10, 50], help="concurrent clients, comma separated")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per workload and concurrency level")
+    parser.add_argument("--max-requests", type=int, default=0, help="stop a run early after this many requests")
+    parser.add_argument("--accept-encoding", default="identity", help="Accept-Encoding sent with every request")
+    parser.add_argument("--timeout", type=float, default=60.0, help="HTTP request timeout (uvicorn target)")
+    parser.add_argument("--startup-timeout", type=float, default=300.0, help="seconds to wait for uvicorn to seed and start")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the operation mix")
+    parser.add_argument("--output", type=Path, help="results file (default benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+    args = parser.parse_args()
+
+    targets = ("inprocess", "uvicorn") if args.target == "both" else (args.target,)
+    if "uvicorn" in targets and (importlib.util.find_spec("uvicorn") is None or importlib.util.find_spec("httpx") is None):
+        print("The uvicorn target needs the uvicorn and httpx packages", file=sys.stderr)
+        return 2
+
+    git = git_state()
+    started_at = datetime.utcnow()
+    print_header()
+    rows = []
+    for target in targets:
+        rows += await (run_inprocess(args) if target == "inprocess" else run_uvicorn(args))
+
+    results = {
+        "benchmark": "load_test",
+        "started_at": started_at.isoformat(),
+        "git": git,
+        "environment": environment(),
+        "config": {
+            "workloads": {name: WORKLOADS[name] for name in args.workloads},
+            "duration_s": args.duration,
+            "max_requests": args.max_requests,
+            "accept_encoding": args.accept_encoding,
+            "seed": args.seed,
+        },
+        "results": rows,
+    }
+    output = args.output or BENCHMARKS_DIR / "results" / (
+        f"{(git['commit'] or 'nogit')[:12]}{'-dirty' if git['dirty'] else ''}-{started_at:%Y%m%dT%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        return 1 if compare(json.loads(args.compare.read_text()), rows, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
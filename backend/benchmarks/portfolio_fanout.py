@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for assembling the /api/portfolio payload.
+
+Compares the original one-after-another reads against
+DatabaseManager.get_portfolio_parts, which issues the four reads
+concurrently, and against reading the materialized snapshot (one read),
+using collections that sleep to simulate Mongo round trips.
+
+    python benchmarks/portfolio_fanout.py --latency-ms 5 --iterations 200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import DatabaseManager  # noqa: E402
+from fastjson import dumps  # noqa: E402
+from models import Experience, Portfolio, PortfolioResponse, Project, Skills  # noqa: E402
+from seed_data import (  # noqa: E402
+    SEED_EXPERIENCE_DATA,
+    SEED_PORTFOLIO_DATA,
+    SEED_PROJECTS_DATA,
+    SEED_SKILLS_DATA,
+)
+from snapshot import load_portfolio_data  # noqa: E402
+
+
+class LatencyCursor:
+    def __init__(self, docs, delay):
+        self._docs = docs
+        self._delay = delay
+
+    def sort(self, *args, **kwargs):
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        # One simulated round trip for the first batch
+        await asyncio.sleep(self._delay())
+        for doc in self._docs:
+            yield dict(doc)
+
+
+class LatencyCollection:
+    def __init__(self, docs, latency, jitter):
+        self._docs = docs
+        self._latency = latency
+        self._jitter = jitter
+
+    def _delay(self):
+        return max(0.0, random.gauss(self._latency, self._jitter))
+
+    async def find_one(self, *args, **kwargs):
+        await asyncio.sleep(self._delay())
+        return dict(self._docs[0]) if self._docs else None
+
+    def find(self, *args, **kwargs):
+        return LatencyCursor(self._docs, self._delay)
+
+
+class LatencyDatabase:
+    def __init__(self, latency, jitter):
+        collections = {
+            "portfolio": [Portfolio(**SEED_PORTFOLIO_DATA).dict()],
+            "skills": [Skills(**SEED_SKILLS_DATA).dict()],
+            "experience": [Experience(**e).dict() for e in SEED_EXPERIENCE_DATA],
+            "projects": [Project(**p).dict() for p in SEED_PROJECTS_DATA],
+            "contact_messages": [],
+            "portfolio_snapshot": [],
+            "content_versions": [],
+            "project_facets": [],
+            "tombstones": [],
+        }
+        for name, docs in collections.items():
+            setattr(self, name, LatencyCollection(docs, latency, jitter))
+
+
+async def sequential_parts(db_manager):
+    portfolio = await db_manager.get_portfolio()
+    skills = await db_manager.get_skills()
+    experience = await db_manager.get_all_experience()
+    projects = await db_manager.get_all_projects()
+    return portfolio, skills, experience, projects
+
+
+async def measure(load, db_manager, iterations, concurrency):
+    samples = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await load(db_manager)
+            samples.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(iterations)))
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "mean": statistics.fmean(samples),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    db = LatencyDatabase(args.latency_ms / 1000, args.jitter_ms / 1000)
+    db_manager = DatabaseManager(db)
+    data = await load_portfolio_data(db_manager)
+    db.portfolio_snapshot._docs.append({"body": dumps(PortfolioResponse(**data).dict())})
+
+    results = {
+        "sequential": await measure(sequential_parts, db_manager, args.iterations, args.concurrency),
+        "concurrent": await measure(DatabaseManager.get_portfolio_parts, db_manager, args.iterations, args.concurrency),
+        "snapshot": await measure(DatabaseManager.get_portfolio_snapshot, db_manager, args.iterations, args.concurrency),
+    }
+
+    print(f"simulated round trip: {args.latency_ms}ms ± {args.jitter_ms}ms, "
+          f"{args.iterations} loads at concurrency {args.concurrency}")
+    print(f"{'strategy':<12}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<12}{stats['p50']:>10.2f}{stats['p99']:>10.2f}{stats['mean']:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Query latency of the in-process search index (GET /api/search).
+
+Builds a SearchIndex over synthetic projects whose words follow a Zipf
+distribution, like real text, and times single-word, multi-word and prefix
+queries with the result cache cleared, so each one is ranked from scratch.
+
+    python benchmarks/search_index.py --documents 1000,5000,20000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from search import SearchIndex  # noqa: E402
+
+
+def corpus(count, rng, vocabulary, weights):
+    def words(n):
+        return " ".join(rng.choices(vocabulary, weights, k=n))
+
+    return [
+        {
+            "id": str(i),
+            "title": words(rng.randint(3, 6)),
+            "description": words(rng.randint(15, 40)),
+            "technologies": [words(1) for _ in range(3)],
+            "category": rng.choice(("Strategy", "Campaign", "Design", "Analytics")),
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", default="1000,5000,20000", help="index sizes, comma separated")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    vocabulary = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 10))) for _ in range(3000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    queries = {
+        "common word": vocabulary[0],
+        "mid word": vocabulary[50],
+        "rare word": vocabulary[1000],
+        "two words": f"{vocabulary[3]} {vocabulary[40]}",
+        "prefix": vocabulary[200][:3],
+    }
+
+    print(f"{'documents':>10}{'build ms':>10}  " + "".join(f"{name:>14}" for name in queries))
+    for count in (int(part) for part in args.documents.split(",")):
+        index = SearchIndex()
+        docs = corpus(count, rng, vocabulary, weights)
+        started = time.perf_counter()
+        index.add_many("project", docs)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        cells = []
+        for query in queries.values():
+            index.search(query)
+            samples = []
+            for _ in range(args.repeat):
+                index._cache.clear()
+                started = time.perf_counter()
+                index.search(query)
+                samples.append((time.perf_counter() - started) * 1000)
+            cells.append(f"{statistics.median(samples):>11.3f} ms")
+        print(f"{count:>10}{build_ms:>10.0f}  " + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import asyncio
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Deque, List, Optional, Tuple
+
+from fastjson import dumps
+
+
+def sse_frame(event_id: str, event: str, data: Any) -> bytes:
+    """One Server-Sent Events message; compact JSON never contains a raw newline"""
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (event_id.encode(), event.encode(), dumps(data))
+
+
+class EventBroadcaster:
+    """Fan events out to any number of SSE subscribers from a single log.
+
+    ``publish`` encodes the event once, appends it to a bounded in-memory log
+    and wakes every waiting subscriber with one Event; it never awaits, so a
+    writer is never held up by readers. Each subscriber walks the log at its
+    own pace from its own position. One that falls more than ``history``
+    events behind (or reconnects with a Last-Event-ID that has aged out, or
+    came from another process) gets a ``reset`` event telling it to reload
+    the list, and carries on from the newest event. Event ids are
+    ``<boot id>-<sequence>`` so a reconnecting client resumes exactly where
+    it stopped.
+    """
+
+    def __init__(self, history: int = 1000, heartbeat: float = 15.0, retry_ms: int = 3000):
+        self.boot_id = uuid.uuid4().hex[:12]
+        self.heartbeat = heartbeat
+        self.retry_ms = retry_ms
+        self._log: Deque[Tuple[int, bytes]] = deque(maxlen=history)
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self.subscribers = 0
+        self.published = 0
+        self.resets = 0
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.boot_id}-{seq}"
+
+    def _parse_event_id(self, last_event_id: Optional[str]) -> Optional[int]:
+        """Sequence number of a Last-Event-ID from this process, else None"""
+        boot_id, _, seq = (last_event_id or "").partition("-")
+        if boot_id != self.boot_id or not seq.isdigit():
+            return None
+        return min(int(seq), self._seq)
+
+    def publish(self, event: str, data: Any) -> str:
+        self._seq += 1
+        self._log.append((self._seq, sse_frame(self.event_id(self._seq), event, data)))
+        self.published += 1
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
+        return self.event_id(self._seq)
+
+    def _since(self, position: int) -> Optional[List[Tuple[int, bytes]]]:
+        """Events after ``position``, or None if some of them already left the log"""
+        if position >= self._seq:
+            return []
+        if not self._log or self._log[0][0] > position + 1:
+            return None
+        # Sequence numbers in the log are contiguous
+        start = len(self._log) - (self._seq - position)
+        return [self._log[i] for i in range(start, len(self._log))]
+
+    def _reset(self, reason: str) -> bytes:
+        self.resets += 1
+        return sse_frame(self.event_id(self._seq), "reset", {"reason": reason})
+
+    async def subscribe(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """Encoded SSE frames for one client, with keep-alive comments while idle"""
+        self.subscribers += 1
+        try:
+            # Sent at once so the client sees the response start before the first event
+            yield b"retry: %d\n: connected\n\n" % self.retry_ms
+            position = self._seq
+            if last_event_id:
+                resumed = self._parse_event_id(last_event_id)
+                if resumed is None:
+                    yield self._reset("unknown_last_event_id")
+                else:
+                    position = resumed
+            while True:
+                wakeup = self._wakeup
+                pending = self._since(position)
+                if pending is None:
+                    position = self._seq
+                    yield self._reset("lagged")
+                    continue
+                if pending:
+                    for seq, frame in pending:
+                        position = seq
+                        yield frame
+                    continue
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+        finally:
+            self.subscribers -= 1
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self.subscribers,
+            "published": self.published,
+            "resets": self.resets,
+            "history": len(self._log),
+        }
@@ -0,0 +1,236 @@
+import gzip
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional; only gzip is offered
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def accepted_encodings(header: Optional[str]) -> set:
+    """Codings an Accept-Encoding header allows (q=0 entries excluded)"""
+    accepted = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding)
+    return accepted
+
+
+class CompressedCache:
+    """LRU of compressed bodies keyed by (path, query, ETag, encoding), bounded in bytes"""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def set(self, key: Tuple, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= len(previous)
+        self._entries[key] = body
+        self.bytes += len(body)
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class _StreamCompressor:
+    """Incremental compressor; each chunk is flushed so streamed lines arrive promptly"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """gzip/brotli responses negotiated through Accept-Encoding.
+
+    Bodies under ``minimum_size``, non-text types and responses that already
+    carry a Content-Encoding (e.g. precompressed static exports) pass through.
+    A complete 200 GET response with an ETag is compressed once per
+    (path, query, ETag, encoding) and served from ``cache`` afterwards, so an
+    unchanged payload is never recompressed. Streamed bodies are compressed
+    chunk by chunk. The ETag is weakened (W/) on compressed GET responses, as
+    the bytes differ from the identity representation; other methods keep
+    theirs, as the version tags writes return are sent back in If-Match.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        cache: Optional[CompressedCache] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = cache if cache is not None else CompressedCache()
+
+    def _choose(self, scope: Scope) -> Optional[str]:
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding"))
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = self._choose(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        streamer: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, streamer, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 304)
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Hold the start until the first body chunk shows the size
+                    start = message
+                return
+
+            if message["type"] != "http.response.body":
+                if streamer is None and start is not None:
+                    # e.g. http.response.pathsend: the server sends the body,
+                    # so the held start goes out as it was
+                    passthrough = True
+                    await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if streamer is None:
+                headers = MutableHeaders(raw=start["headers"])
+                if not more_body:
+                    if len(body) < self.minimum_size:
+                        passthrough = True
+                        await send(start)
+                        await send(message)
+                        return
+                    compressed = self._complete_body(scope, start, headers, body, encoding)
+                    self._mark_encoded(scope, headers, encoding)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+
+                streamer = _StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+                self._mark_encoded(scope, headers, encoding)
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                await send(start)
+
+            chunk = streamer.compress(body) if body else b""
+            if not more_body:
+                chunk += streamer.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _complete_body(self, scope: Scope, start: Message, headers: MutableHeaders, body: bytes, encoding: str) -> bytes:
+        etag = headers.get("etag")
+        if not etag or start["status"] != 200 or scope["method"] != "GET":
+            return self._compress(body, encoding)
+        key = (scope["path"], scope.get("query_string", b""), etag, encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = self._compress(body, encoding)
+            self.cache.set(key, compressed)
+        return compressed
+
+    @staticmethod
+    def _mark_encoded(scope: Scope, headers: MutableHeaders, encoding: str) -> None:
+        headers["Content-Encoding"] = encoding
+        vary = headers.get("vary")
+        if not vary:
+            headers["Vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower():
+            headers["Vary"] = f"{vary}, Accept-Encoding"
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/") and scope["method"] == "GET":
+            headers["ETag"] = f"W/{etag}"
@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional, Union
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Clients must revalidate on every use, which is exactly when the ETag pays off
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(version: str) -> str:
+    return f'"{version}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of If-None-Match against the current ETag, per RFC 9110"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def version_etag(version: int) -> str:
+    """ETag for a single versioned document, as used with If-Match on writes"""
+    return make_etag(f"v{version}")
+
+
+def if_match_version(request: Request) -> Optional[Union[int, str]]:
+    """Expected document version from If-Match: None if absent, "*" or an int.
+
+    Raises ValueError for tags that can never match (weak or foreign ETags),
+    which callers should answer with 412 Precondition Failed.
+    """
+    header = request.headers.get("if-match")
+    if header is None:
+        return None
+    header = header.strip()
+    if header == "*":
+        return "*"
+    if header.startswith('"v') and header.endswith('"') and header[2:-1].isdigit():
+        return int(header[2:-1])
+    raise ValueError(f"If-Match does not name a document version: {header}")
+
+
+def last_modified(docs: Iterable[Optional[dict]]) -> Optional[datetime]:
+    """Newest updated_at/created_at across the given documents"""
+    newest = None
+    for doc in docs:
+        if not doc:
+            continue
+        for field in ("updated_at", "created_at"):
+            value = doc.get(field)
+            if isinstance(value, datetime) and (newest is None or value > newest):
+                newest = value
+    return newest
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Stored timestamps are naive UTC (datetime.utcnow)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def not_modified_since(request: Request, modified: Optional[datetime]) -> bool:
+    """If-Modified-Since check; only consulted when no If-None-Match was sent"""
+    if modified is None or "if-none-match" in request.headers:
+        return False
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return _as_utc(modified).replace(microsecond=0) <= _as_utc(since)
+
+
+def validator_headers(etag: str, modified: Optional[datetime] = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(modified), usegmt=True)
+    return headers
+
+
+def not_modified(etag: str, modified: Optional[datetime] = None) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, modified))
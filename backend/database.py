@@ -1,10 +1,90 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import List, Optional
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from typing import AsyncIterator, Collection, Dict, List, Optional, Sequence, Tuple, Type, Union
+from pydantic import BaseModel
 from models import *
+from singleflight import SingleFlight, coalesce
+import asyncio
 import os
-from datetime import datetime
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+# Portfolio and skills are single documents pinned to this _id, so concurrent
+# first writes collide on the primary key instead of inserting duplicates
+SINGLETON_ID = "singleton"
+
+# Project fields with precomputed value counts (see update_project_facets);
+# the count of all projects is kept under FACET_TOTAL
+FACET_FIELDS = ("category", "technologies")
+FACET_TOTAL = "total"
+
+# Experience, projects, skills and portfolio writes are stamped with a
+# change_seq from this counter (in content_versions), and deletes leave a
+# tombstone carrying one, so GET /api/changes can return just what changed
+CHANGE_SEQ_ID = "change_seq"
+TOMBSTONE_RETENTION = timedelta(days=int(os.environ.get('TOMBSTONE_RETENTION_DAYS', '30')))
+
+def projection(model: Type[BaseModel], fields: Optional[Sequence[str]] = None) -> dict:
+    """Mongo projection returning only ``fields`` (default: every model field), never _id"""
+    return {"_id": 0, **{field: 1 for field in (fields or model_fields(model))}}
 
 class DatabaseManager:
+    # Declarative index spec per collection, applied idempotently on startup.
+    # Names are explicit so check_indexes can diff against what exists.
+    INDEXES: Dict[str, List[IndexModel]] = {
+        # Singletons are keyed on _id (see SINGLETON_ID)
+        "portfolio": [],
+        "skills": [],
+        "portfolio_snapshot": [],
+        "content_versions": [],
+        # One counter document per (field, value), keyed on _id
+        "project_facets": [],
+        "tombstones": [
+            IndexModel([("change_seq", ASCENDING)], name="change_seq"),
+            IndexModel(
+                [("deleted_at", ASCENDING)],
+                name="deleted_at_ttl",
+                expireAfterSeconds=int(TOMBSTONE_RETENTION.total_seconds()),
+            ),
+        ],
+        "experience": [
+            IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+            IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
+            IndexModel([("change_seq", ASCENDING)], name="change_seq"),
+            IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+            # Used by SEARCH_ENGINE=text; weights mirror search.SEARCH_FIELDS
+            IndexModel(
+                [("position", TEXT), ("company", TEXT), ("responsibilities", TEXT)],
+                name="text_search",
+                weights={"position": 3, "company": 2, "responsibilities": 1},
+            ),
+        ],
+        "projects": [
+            IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+            IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
+            IndexModel([("change_seq", ASCENDING)], name="change_seq"),
+            IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+            # Facet filters on GET /api/projects, newest first
+            IndexModel([("category", ASCENDING), ("created_at", DESCENDING)], name="category_created_at_desc"),
+            IndexModel([("technologies", ASCENDING), ("created_at", DESCENDING)], name="technologies_created_at_desc"),
+            IndexModel(
+                [("title", TEXT), ("technologies", TEXT), ("description", TEXT)],
+                name="text_search",
+                weights={"title": 3, "technologies": 2, "description": 1},
+            ),
+        ],
+        "contact_messages": [
+            IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+            IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_desc"),
+            IndexModel(
+                [("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+                name="status_created_at_desc",
+            ),
+        ],
+    }
+    
     def __init__(self, db):
         self.db = db
         self.portfolio_collection = db.portfolio
@@ -12,71 +92,549 @@ class DatabaseManager:
         self.experience_collection = db.experience
         self.projects_collection = db.projects
         self.messages_collection = db.contact_messages
+        self.snapshot_collection = db.portfolio_snapshot
+        self.versions_collection = db.content_versions
+        self.facets_collection = db.project_facets
+        self.tombstones_collection = db.tombstones
+        self.flight = SingleFlight()
+        # This process's copy of the shared per-collection write counters in
+        # content_versions (see publish_change), so read endpoints can answer
+        # conditional requests without a query. Tags built from them match
+        # across workers and restarts; the document's epoch changes with the
+        # database, so a replaced one never reuses a tag.
+        self.boot_id = uuid.uuid4().hex[:12]
+        self.epoch: Optional[str] = None
+        self.versions = {
+            "portfolio": 0,
+            "skills": 0,
+            "experience": 0,
+            "projects": 0,
+            "portfolio_snapshot": 0,
+        }
+    
+    def mark_changed(self, *collections: str) -> None:
+        """Note a write to ``collections``, by this worker or another"""
+        # A read started before the write may return what it replaced; reads
+        # from now on must not join it
+        self.flight.forget(*collections)
+    
+    async def publish_change(self, *collections: str) -> None:
+        """mark_changed, plus bump the shared counters every worker's content versions follow"""
+        self.mark_changed(*collections)
+        update = {
+            "$inc": {name: 1 for name in collections},
+            "$setOnInsert": {"epoch": uuid.uuid4().hex[:12]},
+        }
+        try:
+            shared = await self.versions_collection.find_one_and_update(
+                {"_id": SINGLETON_ID}, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Lost a race with another first write; the document exists now
+            shared = await self.versions_collection.find_one_and_update(
+                {"_id": SINGLETON_ID}, update, return_document=ReturnDocument.AFTER
+            )
+        self.apply_shared_versions(shared)
+    
+    async def get_shared_versions(self) -> dict:
+        versions = await self.versions_collection.find_one({"_id": SINGLETON_ID}, {"_id": 0})
+        return versions or {}
+    
+    async def load_shared_versions(self) -> None:
+        """Adopt the shared counters, first giving the document an epoch if it has none"""
+        try:
+            await self.versions_collection.update_one(
+                {"_id": SINGLETON_ID, "epoch": {"$exists": False}},
+                {"$set": {"epoch": uuid.uuid4().hex[:12]}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            # The document exists and already has an epoch
+            pass
+        self.apply_shared_versions(await self.get_shared_versions())
+    
+    def apply_shared_versions(self, shared: Optional[dict]) -> None:
+        """Take on counters read from content_versions; within an epoch they only move forward"""
+        epoch = (shared or {}).get("epoch")
+        if epoch is None:
+            return
+        floor = self.versions if epoch == self.epoch else {}
+        self.epoch = epoch
+        self.versions = {
+            name: max(floor.get(name, 0), shared.get(name, 0)) for name in self.versions
+        }
+    
+    def content_version(self, *collections: str) -> str:
+        # Until the shared counters are loaded, tags are only valid in this process
+        counters = "-".join(str(self.versions[name]) for name in collections)
+        return f"{self.epoch or self.boot_id}-{counters}"
+    
+    # Change tracking (GET /api/changes)
+    async def next_change_seq(self, count: int = 1) -> int:
+        """Reserve ``count`` consecutive change sequence numbers and return the first"""
+        update = {"$inc": {"seq": count}}
+        try:
+            counter = await self.versions_collection.find_one_and_update(
+                {"_id": CHANGE_SEQ_ID}, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Lost a race with another first write; the counter exists now
+            counter = await self.versions_collection.find_one_and_update(
+                {"_id": CHANGE_SEQ_ID}, update, return_document=ReturnDocument.AFTER
+            )
+        return counter["seq"] - count + 1
+    
+    async def get_change_seq(self) -> int:
+        """The last change sequence number handed out"""
+        counter = await self.versions_collection.find_one({"_id": CHANGE_SEQ_ID})
+        return counter["seq"] if counter else 0
+    
+    async def _stamp_changes(self, documents: List[dict]) -> List[dict]:
+        """Copies of ``documents`` to insert, each with its own change_seq.
+
+        updated_at is set on the originals too, as it's part of the API model.
+        """
+        if not documents:
+            return []
+        first = await self.next_change_seq(len(documents))
+        now = datetime.utcnow()
+        stamped = []
+        for offset, document in enumerate(documents):
+            document["updated_at"] = now
+            stamped.append({**document, "change_seq": first + offset})
+        return stamped
+    
+    async def _record_deletions(self, collection: str, ids: List[str]) -> None:
+        """Leave a tombstone for each deleted document, kept for TOMBSTONE_RETENTION"""
+        if not ids:
+            return
+        first = await self.next_change_seq(len(ids))
+        now = datetime.utcnow()
+        await self.tombstones_collection.insert_many([
+            {"collection": collection, "id": doc_id, "change_seq": first + offset, "deleted_at": now}
+            for offset, doc_id in enumerate(ids)
+        ])
+    
+    async def get_changes(
+        self,
+        since: Optional[int] = None,
+        changed_since: Optional[datetime] = None,
+        seen: Collection[int] = (),
+    ) -> List[dict]:
+        """Writes to experience, projects, skills and portfolio after change ``since``, oldest first.
+
+        Each is ``{"collection", "id", "seq", "changed_at", "op": "upsert", "document"}``
+        with the document as it is now, or ``"op": "delete"`` from a tombstone.
+        Documents and tombstones stamped at or after ``changed_since`` are
+        included whatever their change_seq, for writes that reserved a lower
+        number but landed after the caller's previous read; changes numbered
+        in ``seen`` are left out, as the caller has them already. Without
+        ``since`` every current document is returned, and no tombstones.
+        """
+        def changed(timestamp: str) -> dict:
+            if since is None:
+                return {}
+            clauses = [{"change_seq": {"$gt": since}}]
+            if changed_since is not None:
+                clauses.append({timestamp: {"$gte": changed_since}})
+            query = {"$or": clauses}
+            if seen:
+                query["change_seq"] = {"$nin": list(seen)}
+            return query
+        
+        async def documents(name: str, collection, model: Type[BaseModel], query: dict) -> List[dict]:
+            found = []
+            async for doc in collection.find(query, {**projection(model), "change_seq": 1}):
+                # Documents written before changes were tracked have no change_seq
+                seq = doc.pop("change_seq", 0)
+                found.append({
+                    "collection": name,
+                    "id": doc["id"],
+                    "seq": seq,
+                    "changed_at": doc.get("updated_at"),
+                    "op": "upsert",
+                    "document": doc,
+                })
+            return found
+        
+        async def tombstones() -> List[dict]:
+            found = []
+            if since is None:
+                return found
+            async for tombstone in self.tombstones_collection.find(changed("deleted_at"), {"_id": 0}):
+                found.append({
+                    "collection": tombstone["collection"],
+                    "id": tombstone["id"],
+                    "seq": tombstone["change_seq"],
+                    "changed_at": tombstone["deleted_at"],
+                    "op": "delete",
+                })
+            return found
+        
+        batches = await asyncio.gather(
+            documents("portfolio", self.portfolio_collection, Portfolio, {**changed("updated_at"), "_id": SINGLETON_ID}),
+            documents("skills", self.skills_collection, Skills, {**changed("updated_at"), "_id": SINGLETON_ID}),
+            documents("experience", self.experience_collection, Experience, changed("updated_at")),
+            documents("projects", self.projects_collection, Project, changed("updated_at")),
+            tombstones(),
+        )
+        changes = [change for batch in batches for change in batch]
+        changes.sort(key=lambda change: change["seq"])
+        return changes
+    
+    # Index management
+    async def ensure_indexes(self) -> Dict[str, List[str]]:
+        """Create any index in INDEXES that doesn't exist yet; safe to re-run"""
+        created = {}
+        for name, indexes in self.INDEXES.items():
+            created[name] = await self.db[name].create_indexes(indexes) if indexes else []
+        return created
+    
+    async def check_indexes(self) -> Dict[str, dict]:
+        """Report spec indexes that are missing and existing ones never used"""
+        report = {}
+        for name, indexes in self.INDEXES.items():
+            collection = self.db[name]
+            expected = {index.document["name"] for index in indexes}
+            existing = set(await collection.index_information())
+            usage = {}
+            async for stats in collection.aggregate([{"$indexStats": {}}]):
+                usage[stats["name"]] = stats["accesses"]["ops"]
+            report[name] = {
+                "missing": sorted(expected - existing),
+                "unexpected": sorted(existing - expected - {"_id_"}),
+                "unused": sorted(n for n, ops in usage.items() if ops == 0 and n != "_id_"),
+            }
+        return report
     
     # Portfolio CRUD Operations
+    @coalesce("portfolio")
     async def get_portfolio(self) -> Optional[dict]:
-        portfolio = await self.portfolio_collection.find_one({})
+        portfolio = await self.portfolio_collection.find_one(
+            {"_id": SINGLETON_ID}, projection(Portfolio)
+        )
         return portfolio
     
-    async def create_or_update_portfolio(self, portfolio_data: dict) -> dict:
-        existing = await self.portfolio_collection.find_one({})
-        if existing:
-            portfolio_data['updated_at'] = datetime.utcnow()
-            await self.portfolio_collection.update_one(
-                {"_id": existing["_id"]}, 
-                {"$set": portfolio_data}
-            )
-        else:
-            await self.portfolio_collection.insert_one(portfolio_data)
-        return portfolio_data
+    async def create_or_update_portfolio(
+        self, portfolio_data: dict, expected_version: Optional[Union[int, str]] = None
+    ) -> Optional[dict]:
+        portfolio = await self._upsert_singleton(
+            self.portfolio_collection, portfolio_data, expected_version
+        )
+        if portfolio:
+            await self.publish_change("portfolio")
+        return portfolio
     
     # Skills CRUD Operations
+    @coalesce("skills")
     async def get_skills(self) -> Optional[dict]:
-        skills = await self.skills_collection.find_one({})
+        skills = await self.skills_collection.find_one({"_id": SINGLETON_ID}, projection(Skills))
         return skills
     
-    async def create_or_update_skills(self, skills_data: dict) -> dict:
-        existing = await self.skills_collection.find_one({})
-        if existing:
-            skills_data['updated_at'] = datetime.utcnow()
-            await self.skills_collection.update_one(
-                {"_id": existing["_id"]}, 
-                {"$set": skills_data}
+    async def create_or_update_skills(
+        self, skills_data: dict, expected_version: Optional[Union[int, str]] = None
+    ) -> Optional[dict]:
+        skills = await self._upsert_singleton(
+            self.skills_collection, skills_data, expected_version
+        )
+        if skills:
+            await self.publish_change("skills")
+        return skills
+    
+    async def _upsert_singleton(
+        self, collection, data: dict, expected_version: Optional[Union[int, str]]
+    ) -> Optional[dict]:
+        """Write a singleton document in one round trip and return the post-image.
+
+        ``expected_version`` makes the write conditional: an int must equal the
+        stored ``version`` and ``"*"`` only requires the document to exist.
+        Returns None when that precondition doesn't hold.
+        """
+        data = dict(data)
+        data.pop("_id", None)
+        data.pop("version", None)
+        now = datetime.utcnow()
+        on_insert = {
+            "id": data.pop("id", None) or str(uuid.uuid4()),
+            "created_at": data.pop("created_at", now),
+        }
+        data["updated_at"] = now
+        data["change_seq"] = await self.next_change_seq()
+        update = {"$set": data, "$setOnInsert": on_insert, "$inc": {"version": 1}}
+        
+        query = {"_id": SINGLETON_ID}
+        if isinstance(expected_version, int):
+            query["version"] = expected_version
+        upsert = expected_version is None
+        
+        try:
+            return await collection.find_one_and_update(
+                query, update, {"change_seq": 0}, upsert=upsert, return_document=ReturnDocument.AFTER
             )
-        else:
-            await self.skills_collection.insert_one(skills_data)
-        return skills_data
+        except DuplicateKeyError:
+            # Lost a race with another first write; the document exists now
+            return await collection.find_one_and_update(
+                query, update, {"change_seq": 0}, return_document=ReturnDocument.AFTER
+            )
+    
+    async def migrate_singletons(self) -> None:
+        """Re-key portfolio/skills documents written before SINGLETON_ID existed"""
+        for collection in (self.portfolio_collection, self.skills_collection):
+            if await collection.find_one({"_id": SINGLETON_ID}, {"_id": 1}):
+                continue
+            legacy = await collection.find_one({}, sort=[("_id", DESCENDING)])
+            if not legacy:
+                continue
+            legacy["_id"] = SINGLETON_ID
+            legacy.setdefault("version", 0)
+            await collection.insert_one(legacy)
+            await collection.delete_many({"_id": {"$ne": SINGLETON_ID}})
     
     # Experience CRUD Operations
-    async def get_all_experience(self) -> List[dict]:
+    @coalesce("experience")
+    async def get_all_experience(self, fields: Optional[Tuple[str, ...]] = None) -> List[dict]:
         experience_list = []
-        async for exp in self.experience_collection.find({}).sort("created_at", -1):
+        cursor = self.experience_collection.find({}, projection(Experience, fields))
+        async for exp in cursor.sort("created_at", -1):
             experience_list.append(exp)
         return experience_list
     
     async def create_experience(self, experience_data: dict) -> dict:
-        result = await self.experience_collection.insert_one(experience_data)
+        stamped, = await self._stamp_changes([experience_data])
+        result = await self.experience_collection.insert_one(stamped)
+        await self.publish_change("experience")
         experience_data["_id"] = result.inserted_id
         return experience_data
     
+    async def create_experience_many(self, experience_list: List[dict], ordered: bool = True) -> List[Optional[str]]:
+        stamped = await self._stamp_changes(experience_list)
+        errors = await self._insert_many(self.experience_collection, stamped, ordered)
+        await self.publish_change("experience")
+        return errors
+    
     async def delete_experience(self, experience_id: str) -> bool:
         result = await self.experience_collection.delete_one({"id": experience_id})
+        if result.deleted_count:
+            await self._record_deletions("experience", [experience_id])
+        await self.publish_change("experience")
         return result.deleted_count > 0
     
     # Projects CRUD Operations
-    async def get_all_projects(self) -> List[dict]:
+    @coalesce("projects")
+    async def get_all_projects(
+        self,
+        fields: Optional[Tuple[str, ...]] = None,
+        category: Optional[str] = None,
+        technologies: Optional[Tuple[str, ...]] = None,
+    ) -> List[dict]:
+        """Projects newest first, optionally only those in ``category`` using every one of ``technologies``"""
+        query = {}
+        if category is not None:
+            query["category"] = category
+        if technologies:
+            query["technologies"] = {"$all": list(technologies)}
         projects_list = []
-        async for project in self.projects_collection.find({}).sort("created_at", -1):
+        cursor = self.projects_collection.find(query, projection(Project, fields))
+        async for project in cursor.sort("created_at", -1):
             projects_list.append(project)
         return projects_list
     
     async def create_project(self, project_data: dict) -> dict:
-        result = await self.projects_collection.insert_one(project_data)
+        stamped, = await self._stamp_changes([project_data])
+        result = await self.projects_collection.insert_one(stamped)
+        await self.update_project_facets([project_data], 1)
+        await self.publish_change("projects")
         project_data["_id"] = result.inserted_id
         return project_data
     
+    async def create_projects_many(self, projects_list: List[dict], ordered: bool = True) -> List[Optional[str]]:
+        stamped = await self._stamp_changes(projects_list)
+        errors = await self._insert_many(self.projects_collection, stamped, ordered)
+        await self.update_project_facets(
+            [project for project, error in zip(projects_list, errors) if error is None], 1
+        )
+        await self.publish_change("projects")
+        return errors
+    
     async def delete_project(self, project_id: str) -> bool:
-        result = await self.projects_collection.delete_one({"id": project_id})
+        project = await self.projects_collection.find_one_and_delete(
+            {"id": project_id}, projection(Project, FACET_FIELDS)
+        )
+        if project:
+            await self.update_project_facets([project], -1)
+            await self._record_deletions("projects", [project_id])
+        await self.publish_change("projects")
+        return project is not None
+    
+    # Project facets: counts per category and technology, adjusted on every
+    # project write so reading them never scans the projects
+    @staticmethod
+    def _facet_counts(projects: List[dict], sign: int = 1) -> Dict[Tuple[str, str], int]:
+        counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        for project in projects:
+            counts[(FACET_TOTAL, "")] += sign
+            counts[("category", project.get("category", ""))] += sign
+            # A project counts once per technology, however often it's listed
+            for technology in set(project.get("technologies") or ()):
+                counts[("technologies", technology)] += sign
+        return counts
+    
+    async def update_project_facets(self, projects: List[dict], sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) ``projects`` from the facet counts"""
+        if not projects:
+            return
+        await asyncio.gather(*(
+            self.facets_collection.update_one(
+                {"_id": f"{field}:{value}"},
+                {"$inc": {"count": amount}, "$setOnInsert": {"field": field, "value": value}},
+                upsert=True,
+            )
+            for (field, value), amount in self._facet_counts(projects, sign).items()
+            if amount
+        ))
+    
+    async def rebuild_project_facets(self) -> None:
+        """Recount the facets from the projects themselves"""
+        projects = []
+        async for project in self.projects_collection.find({}, projection(Project, FACET_FIELDS)):
+            projects.append(project)
+        await self.facets_collection.delete_many({})
+        counts = self._facet_counts(projects)
+        if counts:
+            await self.facets_collection.insert_many([
+                {"_id": f"{field}:{value}", "field": field, "value": value, "count": amount}
+                for (field, value), amount in counts.items()
+            ])
+        await self.publish_change("projects")
+    
+    async def ensure_project_facets(self) -> None:
+        """Build the facet counts for projects written before they were maintained"""
+        if await self.facets_collection.find_one({}) is None and await self.projects_collection.find_one({}) is not None:
+            await self.rebuild_project_facets()
+    
+    @coalesce("projects")
+    async def get_project_facets(self) -> dict:
+        """Number of projects, and per category and technology, most common first"""
+        facets = {field: [] for field in FACET_FIELDS}
+        total = 0
+        async for doc in self.facets_collection.find({"count": {"$gt": 0}}):
+            if doc["field"] == FACET_TOTAL:
+                total = doc["count"]
+            elif doc["field"] in facets:
+                facets[doc["field"]].append({"value": doc["value"], "count": doc["count"]})
+        for values in facets.values():
+            values.sort(key=lambda facet: (-facet["count"], facet["value"]))
+        return {"total": total, **facets}
+    
+    async def _insert_many(
+        self, collection, documents: List[dict], ordered: bool, ignore_duplicates: bool = False
+    ) -> List[Optional[str]]:
+        """insert_many with a per-document outcome: None if inserted, else the reason.
+
+        The driver splits large inputs into as few batches as the server
+        allows. Ordered inserts stop at the first failure, so every later
+        document is reported as not attempted.
+        """
+        if not documents:
+            return []
+        
+        errors: List[Optional[str]] = [None] * len(documents)
+        try:
+            await collection.insert_many(documents, ordered=ordered)
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            for error in write_errors:
+                if ignore_duplicates and error.get("code") == 11000:
+                    continue
+                errors[error["index"]] = error.get("errmsg", "write failed")
+            if ordered and write_errors:
+                first_failure = min(error["index"] for error in write_errors)
+                for index in range(first_failure + 1, len(documents)):
+                    errors[index] = "not attempted: an earlier document failed"
+        return errors
+    
+    # Search (SEARCH_ENGINE=text)
+    async def search_text(
+        self,
+        query: str,
+        kinds: Optional[Sequence[str]] = None,
+        category: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[int, List[dict]]:
+        """Text index matches across projects and experience, by textScore; same shape as SearchIndex.search"""
+        sources = (
+            ("project", self.projects_collection, Project),
+            ("experience", self.experience_collection, Experience),
+        )
+        total = 0
+        hits = []
+        for kind, collection, model in sources:
+            if kinds and kind not in kinds:
+                continue
+            query_filter = {"$text": {"$search": query}}
+            if category is not None:
+                # Only projects have a category
+                if kind != "project":
+                    continue
+                query_filter["category"] = category
+            total += await collection.count_documents(query_filter)
+            cursor = (
+                collection.find(query_filter, {**projection(model), "score": {"$meta": "textScore"}})
+                .sort([("score", {"$meta": "textScore"})])
+                .limit(offset + limit)
+            )
+            async for doc in cursor:
+                score = doc.pop("score")
+                hits.append({"type": kind, "id": doc["id"], "score": round(score, 4), "document": doc})
+        hits.sort(key=lambda hit: (-hit["score"], hit["type"], hit["id"]))
+        return total, hits[offset:offset + limit]
+    
+    # Combined reads
+    async def get_portfolio_parts(
+        self, coalesced: bool = True
+    ) -> Tuple[Optional[dict], Optional[dict], List[dict], List[dict]]:
+        """Fetch portfolio, skills, experience and projects concurrently.
+        
+        ``coalesced=False`` never joins reads already in flight, for callers
+        that must see every write made before they started.
+        """
+        readers = (self.get_portfolio, self.get_skills, self.get_all_experience, self.get_all_projects)
+        portfolio, skills, experience, projects = await asyncio.gather(
+            *(reader(coalesced=coalesced) for reader in readers)
+        )
+        return portfolio, skills, experience, projects
+    
+    # Materialized portfolio snapshot (see snapshot.py)
+    @coalesce("portfolio_snapshot")
+    async def get_portfolio_snapshot(self) -> Optional[dict]:
+        return await self.snapshot_collection.find_one({"_id": SINGLETON_ID})
+    
+    async def save_portfolio_snapshot(self, snapshot: dict, read_at: datetime) -> Optional[dict]:
+        """Store a rebuilt snapshot and bump its version.
+        
+        Returns None without writing when the stored snapshot was built from a
+        later read, so a slow rebuild can't overwrite a newer one.
+        """
+        try:
+            saved = await self.snapshot_collection.find_one_and_update(
+                {"_id": SINGLETON_ID, "read_at": {"$lt": read_at}},
+                {
+                    "$set": {**snapshot, "read_at": read_at, "built_at": datetime.utcnow()},
+                    "$inc": {"version": 1},
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # The snapshot exists but is newer than read_at
+            return None
+        await self.publish_change("portfolio_snapshot")
+        return saved
+    
+    async def delete_portfolio_snapshot(self) -> bool:
+        result = await self.snapshot_collection.delete_one({"_id": SINGLETON_ID})
+        await self.publish_change("portfolio_snapshot")
         return result.deleted_count > 0
     
     # Contact Messages CRUD Operations
@@ -85,15 +643,76 @@ class DatabaseManager:
         message_data["_id"] = result.inserted_id
         return message_data
     
+    async def create_contact_messages_many(self, messages_list: List[dict]) -> List[Optional[str]]:
+        """Unordered bulk insert; documents whose id already exists count as written"""
+        errors = await self._insert_many(
+            self.messages_collection, messages_list, ordered=False, ignore_duplicates=True
+        )
+        return errors
+    
     async def get_all_messages(self) -> List[dict]:
         messages_list = []
-        async for message in self.messages_collection.find({}).sort("created_at", -1):
+        cursor = self.messages_collection.find({}, projection(ContactMessage))
+        async for message in cursor.sort("created_at", -1):
             messages_list.append(message)
         return messages_list
     
-    async def update_message_status(self, message_id: str, status: str) -> bool:
-        result = await self.messages_collection.update_one(
+    def _messages_query(self, status: Optional[str], after: Optional[Tuple[datetime, str]]) -> dict:
+        query = {}
+        if status:
+            query["status"] = status
+        if after:
+            created_at, message_id = after
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "id": {"$lt": message_id}},
+            ]
+        return query
+    
+    async def get_messages_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None,
+        status: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> Tuple[List[dict], bool]:
+        """Newest-first keyset page of messages; also reports whether more remain"""
+        cursor = (
+            self.messages_collection.find(
+                self._messages_query(status, after), projection(ContactMessage, fields)
+            )
+            .sort([("created_at", -1), ("id", -1)])
+            .limit(limit + 1)
+        )
+        messages_list = []
+        async for message in cursor:
+            messages_list.append(message)
+        return messages_list[:limit], len(messages_list) > limit
+    
+    async def iter_messages(
+        self,
+        after: Optional[Tuple[datetime, str]] = None,
+        status: Optional[str] = None,
+        limit: int = 0,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> AsyncIterator[dict]:
+        """Yield messages newest-first as the driver returns each batch"""
+        cursor = (
+            self.messages_collection.find(
+                self._messages_query(status, after), projection(ContactMessage, fields)
+            )
+            .sort([("created_at", -1), ("id", -1)])
+            .limit(limit)
+        )
+        async for message in cursor:
+            yield message
+    
+    async def update_message_status(self, message_id: str, status: str) -> Optional[dict]:
+        """Set a message's status; returns the message as it was before, or None if it doesn't exist"""
+        previous = await self.messages_collection.find_one_and_update(
             {"id": message_id}, 
-            {"$set": {"status": status}}
+            {"$set": {"status": status}},
+            projection(ContactMessage),
+            return_document=ReturnDocument.BEFORE,
         )
-        return result.modified_count > 0
\ No newline at end of file
+        return previous
\ No newline at end of file
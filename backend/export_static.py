@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Pre-render the /api/portfolio payload to static, content-hashed JSON files.
+
+    python export_static.py                 # writes to ./static (or $STATIC_EXPORT_DIR)
+    python export_static.py --out /srv/www  # anywhere a CDN or static server can read
+
+Each export writes portfolio.<hash>.json plus .gz and .br siblings (brotli
+only when the brotli package is installed) and rewrites manifest.json to
+point at it. Hashed files never change, so they can be cached forever;
+only the small manifest needs revalidating. Files from earlier exports are
+kept (pass --keep 0 to drop them) so clients holding an old manifest still
+resolve.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from database import DatabaseManager
+from snapshot import build_portfolio_snapshot
+from storage import connect
+
+try:
+    import brotli
+except ImportError:  # optional; only the .gz variant is written
+    brotli = None
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+MANIFEST_NAME = "manifest.json"
+# Suffix and Content-Encoding for each precompressed variant, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def static_export_dir() -> Path:
+    return Path(os.environ.get('STATIC_EXPORT_DIR', ROOT_DIR / 'static'))
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_export(body: bytes, etag: str, out_dir: Path, keep: int = 5) -> dict:
+    """Write ``body`` as portfolio.<etag>.json (+ compressed variants) and point the manifest at it"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    name = f"portfolio.{etag[:16]}.json"
+    variants: Dict[str, bytes] = {"identity": body}
+    # mtime=0 keeps the .gz byte-identical across runs for the same payload
+    variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+
+    _write_atomic(out_dir / name, body)
+    for encoding, suffix in ENCODINGS:
+        if encoding in variants:
+            _write_atomic(out_dir / (name + suffix), variants[encoding])
+
+    previous = read_manifest(out_dir)
+    history: List[str] = [name] + [
+        old for old in (previous or {}).get("history", []) if old != name
+    ]
+    manifest = {
+        "portfolio": name,
+        "etag": etag,
+        "size": {encoding: len(data) for encoding, data in variants.items()},
+        "exported_at": datetime.utcnow().isoformat(),
+        "history": history[:max(keep, 1)],
+    }
+    _write_atomic(out_dir / MANIFEST_NAME, json.dumps(manifest, indent=2).encode("utf-8"))
+
+    for stale in history[max(keep, 1):]:
+        for suffix in ("",) + tuple(suffix for _, suffix in ENCODINGS):
+            (out_dir / (stale + suffix)).unlink(missing_ok=True)
+    return manifest
+
+
+def read_manifest(out_dir: Path) -> Optional[dict]:
+    try:
+        return json.loads((out_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+async def export_portfolio(db_manager: DatabaseManager, out_dir: Path, keep: int = 5) -> dict:
+    """Render the current portfolio via the snapshot builder and write it out"""
+    snapshot = await build_portfolio_snapshot(db_manager)
+    return write_export(snapshot["body"], snapshot["etag"], out_dir, keep=keep)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Export the portfolio payload as static files")
+    parser.add_argument("--out", type=Path, default=static_export_dir(), help="output directory")
+    parser.add_argument("--keep", type=int, default=5, help="exports to keep for clients on an old manifest")
+    args = parser.parse_args()
+
+    client, db = connect()
+    try:
+        manifest = await export_portfolio(DatabaseManager(db), args.out, keep=args.keep)
+        print(json.dumps(manifest, indent=2))
+        if brotli is None:
+            print("brotli is not installed; only gzip variants were written", file=sys.stderr)
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+from typing import Callable, Dict, Optional, Sequence
+
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Server errors meaning change streams can never work against this deployment
+# (standalone mongod, or a stage the server doesn't know)
+CHANGE_STREAMS_UNSUPPORTED = {40573, 40324, 40415}
+
+
+class CacheInvalidator:
+    """Keep this worker's caches coherent with writes made by other workers.
+
+    Watches ``collections`` and calls ``on_change(collection)`` whenever one of
+    them changes, whichever worker wrote it. In ``auto`` mode it uses a change
+    stream and falls back to polling the shared counters that
+    DatabaseManager.publish_change bumps (``get_shared_versions``) when the
+    deployment or engine has no change streams; ``poll`` goes straight to
+    polling. Either way the counters are handed to the DatabaseManager as they
+    move, so its content versions (and the ETags built from them) track every
+    worker's writes. After any error that may have lost events, every
+    collection is reported changed, trading a cold cache for never serving
+    stale data.
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        collections: Sequence[str],
+        on_change: Callable[[str], None],
+        mode: str = "auto",
+        poll_interval: float = 1.0,
+    ):
+        if mode not in ("auto", "poll"):
+            raise ValueError(f"Unknown invalidation mode {mode!r}; expected auto or poll")
+        self.db_manager = db_manager
+        self.collections = tuple(collections)
+        self._on_change = on_change
+        self.requested_mode = mode
+        self.mode: Optional[str] = None
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+        self.events = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "events": self.events,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+    def _changed(self, collection: str) -> None:
+        self.invalidations += 1
+        try:
+            self._on_change(collection)
+        except Exception as e:
+            logger.error(f"Cache invalidation callback failed for {collection}: {str(e)}")
+
+    def _changed_all(self) -> None:
+        for collection in self.collections:
+            self._changed(collection)
+
+    async def _run(self) -> None:
+        if self.requested_mode == "auto":
+            await self._watch()
+            logger.info("Change streams unavailable; polling shared content versions for cache invalidation")
+        await self._poll()
+
+    async def _watch(self) -> None:
+        """Follow a change stream; returns only once change streams prove unsupported"""
+        counters = self.db_manager.versions_collection.name
+        pipeline = [{"$match": {"ns.coll": {"$in": [*self.collections, counters]}}}]
+        resume_token = None
+        delay = 0.5
+        while True:
+            try:
+                watch = getattr(self.db_manager.db, "watch", None)
+                if watch is None:
+                    return
+                async with watch(pipeline, resume_after=resume_token) as stream:
+                    self.mode = "changestream"
+                    delay = 0.5
+                    # Counters may have moved while there was no stream
+                    await self._sync_versions()
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        if change["ns"]["coll"] == counters:
+                            await self._sync_versions()
+                            continue
+                        self.events += 1
+                        self._changed(change["ns"]["coll"])
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAMS_UNSUPPORTED:
+                    return
+                # e.g. ChangeStreamHistoryLost: the token is unusable, start afresh
+                resume_token = None
+                self._stream_failed(e)
+            except Exception as e:
+                self._stream_failed(e)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    async def _sync_versions(self) -> None:
+        self.db_manager.apply_shared_versions(await self.db_manager.get_shared_versions())
+
+    def _stream_failed(self, error: Exception) -> None:
+        self.errors += 1
+        logger.warning(f"Cache invalidation change stream failed, reconnecting: {str(error)}")
+        self._changed_all()
+
+    async def _poll(self) -> None:
+        self.mode = "poll"
+        seen: Optional[Dict[str, int]] = None
+        while True:
+            try:
+                versions = await self.db_manager.get_shared_versions()
+                self.db_manager.apply_shared_versions(versions)
+                if seen is None:
+                    # New baseline: whatever changed before it was never seen
+                    self._changed_all()
+                else:
+                    for collection in self.collections:
+                        if versions.get(collection, 0) != seen.get(collection, 0):
+                            self.events += 1
+                            self._changed(collection)
+                seen = versions
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                seen = None
+                logger.warning(f"Polling content versions failed: {str(e)}")
+                self._changed_all()
+            await asyncio.sleep(self.poll_interval)
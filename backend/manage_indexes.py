@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Apply or audit the MongoDB indexes declared in DatabaseManager.INDEXES.
+
+    python manage_indexes.py            # create missing indexes
+    python manage_indexes.py --check    # report missing / unexpected / unused
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+from database import DatabaseManager
+from storage import connect
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Manage portfolio database indexes")
+    parser.add_argument("--check", action="store_true", help="report index drift without changing anything")
+    args = parser.parse_args()
+
+    client, db = connect()
+    db_manager = DatabaseManager(db)
+    try:
+        if args.check:
+            report = await db_manager.check_indexes()
+            print(json.dumps(report, indent=2))
+            # Non-zero exit when anything in the spec is missing, for CI use
+            return 1 if any(entry["missing"] for entry in report.values()) else 0
+
+        created = await db_manager.ensure_indexes()
+        print(json.dumps(created, indent=2))
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,685 @@
+"""
+In-process storage engine exposing the subset of Motor's collection API that
+DatabaseManager uses, so the app can run without MongoDB (STORAGE_ENGINE=memory).
+
+Documents live in a dict keyed by ``_id``. Each collection also keeps a hash
+index on the application ``id`` field, hash indexes for single-field unique
+indexes, and a list kept sorted by (created_at, id) so newest-first listings
+and keyset pages are read in order without sorting. Nothing is persisted.
+
+``watch`` gives change streams over the process's own writes, so code built on
+change streams can run against this engine; events are not retained, so
+``resume_after`` only starts a new stream.
+"""
+
+import asyncio
+import bisect
+import copy
+import itertools
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.results import DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+_MISSING = object()
+
+# Sort specs the pre-sorted (created_at, id) order can answer directly
+_CREATED_ORDER = ("created_at", "id")
+
+
+def _get_path(doc: dict, path: str) -> Any:
+    value: Any = doc
+    for part in path.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return _MISSING
+    return value
+
+
+def _set_path(doc: dict, path: str, value: Any) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset_path(doc: dict, path: str) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    # Mongo's cross-type ordering, for the types this app stores
+    if value is _MISSING or value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (5, value)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    if isinstance(value, ObjectId):
+        return (4, str(value))
+    if isinstance(value, datetime):
+        return (6, value)
+    return (3, str(value))
+
+
+def _hashable(value: Any) -> Any:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def _compare(op: str, actual: Any, expected: Any) -> bool:
+    if actual is _MISSING or actual is None:
+        return False
+    try:
+        if op == "$lt":
+            return actual < expected
+        if op == "$lte":
+            return actual <= expected
+        if op == "$gt":
+            return actual > expected
+        if op == "$gte":
+            return actual >= expected
+    except TypeError:
+        return False
+    raise OperationFailure(f"unknown operator: {op}")
+
+
+def _equals(actual: Any, expected: Any) -> bool:
+    if isinstance(actual, list) and not isinstance(expected, list):
+        return expected in actual
+    if actual is _MISSING:
+        return expected is None
+    return actual == expected
+
+
+def _match_operators(actual: Any, condition: dict) -> bool:
+    for op, expected in condition.items():
+        if op == "$eq":
+            ok = _equals(actual, expected)
+        elif op == "$ne":
+            ok = not _equals(actual, expected)
+        elif op == "$in":
+            ok = any(_equals(actual, item) for item in expected)
+        elif op == "$nin":
+            ok = not any(_equals(actual, item) for item in expected)
+        elif op == "$all":
+            ok = bool(expected) and all(_equals(actual, item) for item in expected)
+        elif op == "$exists":
+            ok = (actual is not _MISSING) == bool(expected)
+        elif op == "$regex":
+            flags = re.IGNORECASE if "i" in condition.get("$options", "") else 0
+            values = actual if isinstance(actual, list) else [actual]
+            ok = any(isinstance(v, str) and re.search(expected, v, flags) for v in values)
+        elif op == "$options":
+            continue
+        elif isinstance(actual, list) and op in ("$lt", "$lte", "$gt", "$gte"):
+            ok = any(_compare(op, item, expected) for item in actual)
+        else:
+            ok = _compare(op, actual, expected)
+        if not ok:
+            return False
+    return True
+
+
+def matches(doc: dict, query: Optional[dict]) -> bool:
+    """Evaluate a Mongo filter against ``doc`` (equality, comparisons, $in/$all, $or/$and, $regex)"""
+    if not query:
+        return True
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict) and any(k.startswith("$") for k in condition):
+            if not _match_operators(_get_path(doc, key), condition):
+                return False
+        elif not _equals(_get_path(doc, key), condition):
+            return False
+    return True
+
+
+def project(doc: dict, projection: Optional[Any]) -> dict:
+    """Copy of ``doc`` shaped by a Mongo projection; never shares state with the store"""
+    if not projection:
+        return copy.deepcopy(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+
+    include_id = bool(projection.get("_id", 1))
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+    if any(fields.values()):
+        result = {}
+        for field, wanted in fields.items():
+            if wanted:
+                value = _get_path(doc, field)
+                if value is not _MISSING:
+                    _set_path(result, field, copy.deepcopy(value))
+        if include_id and "_id" in doc:
+            result["_id"] = doc["_id"]
+        return result
+
+    result = copy.deepcopy(doc)
+    for field in fields:
+        _unset_path(result, field)
+    if not include_id:
+        result.pop("_id", None)
+    return result
+
+
+def _apply_update(doc: dict, update: dict, inserting: bool) -> None:
+    for op, fields in update.items():
+        if op == "$set":
+            for path, value in fields.items():
+                _set_path(doc, path, copy.deepcopy(value))
+        elif op == "$setOnInsert":
+            if inserting:
+                for path, value in fields.items():
+                    _set_path(doc, path, copy.deepcopy(value))
+        elif op == "$inc":
+            for path, amount in fields.items():
+                current = _get_path(doc, path)
+                _set_path(doc, path, (0 if current is _MISSING else current) + amount)
+        elif op == "$unset":
+            for path in fields:
+                _unset_path(doc, path)
+        else:
+            raise OperationFailure(f"unsupported update operator: {op}")
+
+
+def _created_bounds(query: dict) -> Tuple[Any, Any]:
+    """Lowest and highest created_at a matching document can have (_MISSING when unbounded)"""
+    low = high = _MISSING
+    condition = query.get("created_at", _MISSING)
+    if isinstance(condition, dict):
+        for op in ("$lt", "$lte"):
+            if op in condition:
+                high = condition[op]
+        for op in ("$gt", "$gte"):
+            if op in condition:
+                low = condition[op]
+    elif condition is not _MISSING:
+        low = high = condition
+
+    branches = query.get("$or")
+    if branches and (low is _MISSING or high is _MISSING):
+        bounds = [_created_bounds(branch) for branch in branches]
+        if high is _MISSING and all(h is not _MISSING for _, h in bounds):
+            high = max((h for _, h in bounds), key=_sort_key)
+        if low is _MISSING and all(l is not _MISSING for l, _ in bounds):
+            low = min((l for l, _ in bounds), key=_sort_key)
+    return low, high
+
+
+def _normalize_sort(key_or_list, direction: Optional[int] = None) -> List[Tuple[str, int]]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction if direction is not None else 1)]
+    return list(key_or_list)
+
+
+class MemoryCursor:
+    """Lazy result set supporting the sort/skip/limit chain Motor cursors expose"""
+
+    def __init__(self, collection: "MemoryCollection", query: Optional[dict], projection: Optional[Any]):
+        self._collection = collection
+        self._query = query or {}
+        self._projection = projection
+        self._sort: List[Tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+        self._results: Optional[Iterator[dict]] = None
+
+    def sort(self, key_or_list, direction: Optional[int] = None) -> "MemoryCursor":
+        self._sort = _normalize_sort(key_or_list, direction)
+        return self
+
+    def skip(self, count: int) -> "MemoryCursor":
+        self._skip = count
+        return self
+
+    def limit(self, count: int) -> "MemoryCursor":
+        self._limit = count
+        return self
+
+    def _iterate(self) -> Iterator[dict]:
+        docs = self._collection._scan(self._query, self._sort)
+        stop = self._skip + self._limit if self._limit else None
+        for doc in itertools.islice(docs, self._skip, stop):
+            yield project(doc, self._projection)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        if self._results is None:
+            self._results = self._iterate()
+        try:
+            return next(self._results)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        docs = self._iterate()
+        return list(docs if length is None else itertools.islice(docs, length))
+
+
+class MemoryChangeStream:
+    """Async iterator of change events, shaped like Motor's change stream"""
+
+    def __init__(self, database: "MemoryDatabase", collections: Optional[Set[str]]):
+        self._database = database
+        self._collections = collections
+        self._events: asyncio.Queue = asyncio.Queue()
+        self.resume_token: Optional[dict] = None
+
+    def _push(self, event: dict) -> None:
+        if self._collections is None or event["ns"]["coll"] in self._collections:
+            self._events.put_nowait(event)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        event = await self._events.get()
+        self.resume_token = event["_id"]
+        return event
+
+    async def close(self) -> None:
+        self._database._streams.discard(self)
+
+    async def __aenter__(self) -> "MemoryChangeStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+class MemoryCollection:
+    """Motor-compatible collection held in process memory"""
+
+    def __init__(self, database: "MemoryDatabase", name: str):
+        self.database = database
+        self.name = name
+        self._docs: Dict[Any, dict] = {}
+        self._by_id: Dict[Any, Set[Any]] = {}
+        self._unique: Dict[str, Dict[Any, Any]] = {}
+        self._created: List[tuple] = []
+        self._indexes: Dict[str, dict] = {"_id_": {"key": [("_id", 1)], "v": 2}}
+
+    # Index maintenance
+    @staticmethod
+    def _created_key(doc: dict) -> tuple:
+        return (_sort_key(doc.get("created_at")), _sort_key(doc.get("id")), str(doc["_id"]), doc["_id"])
+
+    def _check_unique(self, doc: dict, ignore_key: Any = _MISSING) -> None:
+        if doc["_id"] in self._docs and doc["_id"] != ignore_key:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: _id_")
+        for field, index in self._unique.items():
+            value = _get_path(doc, field)
+            if value is _MISSING:
+                continue
+            owner = index.get(_hashable(value), _MISSING)
+            if owner is not _MISSING and owner != ignore_key:
+                raise DuplicateKeyError(
+                    f"E11000 duplicate key error collection: {self.name} index: {field} dup key: {value!r}"
+                )
+
+    def _index_doc(self, doc: dict) -> None:
+        self._docs[doc["_id"]] = doc
+        if "id" in doc:
+            self._by_id.setdefault(_hashable(doc["id"]), set()).add(doc["_id"])
+        for field, index in self._unique.items():
+            value = _get_path(doc, field)
+            if value is not _MISSING:
+                index[_hashable(value)] = doc["_id"]
+        bisect.insort(self._created, self._created_key(doc))
+
+    def _unindex_doc(self, doc: dict) -> None:
+        self._docs.pop(doc["_id"], None)
+        if "id" in doc:
+            keys = self._by_id.get(_hashable(doc["id"]))
+            if keys is not None:
+                keys.discard(doc["_id"])
+                if not keys:
+                    del self._by_id[_hashable(doc["id"])]
+        for field, index in self._unique.items():
+            value = _get_path(doc, field)
+            if value is not _MISSING and index.get(_hashable(value)) == doc["_id"]:
+                del index[_hashable(value)]
+        key = self._created_key(doc)
+        position = bisect.bisect_left(self._created, key)
+        if position < len(self._created) and self._created[position] == key:
+            self._created.pop(position)
+
+    # Query planning
+    def _candidates(self, query: dict) -> Iterable[dict]:
+        # Point lookups on _id / id skip the scan entirely
+        if "_id" in query and not isinstance(query["_id"], dict):
+            doc = self._docs.get(query["_id"])
+            return [doc] if doc is not None else []
+        if "id" in query and not isinstance(query["id"], dict):
+            keys = self._by_id.get(_hashable(query["id"]), ())
+            return [self._docs[key] for key in keys]
+        return list(self._docs.values())
+
+    def _scan(self, query: dict, sort: List[Tuple[str, int]]) -> Iterator[dict]:
+        """Matching documents in ``sort`` order, produced lazily where possible"""
+        fields = tuple(field for field, _ in sort)
+        directions = {direction for _, direction in sort}
+        if sort and fields == _CREATED_ORDER[:len(fields)] and len(directions) == 1:
+            # Slice to the created_at range the query allows (keyset pages
+            # start mid-list), copying pointers so writes made while a cursor
+            # is consumed can't disturb it; then stream so limit stops early
+            low, high = _created_bounds(query)
+            # (7,) sorts after every _sort_key value, so ties on ``high`` are kept
+            start = 0 if low is _MISSING else bisect.bisect_left(self._created, (_sort_key(low),))
+            stop = len(self._created) if high is _MISSING else bisect.bisect_right(self._created, (_sort_key(high), (7,)))
+            ordered = self._created[start:stop]
+            if sort[0][1] < 0:
+                ordered.reverse()
+            return (
+                doc for doc in (self._docs.get(entry[-1]) for entry in ordered)
+                if doc is not None and matches(doc, query)
+            )
+
+        docs = [doc for doc in self._candidates(query) if matches(doc, query)]
+        for field, direction in reversed(sort):
+            docs.sort(key=lambda d: _sort_key(_get_path(d, field)), reverse=direction < 0)
+        return iter(docs)
+
+    def _delete(self, doc: dict) -> None:
+        self._unindex_doc(doc)
+        self._emit("delete", doc)
+
+    def _first(self, query: Optional[dict], sort=None) -> Optional[dict]:
+        query = query or {}
+        if sort:
+            return next(self._scan(query, _normalize_sort(sort)), None)
+        for doc in self._candidates(query):
+            if matches(doc, query):
+                return doc
+        return None
+
+    # Write primitives
+    def _emit(self, operation: str, doc: dict) -> None:
+        if self.database._streams:
+            self.database._emit({
+                "operationType": operation,
+                "ns": {"db": self.database.name, "coll": self.name},
+                "documentKey": {"_id": doc["_id"]},
+            })
+
+    def _insert(self, document: dict) -> Any:
+        if "_id" not in document:
+            document["_id"] = ObjectId()
+        stored = copy.deepcopy(document)
+        self._check_unique(stored)
+        self._index_doc(stored)
+        self._emit("insert", stored)
+        return stored["_id"]
+
+    def _update_doc(self, doc: dict, update: dict) -> dict:
+        updated = copy.deepcopy(doc)
+        _apply_update(updated, update, inserting=False)
+        updated["_id"] = doc["_id"]
+        self._check_unique(updated, ignore_key=doc["_id"])
+        self._unindex_doc(doc)
+        self._index_doc(updated)
+        self._emit("update", updated)
+        return updated
+
+    def _upsert_doc(self, query: dict, update: dict) -> dict:
+        doc = {}
+        for key, value in (query or {}).items():
+            if not key.startswith("$") and not isinstance(value, dict):
+                _set_path(doc, key, copy.deepcopy(value))
+        _apply_update(doc, update, inserting=True)
+        self._insert(doc)
+        return self._docs[doc["_id"]]
+
+    # Reads
+    async def find_one(self, filter: Optional[dict] = None, projection: Optional[Any] = None, sort=None, **kwargs) -> Optional[dict]:
+        doc = self._first(filter, sort)
+        return project(doc, projection) if doc is not None else None
+
+    def find(self, filter: Optional[dict] = None, projection: Optional[Any] = None, sort=None, limit: int = 0, **kwargs) -> MemoryCursor:
+        cursor = MemoryCursor(self, filter, projection)
+        if sort:
+            cursor.sort(sort)
+        return cursor.limit(limit)
+
+    async def count_documents(self, filter: Optional[dict] = None, **kwargs) -> int:
+        if not filter:
+            return len(self._docs)
+        return sum(1 for doc in self._candidates(filter) if matches(doc, filter))
+
+    async def estimated_document_count(self, **kwargs) -> int:
+        return len(self._docs)
+
+    # Writes
+    async def insert_one(self, document: dict, **kwargs) -> InsertOneResult:
+        return InsertOneResult(self._insert(document), True)
+
+    async def insert_many(self, documents: Iterable[dict], ordered: bool = True, **kwargs) -> InsertManyResult:
+        inserted_ids = []
+        errors = []
+        for index, document in enumerate(documents):
+            try:
+                inserted_ids.append(self._insert(document))
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": document})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({
+                "writeErrors": errors,
+                "writeConcernErrors": [],
+                "nInserted": len(inserted_ids),
+                "nUpserted": 0,
+                "nMatched": 0,
+                "nModified": 0,
+                "nRemoved": 0,
+                "upserted": [],
+            })
+        return InsertManyResult(inserted_ids, True)
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False, **kwargs) -> UpdateResult:
+        doc = self._first(filter)
+        if doc is None:
+            if not upsert:
+                return UpdateResult({"n": 0, "nModified": 0}, True)
+            created = self._upsert_doc(filter, update)
+            return UpdateResult({"n": 1, "nModified": 0, "upserted": created["_id"]}, True)
+        updated = self._update_doc(doc, update)
+        return UpdateResult({"n": 1, "nModified": int(updated != doc)}, True)
+
+    async def update_many(self, filter: dict, update: dict, upsert: bool = False, **kwargs) -> UpdateResult:
+        docs = [doc for doc in self._candidates(filter or {}) if matches(doc, filter)]
+        if not docs and upsert:
+            created = self._upsert_doc(filter, update)
+            return UpdateResult({"n": 1, "nModified": 0, "upserted": created["_id"]}, True)
+        modified = sum(int(self._update_doc(doc, update) != doc) for doc in docs)
+        return UpdateResult({"n": len(docs), "nModified": modified}, True)
+
+    async def find_one_and_update(
+        self,
+        filter: dict,
+        update: dict,
+        projection: Optional[Any] = None,
+        sort=None,
+        upsert: bool = False,
+        return_document: bool = ReturnDocument.BEFORE,
+        **kwargs,
+    ) -> Optional[dict]:
+        doc = self._first(filter, sort)
+        if doc is None:
+            if not upsert:
+                return None
+            created = self._upsert_doc(filter, update)
+            return project(created, projection) if return_document == ReturnDocument.AFTER else None
+        updated = self._update_doc(doc, update)
+        return project(updated if return_document == ReturnDocument.AFTER else doc, projection)
+
+    async def find_one_and_delete(self, filter: dict, projection: Optional[Any] = None, sort=None, **kwargs) -> Optional[dict]:
+        doc = self._first(filter, sort)
+        if doc is None:
+            return None
+        self._delete(doc)
+        return project(doc, projection)
+
+    async def delete_one(self, filter: dict, **kwargs) -> DeleteResult:
+        doc = self._first(filter)
+        if doc is None:
+            return DeleteResult({"n": 0}, True)
+        self._delete(doc)
+        return DeleteResult({"n": 1}, True)
+
+    async def delete_many(self, filter: dict, **kwargs) -> DeleteResult:
+        docs = [doc for doc in self._candidates(filter or {}) if matches(doc, filter)]
+        for doc in docs:
+            self._delete(doc)
+        return DeleteResult({"n": len(docs)}, True)
+
+    # Indexes
+    async def create_index(self, keys: Any, name: Optional[str] = None, **kwargs) -> str:
+        keys = _normalize_sort(keys)
+        name = name or "_".join(f"{field}_{direction}" for field, direction in keys)
+        spec = {"key": keys, "v": 2}
+        spec.update({k: v for k, v in kwargs.items() if k in ("unique", "sparse", "expireAfterSeconds")})
+        if spec.get("unique"):
+            if len(keys) != 1:
+                raise OperationFailure("the memory engine only enforces single-field unique indexes")
+            field = keys[0][0]
+            index: Dict[Any, Any] = {}
+            for key, doc in self._docs.items():
+                value = _get_path(doc, field)
+                if value is _MISSING:
+                    continue
+                if _hashable(value) in index:
+                    raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {name}")
+                index[_hashable(value)] = key
+            self._unique[field] = index
+        self._indexes[name] = spec
+        return name
+
+    async def create_indexes(self, indexes: List[Any], **kwargs) -> List[str]:
+        names = []
+        for index in indexes:
+            document = index.document
+            options = {k: v for k, v in document.items() if k not in ("key", "name")}
+            names.append(await self.create_index(list(document["key"].items()), name=document.get("name"), **options))
+        return names
+
+    async def drop_index(self, name: str, **kwargs) -> None:
+        spec = self._indexes.pop(name, None)
+        if spec is None:
+            raise OperationFailure(f"index not found with name [{name}]")
+        if spec.get("unique"):
+            self._unique.pop(spec["key"][0][0], None)
+
+    async def index_information(self) -> Dict[str, dict]:
+        return copy.deepcopy(self._indexes)
+
+    def aggregate(self, pipeline: List[dict], **kwargs) -> MemoryCursor:
+        # Only $indexStats (used by check_indexes) is supported; usage isn't tracked
+        if pipeline and "$indexStats" in pipeline[0]:
+            stats = MemoryCollection(self.database, f"{self.name}.$indexStats")
+            for name, spec in self._indexes.items():
+                stats._index_doc({"_id": name, "name": name, "key": dict(spec["key"]), "accesses": {"ops": 0}})
+            return MemoryCursor(stats, {}, {"_id": 0})
+        raise OperationFailure("the memory engine only supports aggregate([{'$indexStats': {}}])")
+
+    async def drop(self) -> None:
+        self._docs.clear()
+        self._by_id.clear()
+        self._unique.clear()
+        self._created.clear()
+        self._indexes = {"_id_": {"key": [("_id", 1)], "v": 2}}
+
+    def watch(self, pipeline: Optional[List[dict]] = None, **kwargs) -> MemoryChangeStream:
+        return self.database._open_stream({self.name})
+
+
+class MemoryDatabase:
+    """Stand-in for a Motor database handing out MemoryCollection objects"""
+
+    def __init__(self, name: str = "memory"):
+        self.name = name
+        self._collections: Dict[str, MemoryCollection] = {}
+        self._streams: Set[MemoryChangeStream] = set()
+        self._event_ids = itertools.count(1)
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(self, name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_collection(self, name: str, **kwargs) -> MemoryCollection:
+        return self[name]
+
+    async def list_collection_names(self, **kwargs) -> List[str]:
+        return list(self._collections)
+
+    async def drop_collection(self, name: str) -> None:
+        if name in self._collections:
+            await self._collections[name].drop()
+
+    def watch(self, pipeline: Optional[List[dict]] = None, **kwargs) -> MemoryChangeStream:
+        """Change stream over every collection; honours a leading {"$match": {"ns.coll": ...}}"""
+        collections = None
+        for stage in pipeline or []:
+            wanted = stage.get("$match", {}).get("ns.coll")
+            if isinstance(wanted, dict) and "$in" in wanted:
+                collections = set(wanted["$in"])
+            elif isinstance(wanted, str):
+                collections = {wanted}
+        return self._open_stream(collections)
+
+    def _open_stream(self, collections: Optional[Set[str]]) -> MemoryChangeStream:
+        stream = MemoryChangeStream(self, collections)
+        self._streams.add(stream)
+        return stream
+
+    def _emit(self, event: dict) -> None:
+        event["_id"] = {"_data": next(self._event_ids)}
+        for stream in list(self._streams):
+            stream._push(event)
+
+
+class MemoryClient:
+    """AsyncIOMotorClient stand-in; databases live as long as the client"""
+
+    def __init__(self, *args, **kwargs):
+        self._databases: Dict[str, MemoryDatabase] = {}
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = MemoryDatabase(name)
+        return self._databases[name]
+
+    def get_database(self, name: str, **kwargs) -> MemoryDatabase:
+        return self[name]
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,257 @@
+import bisect
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labelvalues, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = REQUEST_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labelvalues -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labelvalues, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _labels(self.labelnames, labelvalues, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """Holds metrics and renders them in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def counter(self, *args, **kwargs) -> Counter:
+        metric = Counter(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        metric = Histogram(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        """Add a callable producing extra exposition lines at scrape time"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def stats_gauges(name: str, documentation: str, stats: Callable[[], Dict[str, dict]]) -> Callable[[], List[str]]:
+    """Collector exposing numeric leaves of a nested stats dict as one gauge family"""
+
+    def collect() -> List[str]:
+        lines = [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+
+        def walk(prefix: str, values: dict) -> None:
+            for key, value in values.items():
+                component = f"{prefix}.{key}" if prefix else key
+                if isinstance(value, dict):
+                    walk(component, value)
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    owner, _, stat = component.rpartition(".")
+                    labels = _labels(("component", "stat"), (owner, stat))
+                    lines.append(f"{name}{labels} {_number(value)}")
+
+        walk("", stats())
+        return lines
+
+    return collect
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts and latency per route template"""
+
+    def __init__(self, app: ASGIApp, requests: Counter, latency: Histogram):
+        self.app = app
+        self.requests = requests
+        self.latency = latency
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route on the shared scope, so the
+            # template (not the raw path) is available once the app returns
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            method = scope["method"]
+            self.latency.observe(time.perf_counter() - start, method, path)
+            self.requests.inc(method, path, str(status))
+
+
+class InstrumentedCursor:
+    """Wraps a Motor cursor and times its full iteration as one operation"""
+
+    def __init__(self, cursor, observe: Callable[[float, bool], None]):
+        self._cursor = cursor
+        self._observe = observe
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._cursor, name)
+        if name in ("sort", "skip", "limit", "batch_size", "hint", "max_time_ms"):
+            def chain(*args, **kwargs):
+                return InstrumentedCursor(attr(*args, **kwargs), self._observe)
+            return chain
+        if name == "to_list":
+            async def to_list(*args, **kwargs):
+                start = time.perf_counter()
+                failed = True
+                try:
+                    result = await attr(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    self._observe(time.perf_counter() - start, failed)
+            return to_list
+        return attr
+
+    async def __aiter__(self):
+        start = time.perf_counter()
+        failed = True
+        try:
+            async for doc in self._cursor:
+                yield doc
+            failed = False
+        finally:
+            self._observe(time.perf_counter() - start, failed)
+
+
+class InstrumentedCollection:
+    """Proxy timing every awaited Motor collection call by collection and method"""
+
+    ASYNC_METHODS = frozenset({
+        "find_one", "insert_one", "insert_many", "update_one", "update_many",
+        "replace_one", "delete_one", "delete_many", "find_one_and_update",
+        "find_one_and_delete", "find_one_and_replace", "count_documents",
+        "estimated_document_count", "bulk_write", "create_index", "create_indexes",
+        "index_information", "distinct",
+    })
+    CURSOR_METHODS = frozenset({"find", "aggregate"})
+
+    def __init__(self, collection, observe: Callable[[str, str, float, bool], None]):
+        self._collection = collection
+        self._observe = observe
+        self._name = getattr(collection, "name", "unknown")
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._collection, name)
+        if name in self.ASYNC_METHODS:
+            async def timed(*args, **kwargs):
+                start = time.perf_counter()
+                failed = True
+                try:
+                    result = await attr(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    self._observe(self._name, name, time.perf_counter() - start, failed)
+            return timed
+        if name in self.CURSOR_METHODS:
+            def cursor(*args, **kwargs):
+                return InstrumentedCursor(
+                    attr(*args, **kwargs),
+                    lambda elapsed, failed: self._observe(self._name, name, elapsed, failed),
+                )
+            return cursor
+        return attr
+
+
+def instrument_database_manager(db_manager, latency: Histogram, errors: Counter) -> None:
+    """Swap every ``*_collection`` on a DatabaseManager for a timed proxy"""
+
+    def observe(collection: str, operation: str, elapsed: float, failed: bool) -> None:
+        latency.observe(elapsed, collection, operation)
+        if failed:
+            errors.inc(collection, operation)
+
+    for attribute, value in list(vars(db_manager).items()):
+        if attribute.endswith("_collection") and not isinstance(value, InstrumentedCollection):
+            setattr(db_manager, attribute, InstrumentedCollection(value, observe))
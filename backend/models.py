@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type
 from datetime import datetime
 import uuid
 
@@ -35,6 +36,7 @@ class Skills(BaseModel):
     technical: List[str]
     transferable: List[str]
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = 0
 
 class SkillsCreate(BaseModel):
     technical: List[str]
@@ -48,6 +50,7 @@ class Experience(BaseModel):
     period: str
     responsibilities: List[str]
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 class ExperienceCreate(BaseModel):
     position: str
@@ -64,6 +67,7 @@ class Project(BaseModel):
     category: str
     image: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 class ProjectCreate(BaseModel):
     title: str
@@ -73,6 +77,8 @@ class ProjectCreate(BaseModel):
     image: str
 
 # Contact Message Models
+MessageStatus = Literal["unread", "read", "replied"]
+
 class ContactMessage(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
@@ -88,6 +94,9 @@ class ContactMessageCreate(BaseModel):
     subject: str
     message: str
 
+class ContactMessageStatusUpdate(BaseModel):
+    status: MessageStatus
+
 # Complete Portfolio Model
 class Portfolio(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -97,6 +106,7 @@ class Portfolio(BaseModel):
     certifications: List[Certification]
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = 0
 
 class PortfolioCreate(BaseModel):
     personal: PersonalInfo
@@ -116,4 +126,71 @@ class PortfolioResponse(BaseModel):
     certifications: List[Certification]
     skills: Skills
     experience: List[Experience]
-    projects: List[Project]
\ No newline at end of file
+    projects: List[Project]
+    version: int = 0
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class ProjectFacets(BaseModel):
+    total: int
+    category: List[FacetCount]
+    technologies: List[FacetCount]
+
+SearchKind = Literal["project", "experience"]
+
+class SearchHit(BaseModel):
+    type: SearchKind
+    id: str
+    score: float
+    document: Dict[str, Any]
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    limit: int
+    offset: int
+    results: List[SearchHit]
+
+ChangeCollection = Literal["portfolio", "skills", "experience", "projects"]
+
+class ChangeRecord(BaseModel):
+    collection: ChangeCollection
+    id: str
+    seq: int
+    changed_at: Optional[datetime] = None
+    op: Literal["upsert", "delete"]
+    document: Optional[Dict[str, Any]] = None
+
+class ChangesResponse(BaseModel):
+    token: str
+    reset: bool
+    changes: List[ChangeRecord]
+
+BatchMethod = Literal["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"]
+
+class BatchRequestItem(BaseModel):
+    id: Optional[str] = None
+    method: BatchMethod = "GET"
+    path: str
+    params: Dict[str, Any] = {}
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem]
+
+class BatchResponseItem(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str]
+    body: Any = None
+
+class BatchResponse(BaseModel):
+    responses: List[BatchResponseItem]
+
+@lru_cache(maxsize=None)
+def model_fields(model: Type[BaseModel]) -> Tuple[str, ...]:
+    """Top-level field names of a model, in declaration order"""
+    return tuple(model.model_fields)
@@ -0,0 +1,67 @@
+import base64
+import json
+from datetime import datetime
+from typing import Iterable, List, Tuple
+
+from fastjson import dumps
+
+
+def _encode_token(payload: dict) -> str:
+    data = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def _decode_token(token: str) -> dict:
+    padded = token + "=" * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(doc: dict) -> str:
+    """Opaque keyset cursor pointing just past ``doc`` in (created_at, id) order"""
+    return _encode_token({"c": doc["created_at"].isoformat(), "i": doc["id"]})
+
+
+def decode_cursor(token: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor; raises ValueError for anything malformed"""
+    try:
+        payload = _decode_token(token)
+        return datetime.fromisoformat(payload["c"]), str(payload["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+def encode_change_token(seq: int, issued_at: datetime, seen: Iterable[Tuple[int, datetime]] = ()) -> str:
+    """Opaque GET /api/changes token: the last change_seq covered, when, and
+    the ``(change_seq, changed_at)`` of recent changes the client already has.
+
+    Runs of consecutive sequence numbers written together (bulk writes share
+    a timestamp) are stored as one range, so a large batch stays small.
+    """
+    payload = {"s": seq, "t": issued_at.isoformat()}
+    ranges: List[list] = []
+    for number, changed_at in sorted(seen):
+        stamp = changed_at.isoformat()
+        if ranges and ranges[-1][1] == number - 1 and ranges[-1][2] == stamp:
+            ranges[-1][1] = number
+        else:
+            ranges.append([number, number, stamp])
+    if ranges:
+        payload["r"] = ranges
+    return _encode_token(payload)
+
+
+def decode_change_token(token: str) -> Tuple[int, datetime, List[Tuple[int, datetime]]]:
+    """Inverse of encode_change_token; raises ValueError for anything malformed"""
+    try:
+        payload = _decode_token(token)
+        seen = []
+        for first, last, stamp in payload.get("r", ()):
+            changed_at = datetime.fromisoformat(stamp)
+            seen.extend((number, changed_at) for number in range(int(first), int(last) + 1))
+        return int(payload["s"]), datetime.fromisoformat(payload["t"]), seen
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid change token: {token!r}") from e
+
+
+def ndjson_line(doc: dict) -> bytes:
+    return dumps(doc) + b"\n"
@@ -0,0 +1,289 @@
+import cProfile
+import functools
+import inspect
+import io
+import json
+import logging
+import pstats
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict, List, Optional, Type
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfile:
+    """Span timings collected for one request"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans: List[dict] = []
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+# Nesting depth lives in the context too, so spans started by gathered tasks
+# nest under their caller rather than under each other
+_depth: ContextVar[int] = ContextVar("request_profile_depth", default=0)
+
+
+@contextmanager
+def span(name: str):
+    """Time a block into the active request's profile; a no-op when none is active"""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    depth = _depth.get() + 1
+    token = _depth.set(depth)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _depth.reset(token)
+        profile.spans.append({
+            "name": name,
+            "start_ms": round((start - profile.start) * 1000, 3),
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            "depth": depth,
+        })
+
+
+def instrument_methods(target, prefix: str) -> None:
+    """Wrap every public coroutine method of ``target`` in a span named ``prefix.method``"""
+    for name, method in inspect.getmembers(target, inspect.iscoroutinefunction):
+        if name.startswith("_"):
+            continue
+
+        def wrap(method, span_name):
+            @functools.wraps(method)
+            async def timed(*args, **kwargs):
+                with span(span_name):
+                    return await method(*args, **kwargs)
+            return timed
+
+        setattr(target, name, wrap(method, f"{prefix}.{name}"))
+
+
+class _TimedResponseField:
+    """Proxy for a route's response field timing validation and serialization"""
+
+    def __init__(self, field):
+        self._field = field
+
+    def __getattr__(self, name: str):
+        return getattr(self._field, name)
+
+    def validate(self, *args, **kwargs):
+        with span("response.validate"):
+            return self._field.validate(*args, **kwargs)
+
+    def serialize(self, *args, **kwargs):
+        with span("response.serialize"):
+            return self._field.serialize(*args, **kwargs)
+
+
+_timed_response_classes: Dict[Type[Response], Type[Response]] = {}
+
+
+def _timed_response_class(response_class: Type[Response]) -> Type[Response]:
+    timed = _timed_response_classes.get(response_class)
+    if timed is None:
+        def render(self, content):
+            with span("response.render"):
+                return response_class.render(self, content)
+
+        timed = type(response_class.__name__, (response_class,), {"render": render})
+        _timed_response_classes[response_class] = timed
+    return timed
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute adding endpoint, response validation and rendering spans.
+
+    Only the response classes FastAPI builds itself are timed; endpoints that
+    return a Response object render inside the ``endpoint`` span.
+    """
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if inspect.iscoroutinefunction(call) and not hasattr(call, "__profiled__"):
+            @functools.wraps(call)
+            async def endpoint(*args, **kwargs):
+                with span("endpoint"):
+                    return await call(*args, **kwargs)
+
+            endpoint.__profiled__ = True
+            self.dependant.call = endpoint
+
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        original_field, original_class = self.secure_cloned_response_field, self.response_class
+        if original_field is not None:
+            self.secure_cloned_response_field = _TimedResponseField(original_field)
+        self.response_class = _timed_response_class(response_class)
+        try:
+            return super().get_route_handler()
+        finally:
+            self.secure_cloned_response_field, self.response_class = original_field, original_class
+
+
+class Profiler:
+    """Decides which requests to profile and writes the slow ones to a rotating file.
+
+    With ``threshold_ms`` set every request collects spans (cheap) and those
+    at or over the threshold are written out. ``sample_rate`` additionally
+    writes that fraction of all requests regardless of duration. When
+    ``cprofile`` is on, a cProfile capture is attached to written records;
+    cProfile sees the whole event loop thread, so the capture can include
+    work from concurrent requests, and only one request is captured at a time.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        threshold_ms: float = 0.0,
+        sample_rate: float = 0.0,
+        cprofile: bool = False,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        top_functions: int = 30,
+    ):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.cprofile = cprofile
+        self.top_functions = top_functions
+        self.path = Path(path)
+        self.profiled = 0
+        self.written = 0
+        self._cprofile_busy = False
+        self._log: Optional[logging.Logger] = None
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0 or self.sample_rate > 0
+
+    def _writer(self) -> logging.Logger:
+        if self._log is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                self.path, maxBytes=self._max_bytes, backupCount=self._backup_count
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._log = logging.getLogger(f"{__name__}.records")
+            self._log.propagate = False
+            self._log.setLevel(logging.INFO)
+            self._log.addHandler(handler)
+        return self._log
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start_cprofile(self) -> Optional[cProfile.Profile]:
+        if not self.cprofile or self._cprofile_busy:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (a debugger, or an outer cProfile) is active
+            return None
+        self._cprofile_busy = True
+        return profiler
+
+    def stop_cprofile(self, profiler: Optional[cProfile.Profile]) -> None:
+        if profiler is not None:
+            profiler.disable()
+            self._cprofile_busy = False
+
+    def _format_cprofile(self, profiler: cProfile.Profile) -> str:
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(self.top_functions)
+        return out.getvalue()
+
+    def record(
+        self,
+        entry: dict,
+        profile: RequestProfile,
+        sampled: bool,
+        cprofiler: Optional[cProfile.Profile] = None,
+    ) -> None:
+        """Write ``entry`` with its spans if it was sampled or crossed the threshold"""
+        self.profiled += 1
+        if not sampled and not (self.threshold_ms > 0 and entry["duration_ms"] >= self.threshold_ms):
+            return
+        entry["sampled"] = sampled
+        entry["spans"] = sorted(profile.spans, key=lambda s: s["start_ms"])
+        try:
+            if cprofiler is not None:
+                entry["cprofile"] = self._format_cprofile(cprofiler)
+            self._writer().info(json.dumps(entry, default=str))
+            self.written += 1
+        except Exception as e:
+            logger.warning(f"Could not write request profile: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "sample_rate": self.sample_rate,
+            "profiled": self.profiled,
+            "written": self.written,
+        }
+
+
+class ProfilingMiddleware:
+    """ASGI middleware making a RequestProfile current for the span helpers"""
+
+    def __init__(self, app: ASGIApp, profiler: Profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sampled = self.profiler.should_sample()
+        if not sampled and self.profiler.threshold_ms <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        started_at = datetime.now(timezone.utc)
+        cprofiler = self.profiler.start_cprofile()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.profiler.stop_cprofile(cprofiler)
+            _current.reset(token)
+            route = scope.get("route")
+            entry = {
+                "timestamp": started_at.isoformat(),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "status": status,
+                "duration_ms": round((time.perf_counter() - profile.start) * 1000, 3),
+            }
+            self.profiler.record(entry, profile, sampled, cprofiler)
@@ -0,0 +1,94 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets held in a bounded LRU.
+
+    Each key may spend ``burst`` requests at once and regains ``rate`` tokens
+    per second. When more than ``max_keys`` keys are tracked the least recently
+    seen one is forgotten, which at worst hands that client a fresh bucket.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.allowed = 0
+        self.limited = 0
+        self.evictions = 0
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+
+    def allow(self, key: Hashable) -> Tuple[bool, float]:
+        """Take one token for ``key``; returns (allowed, seconds until one is available)"""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+        if tokens >= 1:
+            tokens -= 1
+            self.allowed += 1
+            retry_after = 0.0
+        else:
+            self.limited += 1
+            retry_after = (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            self.evictions += 1
+        return retry_after == 0.0, retry_after
+
+    def stats(self) -> dict:
+        return {
+            "tracked_keys": len(self._buckets),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evictions": self.evictions,
+        }
+
+
+class DuplicateSuppressor:
+    """Remember content hashes for ``window`` seconds so repeats can be answered from memory"""
+
+    def __init__(self, window: float = 600.0, max_entries: int = 10000):
+        self.window = window
+        self.max_entries = max_entries
+        self.suppressed = 0
+        self.evictions = 0
+        self._seen: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    @staticmethod
+    def fingerprint(*parts: str) -> str:
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def lookup(self, fingerprint: str) -> Optional[str]:
+        """Value remembered for ``fingerprint`` if it is still inside the window"""
+        entry = self._seen.get(fingerprint)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._seen[fingerprint]
+            return None
+        self.suppressed += 1
+        return value
+
+    def remember(self, fingerprint: str, value: str) -> None:
+        self._seen[fingerprint] = (time.monotonic() + self.window, value)
+        self._seen.move_to_end(fingerprint)
+        while len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+            self.evictions += 1
+
+    def forget(self, fingerprint: str) -> None:
+        self._seen.pop(fingerprint, None)
+
+    def stats(self) -> dict:
+        return {
+            "tracked": len(self._seen),
+            "suppressed": self.suppressed,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Rebuild the materialized portfolio snapshot served by GET /api/portfolio.
+
+    python rebuild_snapshot.py
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from database import DatabaseManager
+from snapshot import build_portfolio_snapshot
+from storage import connect
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+
+async def main() -> int:
+    client, db = connect()
+    db_manager = DatabaseManager(db)
+    try:
+        start = time.perf_counter()
+        snapshot = await build_portfolio_snapshot(db_manager)
+        print(json.dumps({
+            "version": snapshot["version"],
+            "etag": snapshot["etag"],
+            "size": snapshot["size"],
+            "built_at": snapshot["built_at"].isoformat(),
+            "seconds": round(time.perf_counter() - start, 4),
+        }, indent=2))
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,240 @@
+"""
+In-process full-text search over projects and experience.
+
+SearchIndex is an inverted index (term -> {document: weighted frequency})
+ranked with BM25. A match in a title or position counts for more than one in
+a description (SEARCH_FIELDS). The last query term also matches as a prefix,
+so results follow what's being typed. Documents are added and removed one at a
+time as they're written; ``replace`` reloads a whole kind. Each term's BM25
+impacts (its per-document score before idf) are computed when first queried
+and kept until a document containing the term changes, so a one-word query
+is a slice of a presorted list. Ranked results are cached per query until
+the next change, so paging through them is a slice too.
+"""
+
+import math
+import re
+from bisect import bisect_left, insort
+from collections import OrderedDict, defaultdict
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Searchable fields and their weights per document kind
+SEARCH_FIELDS: Dict[str, Dict[str, float]] = {
+    "project": {"title": 3.0, "technologies": 2.0, "description": 1.0},
+    "experience": {"position": 3.0, "company": 2.0, "responsibilities": 1.0},
+}
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it its of on or our that the their this to with".split()
+)
+TOKEN = re.compile(r"[^\W_]+")
+
+Key = Tuple[str, str]
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def field_text(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(item) for item in value)
+    return str(value or "")
+
+
+class SearchIndex:
+    """BM25-ranked inverted index over documents of the kinds in SEARCH_FIELDS"""
+
+    K1 = 1.2
+    B = 0.75
+    # Score multiplier for terms matched only as a prefix of the last query term
+    PREFIX_WEIGHT = 0.5
+    MAX_PREFIX_TERMS = 50
+    # Impacts are normalised by this fraction-stale average document length,
+    # so one write doesn't invalidate the impacts of every term
+    LENGTH_DRIFT = 0.1
+
+    def __init__(self, cache_size: int = 256):
+        self._docs: Dict[Key, dict] = {}
+        self._doc_terms: Dict[Key, Dict[str, float]] = {}
+        self._lengths: Dict[Key, float] = {}
+        self._total_length = 0.0
+        self._norm_length = 0.0
+        self._postings: Dict[str, Dict[Key, float]] = {}
+        # Sorted, for prefix lookups
+        self._vocabulary: List[str] = []
+        # Per term: ({document: impact}, [(document, impact)] best first)
+        self._impacts: Dict[str, Tuple[Dict[Key, float], List[Tuple[Key, float]]]] = {}
+        # Per query: ([(document, score / scale)] best first, scale)
+        self._cache: "OrderedDict[Tuple, Tuple[List[Tuple[Key, float]], float]]" = OrderedDict()
+        self.cache_size = cache_size
+        self.queries = 0
+        self.cache_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, kind: str, doc: dict) -> None:
+        self._add(kind, doc)
+        self._changed()
+
+    def add_many(self, kind: str, docs: Iterable[dict]) -> None:
+        for doc in docs:
+            self._add(kind, doc)
+        self._changed()
+
+    def remove(self, kind: str, doc_id: str) -> bool:
+        removed = self._remove((kind, doc_id))
+        self._changed()
+        return removed
+
+    def replace(self, kind: str, docs: Iterable[dict]) -> None:
+        """Make ``docs`` the complete set of documents of ``kind``"""
+        for key in [key for key in self._docs if key[0] == kind]:
+            self._remove(key)
+        self.add_many(kind, docs)
+
+    def _add(self, kind: str, doc: dict) -> None:
+        key = (kind, doc["id"])
+        self._remove(key)
+        terms: Dict[str, float] = defaultdict(float)
+        length = 0.0
+        for field, weight in SEARCH_FIELDS[kind].items():
+            tokens = tokenize(field_text(doc.get(field)))
+            length += weight * len(tokens)
+            for token in tokens:
+                terms[token] += weight
+        for term, frequency in terms.items():
+            self._impacts.pop(term, None)
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            postings[key] = frequency
+        # Drivers add _id to inserted documents; results only carry API fields
+        self._docs[key] = {field: value for field, value in doc.items() if field != "_id"}
+        self._doc_terms[key] = dict(terms)
+        self._lengths[key] = length
+        self._total_length += length
+
+    def _changed(self) -> None:
+        self._cache.clear()
+        average = self._total_length / len(self._docs) if self._docs else 0.0
+        if abs(average - self._norm_length) > self.LENGTH_DRIFT * self._norm_length:
+            self._norm_length = average
+            self._impacts.clear()
+
+    def _remove(self, key: Key) -> bool:
+        if key not in self._docs:
+            return False
+        for term in self._doc_terms.pop(key):
+            self._impacts.pop(term, None)
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+        self._total_length -= self._lengths.pop(key)
+        del self._docs[key]
+        return True
+
+    def _query_terms(self, query: str) -> Dict[str, float]:
+        tokens = tokenize(query)
+        terms = {token: 1.0 for token in tokens}
+        # A trailing space means the last word is complete
+        if tokens and len(tokens[-1]) >= 2 and not query[-1:].isspace():
+            last = tokens[-1]
+            index = bisect_left(self._vocabulary, last)
+            expanded = 0
+            while (
+                index < len(self._vocabulary)
+                and expanded < self.MAX_PREFIX_TERMS
+                and self._vocabulary[index].startswith(last)
+            ):
+                terms.setdefault(self._vocabulary[index], self.PREFIX_WEIGHT)
+                index += 1
+                expanded += 1
+        return terms
+
+    def _term_impacts(self, term: str) -> Tuple[Dict[Key, float], List[Tuple[Key, float]]]:
+        impacts = self._impacts.get(term)
+        if impacts is None:
+            k1 = self.K1
+            constant = k1 * (1 - self.B)
+            per_length = k1 * self.B / (self._norm_length or 1.0)
+            lengths = self._lengths
+            by_key = {
+                key: tf * (k1 + 1) / (tf + constant + per_length * lengths[key])
+                for key, tf in self._postings[term].items()
+            }
+            impacts = self._impacts[term] = (by_key, sorted(by_key.items(), key=itemgetter(1), reverse=True))
+        return impacts
+
+    def _rank(self, terms: Dict[str, float]) -> Tuple[List[Tuple[Key, float]], float]:
+        """Every matching document best first, with the factor turning its value into a score"""
+        count = len(self._docs)
+        weighted = []
+        for term, weight in terms.items():
+            postings = self._postings.get(term)
+            if postings:
+                frequency = len(postings)
+                weighted.append((term, weight * math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))))
+        if len(weighted) == 1:
+            # One term ranks by impact alone; scale only the page that's returned
+            term, idf = weighted[0]
+            return self._term_impacts(term)[1], idf
+
+        scores: Dict[Key, float] = {}
+        for term, idf in weighted:
+            get = scores.get
+            for key, impact in self._term_impacts(term)[0].items():
+                scores[key] = get(key, 0.0) + idf * impact
+        return sorted(scores.items(), key=itemgetter(1), reverse=True), 1.0
+
+    def search(
+        self,
+        query: str,
+        kinds: Optional[Sequence[str]] = None,
+        category: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[int, List[dict]]:
+        """Total matches and one page of hits, best first.
+
+        ``category`` keeps only projects in that category.
+        """
+        self.queries += 1
+        terms = self._query_terms(query)
+        cache_key = (tuple(sorted(terms.items())), tuple(sorted(kinds or ())), category)
+        cached = self._cache.get(cache_key)
+        if cached is None:
+            ranked, scale = self._rank(terms)
+            if kinds:
+                ranked = [hit for hit in ranked if hit[0][0] in kinds]
+            if category is not None:
+                docs = self._docs
+                ranked = [
+                    hit for hit in ranked
+                    if hit[0][0] == "project" and docs[hit[0]].get("category") == category
+                ]
+            self._cache[cache_key] = (ranked, scale)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            ranked, scale = cached
+            self._cache.move_to_end(cache_key)
+            self.cache_hits += 1
+
+        hits = [
+            {"type": key[0], "id": key[1], "score": round(score * scale, 4), "document": self._docs[key]}
+            for key, score in ranked[offset:offset + limit]
+        ]
+        return len(ranked), hits
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self._docs),
+            "terms": len(self._postings),
+            "queries": self.queries,
+            "cache_hits": self.cache_hits,
+        }
@@ -156,13 +156,11 @@ async def seed_database(db_manager: DatabaseManager):
     await db_manager.create_or_update_skills(skills_data)
     
     # Seed experience data
-    for exp_data in SEED_EXPERIENCE_DATA:
-        experience = Experience(**exp_data).dict()
-        await db_manager.create_experience(experience)
+    experience_list = [Experience(**exp_data).dict() for exp_data in SEED_EXPERIENCE_DATA]
+    await db_manager.create_experience_many(experience_list)
     
     # Seed projects data
-    for proj_data in SEED_PROJECTS_DATA:
-        project = Project(**proj_data).dict()
-        await db_manager.create_project(project)
+    projects_list = [Project(**proj_data).dict() for proj_data in SEED_PROJECTS_DATA]
+    await db_manager.create_projects_many(projects_list)
     
     print("✅ Database seeded successfully with portfolio data")
\ No newline at end of file
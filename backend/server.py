@@ -1,99 +1,425 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import Body, Depends, FastAPI, APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.routing import APIRoute
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 from models import *
-from database import DatabaseManager
-from seed_data import seed_database
+from database import TOMBSTONE_RETENTION, DatabaseManager
+from storage import connect
+from snapshot import build_portfolio_snapshot
+from export_static import ENCODINGS, MANIFEST_NAME, static_export_dir
+from compression import CompressedCache, CompressionMiddleware, accepted_encodings
+from cache import TTLCache
+from invalidation import CacheInvalidator
+from search import SearchIndex
+from write_behind import WriteBehindQueue
+from broadcast import EventBroadcaster
+from batch import BatchDispatcher
+from ratelimit import DuplicateSuppressor, TokenBucketLimiter
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    DB_BUCKETS,
+    MetricsMiddleware,
+    Registry,
+    instrument_database_manager,
+    stats_gauges,
+)
+from profiling import Profiler, ProfiledRoute, ProfilingMiddleware, instrument_methods
+from fastjson import FastJSONResponse
+from pagination import decode_change_token, decode_cursor, encode_change_token, encode_cursor, ndjson_line
+from conditional import (
+    CACHE_CONTROL,
+    etag_matches,
+    if_match_version,
+    last_modified,
+    make_etag,
+    not_modified,
+    not_modified_since,
+    validator_headers,
+    version_etag,
+)
+import asyncio
+import hashlib
+import json
 import os
 import logging
+import re
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+from pydantic import ValidationError
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# Storage connection; STORAGE_ENGINE=memory runs without MongoDB (see storage.py)
+client, db = connect()
 
 # Initialize database manager
 db_manager = DatabaseManager(db)
 
+# Prometheus metrics; with METRICS_ENABLED=0 neither the middleware nor the
+# collection proxies are installed, so there is no per-request cost
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+metrics_registry = Registry()
+http_requests_total = metrics_registry.counter(
+    "portfolio_http_requests_total",
+    "HTTP requests by method, route template and status code",
+    ("method", "route", "status"),
+)
+http_request_duration = metrics_registry.histogram(
+    "portfolio_http_request_duration_seconds",
+    "HTTP request latency by method and route template",
+    ("method", "route"),
+)
+db_operation_duration = metrics_registry.histogram(
+    "portfolio_db_operation_duration_seconds",
+    "MongoDB operation latency by collection and method",
+    ("collection", "operation"),
+    buckets=DB_BUCKETS,
+)
+db_operation_errors = metrics_registry.counter(
+    "portfolio_db_operation_errors_total",
+    "MongoDB operations that raised, by collection and method",
+    ("collection", "operation"),
+)
+snapshot_rebuild_duration = metrics_registry.histogram(
+    "portfolio_snapshot_rebuild_seconds",
+    "Time to rebuild the materialized portfolio snapshot, by what triggered it",
+    ("trigger",),
+)
+if METRICS_ENABLED:
+    instrument_database_manager(db_manager, db_operation_duration, db_operation_errors)
+
+# Opt-in request profiling: PROFILE_THRESHOLD_MS writes any slower request's
+# span breakdown to a rotating file, PROFILE_SAMPLE_RATE writes that fraction
+# of all requests, and PROFILE_CPROFILE=1 attaches a cProfile capture
+profiler = Profiler(
+    path=Path(os.environ.get('PROFILE_LOG', ROOT_DIR / 'profiles' / 'requests.jsonl')),
+    threshold_ms=float(os.environ.get('PROFILE_THRESHOLD_MS', '0')),
+    sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', '0')),
+    cprofile=os.environ.get('PROFILE_CPROFILE', '0') == '1',
+    max_bytes=int(os.environ.get('PROFILE_LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+    backup_count=int(os.environ.get('PROFILE_LOG_BACKUPS', '5')),
+)
+if profiler.enabled:
+    instrument_methods(db_manager, "db")
+
+# Opt-in: read endpoints skip response_model re-validation of documents that
+# were validated on write and encode them with orjson
+FAST_RESPONSES = os.environ.get('FAST_RESPONSES', '0') == '1'
+
+BATCH_MAX_ITEMS = 10000
+
+# GET /api/changes re-reads writes stamped this long before a token was
+# issued: one can reserve its change_seq before the token and land after it.
+# The token lists the changes in that window the client already received,
+# which are not sent again
+CHANGES_OVERLAP = timedelta(seconds=float(os.environ.get('CHANGES_OVERLAP_SECONDS', '5')))
+
+# Live feed of contact message changes for /api/contact/messages/stream;
+# each worker broadcasts the writes it makes itself
+message_events = EventBroadcaster(
+    history=int(os.environ.get('MESSAGE_STREAM_HISTORY', '1000')),
+    heartbeat=float(os.environ.get('MESSAGE_STREAM_HEARTBEAT', '15')),
+)
+
+def publish_message_created(msg: dict) -> None:
+    message_events.publish("created", ContactMessage(**msg).dict())
+
+async def flush_contact_messages(batch: List[dict]) -> None:
+    errors = await db_manager.create_contact_messages_many(batch)
+    for msg, error in zip(batch, errors):
+        if error:
+            logger.error(f"Dropping contact message {msg['id']}: {error}")
+        else:
+            publish_message_created(msg)
+
+# Contact form abuse controls: token buckets per client IP and per sender
+# email, and identical submissions inside the window answered from memory
+contact_ip_limiter = TokenBucketLimiter(
+    rate=float(os.environ.get('CONTACT_IP_RATE_PER_MINUTE', '10')) / 60,
+    burst=float(os.environ.get('CONTACT_IP_BURST', '10')),
+)
+contact_email_limiter = TokenBucketLimiter(
+    rate=float(os.environ.get('CONTACT_EMAIL_RATE_PER_MINUTE', '3')) / 60,
+    burst=float(os.environ.get('CONTACT_EMAIL_BURST', '3')),
+)
+contact_dedup = DuplicateSuppressor(window=float(os.environ.get('CONTACT_DEDUP_WINDOW', '600')))
+TRUST_FORWARDED_FOR = os.environ.get('TRUST_FORWARDED_FOR', '0') == '1'
+
+def client_ip(request: Request) -> str:
+    if TRUST_FORWARDED_FOR and "x-forwarded-for" in request.headers:
+        return request.headers["x-forwarded-for"].split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def rate_limited(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many messages, please try again later",
+        headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+    )
+
+async def limit_contact_by_ip(request: Request) -> None:
+    # A dependency, so floods are turned away before the body is validated
+    allowed, retry_after = contact_ip_limiter.allow(client_ip(request))
+    if not allowed:
+        raise rate_limited(retry_after)
+
+# Opt-in: contact submissions are acknowledged once spooled and written in
+# batches, so GET /api/contact/messages lags acknowledged submissions by up
+# to CONTACT_FLUSH_INTERVAL. Off, a submission is readable once acknowledged.
+CONTACT_WRITE_BEHIND = os.environ.get('CONTACT_WRITE_BEHIND', '0') == '1'
+contact_queue = WriteBehindQueue(
+    flush_contact_messages,
+    spool_dir=Path(os.environ.get('CONTACT_SPOOL_DIR', ROOT_DIR / 'spool' / 'contact_messages')),
+    decode=lambda doc: ContactMessage(**doc).dict(),
+    max_batch=int(os.environ.get('CONTACT_BATCH_SIZE', '100')),
+    max_delay=float(os.environ.get('CONTACT_FLUSH_INTERVAL', '0.25')),
+    max_pending=int(os.environ.get('CONTACT_QUEUE_SIZE', '10000')),
+)
+
+MESSAGES_PAGE_SIZE = 100
+MESSAGES_MAX_PAGE_SIZE = 1000
+
+# The portfolio snapshot document, cached in process and dropped whenever a
+# write endpoint rebuilds it
+PORTFOLIO_CACHE_KEY = "portfolio"
+snapshot_lock = asyncio.Lock()
+portfolio_cache = TTLCache(
+    maxsize=int(os.environ.get('PORTFOLIO_CACHE_SIZE', '8')),
+    ttl=float(os.environ.get('PORTFOLIO_CACHE_TTL', '300')),
+)
+# content_version("portfolio_snapshot") -> the (etag, last_modified) served
+# under it, so a revalidation can be answered after the cached snapshot has
+# expired or been dropped without reading it again
+portfolio_validators: Dict[str, tuple] = {}
+
+# Full-text search. SEARCH_ENGINE=index keeps an inverted index in process,
+# built at startup and updated on writes; SEARCH_ENGINE=text queries the
+# MongoDB text indexes instead (mongo storage engine only)
+SEARCH_ENGINE = os.environ.get('SEARCH_ENGINE', 'index')
+if os.environ.get('STORAGE_ENGINE', 'mongo').lower() == 'memory':
+    SEARCH_ENGINE = 'index'
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+SEARCH_MAX_OFFSET = 10000
+# Collection -> search document kind
+SEARCH_COLLECTIONS = {"projects": "project", "experience": "experience"}
+search_index = SearchIndex()
+# Collections to (re)load into the index before the next search
+search_index_stale = set(SEARCH_COLLECTIONS)
+
+# Facet counts by projects content version; a write moves to a new key
+project_facets_cache = TTLCache(maxsize=4, ttl=float(os.environ.get('PORTFOLIO_CACHE_TTL', '300')))
+
+def invalidate_local_caches(collection: str) -> None:
+    """Forget anything this worker derived from ``collection``; another worker changed it"""
+    db_manager.mark_changed(collection)
+    portfolio_cache.clear()
+    if collection in SEARCH_COLLECTIONS:
+        search_index_stale.add(collection)
+
+# Follows writes from every worker (change streams, else polling); off with CACHE_INVALIDATION=off
+CACHE_INVALIDATION = os.environ.get('CACHE_INVALIDATION', 'auto')
+cache_invalidator = CacheInvalidator(
+    db_manager,
+    ("portfolio", "skills", "experience", "projects", "portfolio_snapshot"),
+    invalidate_local_caches,
+    mode='poll' if CACHE_INVALIDATION == 'poll' else 'auto',
+    poll_interval=float(os.environ.get('CACHE_POLL_INTERVAL', '1.0')),
+)
+
+# Files written by export_static.py; hashed names never change content
+STATIC_EXPORT_DIR = static_export_dir()
+STATIC_EXPORT_NAME = re.compile(r"portfolio\.[0-9a-f]{16}\.json")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# gzip/brotli for responses over COMPRESSION_MIN_SIZE bytes; compressed
+# bodies of ETagged GETs are cached per content version
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', '1') == '1'
+compressed_cache = CompressedCache(
+    max_bytes=int(os.environ.get('COMPRESSION_CACHE_BYTES', str(32 * 1024 * 1024))),
+)
+
 # Create the main app without a prefix
 app = FastAPI(title="Portfolio API", version="1.0.0")
 
 # Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", route_class=ProfiledRoute if profiler.enabled else APIRoute)
+
+def select_fields(fields: Optional[str], model, required: Tuple[str, ...] = ("id",)) -> Optional[Tuple[str, ...]]:
+    """Parse a ?fields=a,b list into the fields to fetch, always including ``required``"""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(requested) - set(model_fields(model)))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(required + tuple(requested)))
+
+def list_etag(collection: str, selected: Optional[Tuple[str, ...]], filters: Optional[dict] = None) -> str:
+    # Each field selection and filter is its own representation and needs its
+    # own tag; filter values are client text, so they go in as a digest
+    tag = db_manager.content_version(collection)
+    if selected:
+        tag = f"{tag}-{'.'.join(selected)}"
+    filters = {name: value for name, value in (filters or {}).items() if value}
+    if filters:
+        digest = hashlib.sha1(json.dumps(filters, sort_keys=True).encode()).hexdigest()[:16]
+        tag = f"{tag}-{digest}"
+    return make_etag(tag)
 
 # Portfolio endpoints
+async def rebuild_portfolio_snapshot(trigger: str) -> dict:
+    # Serialized so the last rebuild to run has seen every write before it
+    async with snapshot_lock:
+        start = time.perf_counter()
+        try:
+            return await build_portfolio_snapshot(db_manager)
+        finally:
+            snapshot_rebuild_duration.observe(time.perf_counter() - start, trigger)
+            portfolio_cache.clear()
+
+async def refresh_portfolio_snapshot() -> None:
+    """Rebuild the snapshot after a write; if that fails, drop it so the next read rebuilds"""
+    try:
+        await rebuild_portfolio_snapshot("write")
+    except Exception as e:
+        logger.error(f"Portfolio snapshot rebuild failed: {str(e)}")
+        try:
+            await db_manager.delete_portfolio_snapshot()
+            portfolio_cache.clear()
+        except Exception as e:
+            logger.error(f"Could not drop stale portfolio snapshot: {str(e)}")
+
+def index_for_search(kind: str, docs: List[dict]) -> None:
+    if SEARCH_ENGINE == 'index':
+        search_index.add_many(kind, docs)
+
+async def refresh_search_index() -> None:
+    """Load every collection marked stale into the search index"""
+    for collection in list(search_index_stale):
+        search_index_stale.discard(collection)
+        try:
+            if collection == "projects":
+                docs = await db_manager.get_all_projects()
+            else:
+                docs = await db_manager.get_all_experience()
+        except Exception:
+            search_index_stale.add(collection)
+            raise
+        search_index.replace(SEARCH_COLLECTIONS[collection], docs)
+
+async def load_portfolio_snapshot() -> dict:
+    snapshot = await db_manager.get_portfolio_snapshot()
+    if snapshot is None:
+        snapshot = await rebuild_portfolio_snapshot("miss")
+    return snapshot
+
 @api_router.get("/portfolio", response_model=PortfolioResponse)
-async def get_portfolio():
+async def get_portfolio(request: Request):
     """Get complete portfolio data"""
+    # Taken before the read: a snapshot saved meanwhile is recorded under the
+    # older version, which only ever costs a full response
+    version = db_manager.content_version("portfolio_snapshot")
+    validators = portfolio_validators.get(version)
+    if validators is not None:
+        etag, modified = validators
+        if etag_matches(request, etag) or not_modified_since(request, modified):
+            return not_modified(etag, modified)
+    
+    snapshot = portfolio_cache.get(PORTFOLIO_CACHE_KEY)
+    generation = portfolio_cache.generation
     try:
-        portfolio = await db_manager.get_portfolio()
-        skills = await db_manager.get_skills()
-        experience = await db_manager.get_all_experience()
-        projects = await db_manager.get_all_projects()
-        
-        if not portfolio:
-            # If no portfolio exists, seed the database
-            await seed_database(db_manager)
-            portfolio = await db_manager.get_portfolio()
-            skills = await db_manager.get_skills()
-            experience = await db_manager.get_all_experience()
-            projects = await db_manager.get_all_projects()
-        
-        # Clean up MongoDB _id fields for response
-        def clean_mongo_doc(doc):
-            if doc and '_id' in doc:
-                doc.pop('_id')
-            return doc
-        
-        portfolio = clean_mongo_doc(portfolio)
-        skills = clean_mongo_doc(skills)
-        
-        for exp in experience:
-            clean_mongo_doc(exp)
-        
-        for proj in projects:
-            clean_mongo_doc(proj)
-        
-        response_data = {
-            **portfolio,
-            "skills": skills,
-            "experience": experience,
-            "projects": projects
-        }
-        
-        return response_data
-        
+        if snapshot is None:
+            # One indexed read of pre-encoded JSON; concurrent misses (including
+            # a cold, unseeded database) share one load
+            snapshot = await db_manager.flight.do(("portfolio_snapshot", PORTFOLIO_CACHE_KEY), load_portfolio_snapshot)
+            portfolio_cache.set(PORTFOLIO_CACHE_KEY, snapshot, generation=generation)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching portfolio: {str(e)}")
+    
+    etag = make_etag(snapshot["etag"])
+    modified = snapshot.get("last_modified")
+    if version not in portfolio_validators:
+        portfolio_validators.clear()
+        portfolio_validators[version] = (etag, modified)
+    if etag_matches(request, etag) or not_modified_since(request, modified):
+        return not_modified(etag, modified)
+    # Validated against PortfolioResponse when the snapshot was built
+    return Response(snapshot["body"], media_type="application/json", headers=validator_headers(etag, modified))
+
+@api_router.get("/static/{filename}")
+async def get_static_export(filename: str, request: Request):
+    """Serve a pre-rendered export, precompressed when the client allows it"""
+    if filename == MANIFEST_NAME:
+        # The manifest moves with every export; clients revalidate it
+        headers = {"Cache-Control": CACHE_CONTROL}
+    elif STATIC_EXPORT_NAME.fullmatch(filename):
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    else:
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    path = STATIC_EXPORT_DIR / filename
+    if filename != MANIFEST_NAME:
+        accepted = accepted_encodings(request.headers.get("accept-encoding"))
+        for encoding, suffix in ENCODINGS:
+            variant = path.with_name(path.name + suffix)
+            if encoding in accepted and variant.is_file():
+                path = variant
+                headers["Content-Encoding"] = encoding
+                break
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Not found")
+    # FileResponse streams from disk (sendfile-style where the server offers pathsend)
+    return FileResponse(path, media_type="application/json", headers=headers)
+
+def expected_version(request: Request) -> Optional[Union[int, str]]:
+    try:
+        return if_match_version(request)
+    except ValueError as e:
+        raise HTTPException(status_code=412, detail=str(e))
 
 @api_router.put("/portfolio")
-async def update_portfolio(portfolio_data: PortfolioCreate):
-    """Update portfolio information"""
+async def update_portfolio(portfolio_data: PortfolioCreate, request: Request, response: Response):
+    """Update portfolio information (conditional on If-Match: "v<version>" if sent)"""
+    version = expected_version(request)
     try:
         portfolio_dict = portfolio_data.dict()
-        result = await db_manager.create_or_update_portfolio(portfolio_dict)
-        return {"message": "Portfolio updated successfully", "data": result}
+        result = await db_manager.create_or_update_portfolio(portfolio_dict, expected_version=version)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating portfolio: {str(e)}")
+    
+    if result is None:
+        raise HTTPException(status_code=412, detail="Portfolio has been modified since the given version")
+    
+    await refresh_portfolio_snapshot()
+    result.pop('_id', None)
+    response.headers["ETag"] = version_etag(result["version"])
+    return {"message": "Portfolio updated successfully", "data": result}
 
 # Skills endpoints
 @api_router.get("/skills", response_model=Skills)
-async def get_skills():
+async def get_skills(request: Request, response: Response):
     """Get skills data"""
+    etag = make_etag(db_manager.content_version("skills"))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     try:
         skills = await db_manager.get_skills()
         if not skills:
             raise HTTPException(status_code=404, detail="Skills not found")
         
-        if '_id' in skills:
-            skills.pop('_id')
-        
+        modified = last_modified([skills])
+        if not_modified_since(request, modified):
+            return not_modified(etag, modified)
+        headers = validator_headers(etag, modified)
+        if FAST_RESPONSES:
+            return FastJSONResponse(skills, headers=headers)
+        response.headers.update(headers)
         return skills
     except HTTPException:
         raise
@@ -101,26 +427,90 @@ async def get_skills():
         raise HTTPException(status_code=500, detail=f"Error fetching skills: {str(e)}")
 
 @api_router.put("/skills")
-async def update_skills(skills_data: SkillsCreate):
-    """Update skills information"""
+async def update_skills(skills_data: SkillsCreate, request: Request, response: Response):
+    """Update skills information (conditional on If-Match: "v<version>" if sent)"""
+    version = expected_version(request)
     try:
         skills_dict = Skills(**skills_data.dict()).dict()
-        result = await db_manager.create_or_update_skills(skills_dict)
-        return {"message": "Skills updated successfully", "data": result}
+        result = await db_manager.create_or_update_skills(skills_dict, expected_version=version)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating skills: {str(e)}")
+    
+    if result is None:
+        raise HTTPException(status_code=412, detail="Skills have been modified since the given version")
+    
+    await refresh_portfolio_snapshot()
+    result.pop('_id', None)
+    response.headers["ETag"] = version_etag(result["version"])
+    return {"message": "Skills updated successfully", "data": result}
+
+async def create_batch(items: List[Any], item_model, full_model, insert_many, ordered: bool, search_kind: str) -> dict:
+    """Validate items one by one, bulk insert the valid ones and report per item"""
+    if len(items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_ITEMS} items per batch")
+    
+    results = []
+    documents = []
+    halted = False
+    for index, item in enumerate(items):
+        if halted:
+            results.append({"index": index, "status": "skipped", "error": "not attempted: an earlier item failed"})
+            continue
+        try:
+            if not isinstance(item, dict):
+                raise TypeError("item must be a JSON object")
+            doc = full_model(**item_model(**item).dict()).dict()
+        except (ValidationError, TypeError) as e:
+            if isinstance(e, ValidationError):
+                error = e.errors(include_url=False, include_context=False, include_input=False)
+            else:
+                error = str(e)
+            results.append({"index": index, "status": "invalid", "error": error})
+            # Ordered batches stop at the first bad item, like an ordered insert_many
+            halted = ordered
+            continue
+        documents.append(doc)
+        results.append({"index": index, "status": "pending", "id": doc["id"]})
+    
+    try:
+        errors = await insert_many(documents, ordered=ordered)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error inserting batch: {str(e)}")
+    
+    pending = (result for result in results if result["status"] == "pending")
+    for result, error in zip(pending, errors):
+        if error is None:
+            result["status"] = "created"
+        else:
+            result["status"] = "failed"
+            result["error"] = error
+    
+    created = sum(1 for result in results if result["status"] == "created")
+    if created:
+        index_for_search(search_kind, [doc for doc, error in zip(documents, errors) if error is None])
+        await refresh_portfolio_snapshot()
+    return {"created": created, "failed": len(results) - created, "results": results}
 
 # Experience endpoints
 @api_router.get("/experience", response_model=List[Experience])
-async def get_experience():
+async def get_experience(request: Request, response: Response, fields: Optional[str] = None):
     """Get all work experience"""
+    selected = select_fields(fields, Experience)
+    etag = list_etag("experience", selected)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     try:
-        experience_list = await db_manager.get_all_experience()
-        
-        for exp in experience_list:
-            if '_id' in exp:
-                exp.pop('_id')
+        experience_list = await db_manager.get_all_experience(selected)
         
+        modified = last_modified(experience_list)
+        if not_modified_since(request, modified):
+            return not_modified(etag, modified)
+        headers = validator_headers(etag, modified)
+        # Partial documents can't go through response_model validation
+        if FAST_RESPONSES or selected:
+            return FastJSONResponse(experience_list, headers=headers)
+        response.headers.update(headers)
         return experience_list
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching experience: {str(e)}")
@@ -131,69 +521,353 @@ async def create_experience(experience_data: ExperienceCreate):
     try:
         exp_dict = Experience(**experience_data.dict()).dict()
         result = await db_manager.create_experience(exp_dict)
+        index_for_search("experience", [result])
+        await refresh_portfolio_snapshot()
         return {"message": "Experience created successfully", "id": result["id"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating experience: {str(e)}")
 
+@api_router.post("/experience:batch")
+async def create_experience_batch(
+    items: List[Any] = Body(...),
+    ordered: bool = False,
+):
+    """Add many work experience entries in bulk, with a result per item"""
+    summary = await create_batch(items, ExperienceCreate, Experience, db_manager.create_experience_many, ordered, "experience")
+    return {"message": f"Created {summary['created']} experience entries", **summary}
+
 # Projects endpoints
 @api_router.get("/projects", response_model=List[Project])
-async def get_projects():
-    """Get all projects"""
+async def get_projects(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    category: Optional[str] = None,
+    technology: Optional[List[str]] = Query(None),
+):
+    """Get all projects, or those in ``category`` using every ``technology`` given"""
+    selected = select_fields(fields, Project)
+    # $all matching ignores the order technologies are given in
+    etag = list_etag("projects", selected, {"category": category, "technology": sorted(technology or ())})
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     try:
-        projects_list = await db_manager.get_all_projects()
-        
-        for proj in projects_list:
-            if '_id' in proj:
-                proj.pop('_id')
+        projects_list = await db_manager.get_all_projects(
+            selected, category=category, technologies=tuple(technology) if technology else None
+        )
         
+        modified = last_modified(projects_list)
+        if not_modified_since(request, modified):
+            return not_modified(etag, modified)
+        headers = validator_headers(etag, modified)
+        # Partial documents can't go through response_model validation
+        if FAST_RESPONSES or selected:
+            return FastJSONResponse(projects_list, headers=headers)
+        response.headers.update(headers)
         return projects_list
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching projects: {str(e)}")
 
+@api_router.get("/projects/facets", response_model=ProjectFacets)
+async def get_project_facets(request: Request):
+    """Project counts per category and technology, for filter sidebars"""
+    version = db_manager.content_version("projects")
+    etag = make_etag(f"{version}-facets")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    facets = project_facets_cache.get(version)
+    if facets is None:
+        try:
+            facets = await db_manager.get_project_facets()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching project facets: {str(e)}")
+        project_facets_cache.set(version, facets)
+    return FastJSONResponse(facets, headers=validator_headers(etag))
+
 @api_router.post("/projects")
 async def create_project(project_data: ProjectCreate):
     """Add new project"""
     try:
         proj_dict = Project(**project_data.dict()).dict()
         result = await db_manager.create_project(proj_dict)
+        index_for_search("project", [result])
+        await refresh_portfolio_snapshot()
         return {"message": "Project created successfully", "id": result["id"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating project: {str(e)}")
 
+@api_router.post("/projects:batch")
+async def create_projects_batch(
+    items: List[Any] = Body(...),
+    ordered: bool = False,
+):
+    """Add many projects in bulk, with a result per item"""
+    summary = await create_batch(items, ProjectCreate, Project, db_manager.create_projects_many, ordered, "project")
+    return {"message": f"Created {summary['created']} projects", **summary}
+
+# Search endpoint
+@api_router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[SearchKind] = Query(None, alias="type"),
+    category: Optional[str] = None,
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=SEARCH_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=SEARCH_MAX_OFFSET),
+):
+    """Search projects (title, description, technologies) and experience
+    (position, company, responsibilities), best matches first.
+
+    ``type`` restricts results to one kind and ``category`` to projects in
+    that category; page with ``limit`` and ``offset``.
+    """
+    kinds = (kind,) if kind else None
+    try:
+        if SEARCH_ENGINE == 'text':
+            total, hits = await db_manager.search_text(q, kinds, category, limit, offset)
+        else:
+            await refresh_search_index()
+            total, hits = search_index.search(q, kinds, category, limit, offset)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching: {str(e)}")
+    
+    return {"query": q, "total": total, "limit": limit, "offset": offset, "results": hits}
+
+# Delta sync endpoint
+@api_router.get("/changes", response_model=ChangesResponse)
+async def get_changes(since: Optional[str] = None):
+    """Experience, projects, skills and portfolio written since ``since``, oldest first.
+
+    Pass the ``token`` of the previous response as ``since``. Changed
+    documents come back whole and deleted ones as ``op: "delete"``; applying
+    a change twice is harmless. Without ``since``, or when it's too old to
+    have kept every deletion, ``reset`` is true and every current document is
+    returned to replace what the client holds.
+    """
+    after = None
+    if since:
+        try:
+            after = decode_change_token(since)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    try:
+        # Read before the changes, so whatever lands meanwhile is in the next response
+        issued_at = datetime.utcnow()
+        current = await db_manager.get_change_seq()
+        if after is not None:
+            seq, previous, seen = after
+            # A token newer than the counter comes from a database since replaced
+            if seq > current or previous - CHANGES_OVERLAP < issued_at - TOMBSTONE_RETENTION:
+                after = None
+        if after is None:
+            seen = []
+            changes = await db_manager.get_changes()
+        else:
+            changes = await db_manager.get_changes(seq, previous - CHANGES_OVERLAP, {number for number, _ in seen})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching changes: {str(e)}")
+    
+    # Whatever the next request's overlap will re-read, the client now holds
+    cutoff = issued_at - CHANGES_OVERLAP
+    seen = [(number, stamp) for number, stamp in seen if stamp >= cutoff]
+    seen.extend(
+        (change["seq"], change["changed_at"])
+        for change in changes
+        if change["changed_at"] is not None and change["changed_at"] >= cutoff
+    )
+    return {"token": encode_change_token(current, issued_at, seen), "reset": after is None, "changes": changes}
+
 # Contact messages endpoints
-@api_router.post("/contact/messages")
+@api_router.post("/contact/messages", dependencies=[Depends(limit_contact_by_ip)])
 async def submit_contact_message(message_data: ContactMessageCreate):
     """Submit contact form message"""
+    fingerprint = contact_dedup.fingerprint(
+        message_data.name.strip(),
+        message_data.email.lower(),
+        message_data.subject.strip(),
+        message_data.message.strip(),
+    )
+    duplicate_id = contact_dedup.lookup(fingerprint)
+    if duplicate_id:
+        return {
+            "message": "Message submitted successfully! Thank you for reaching out.", 
+            "id": duplicate_id
+        }
+    
+    allowed, retry_after = contact_email_limiter.allow(message_data.email.lower())
+    if not allowed:
+        raise rate_limited(retry_after)
+    
     try:
         msg_dict = ContactMessage(**message_data.dict()).dict()
-        result = await db_manager.create_contact_message(msg_dict)
+        # Claim the fingerprint before awaiting so concurrent repeats see it
+        contact_dedup.remember(fingerprint, msg_dict["id"])
+        if CONTACT_WRITE_BEHIND:
+            await contact_queue.put(msg_dict)
+            result = msg_dict
+        else:
+            result = await db_manager.create_contact_message(msg_dict)
+            publish_message_created(result)
         
         return {
             "message": "Message submitted successfully! Thank you for reaching out.", 
             "id": result["id"]
         }
+    except (asyncio.QueueFull, RuntimeError):
+        contact_dedup.forget(fingerprint)
+        raise HTTPException(
+            status_code=503,
+            detail="Too many messages are waiting to be saved, please try again shortly",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
+        contact_dedup.forget(fingerprint)
         raise HTTPException(status_code=500, detail=f"Error submitting message: {str(e)}")
 
 @api_router.get("/contact/messages", response_model=List[ContactMessage])
-async def get_contact_messages():
-    """Get all contact messages (admin functionality)"""
+async def get_contact_messages(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MESSAGES_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    status: Optional[MessageStatus] = None,
+    format: Literal["json", "ndjson"] = "json",
+    fields: Optional[str] = None,
+):
+    """Get contact messages newest first (admin functionality).
+
+    JSON responses are paginated; pass the X-Next-Cursor header back as
+    ``cursor`` for the following page. ``format=ndjson`` streams every
+    matching message (up to ``limit`` if given) one document per line.
+    """
     try:
-        messages_list = await db_manager.get_all_messages()
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # The keyset cursor is built from created_at and id
+    selected = select_fields(fields, ContactMessage, required=("id", "created_at"))
+    
+    if format == "ndjson":
+        async def stream_messages():
+            async for msg in db_manager.iter_messages(
+                after=after, status=status, limit=limit or 0, fields=selected
+            ):
+                yield ndjson_line(msg)
         
-        for msg in messages_list:
-            if '_id' in msg:
-                msg.pop('_id')
+        return StreamingResponse(stream_messages(), media_type="application/x-ndjson")
+    
+    try:
+        messages_list, has_more = await db_manager.get_messages_page(
+            limit or MESSAGES_PAGE_SIZE, after=after, status=status, fields=selected
+        )
         
+        headers = {"X-Next-Cursor": encode_cursor(messages_list[-1])} if has_more else {}
+        if FAST_RESPONSES or selected:
+            return FastJSONResponse(messages_list, headers=headers)
+        response.headers.update(headers)
         return messages_list
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching messages: {str(e)}")
 
+@api_router.get("/contact/messages/stream")
+async def stream_contact_messages(request: Request):
+    """Server-Sent Events feed of new messages (``created``) and status changes (``status``).
+
+    Reconnecting clients send Last-Event-ID and receive what they missed; a
+    ``reset`` event means events were lost and the list should be reloaded.
+    """
+    return StreamingResponse(
+        message_events.subscribe(request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@api_router.patch("/contact/messages/{message_id}")
+async def update_contact_message_status(message_id: str, update: ContactMessageStatusUpdate):
+    """Mark a message read, unread or replied (admin functionality)"""
+    try:
+        previous = await db_manager.update_message_status(message_id, update.status)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating message: {str(e)}")
+    if previous is None:
+        raise HTTPException(status_code=404, detail="Message not found")
+    
+    if previous.get("status") != update.status:
+        message_events.publish("status", {
+            "id": message_id,
+            "status": update.status,
+            "previous_status": previous.get("status"),
+        })
+    return {"message": "Message status updated", "id": message_id, "status": update.status}
+
+# Several API requests in one round trip; each sub-request skips the
+# middleware the batch itself went through
+BATCH_REQUEST_MAX_ITEMS = int(os.environ.get('BATCH_REQUEST_MAX_ITEMS', '20'))
+batch_dispatcher = BatchDispatcher(app, timeout=float(os.environ.get('BATCH_REQUEST_TIMEOUT', '10')))
+
+@api_router.post("/batch", responses={200: {"model": BatchResponse}})
+async def run_batch(batch: BatchRequest, request: Request):
+    """Run several API requests concurrently and return their responses in order.
+
+    Each item gives a ``method``, a ``path`` under /api and optionally
+    ``params``, ``headers`` and a JSON ``body``. Every response carries its
+    own ``status``, so one failing item doesn't fail the others.
+    """
+    if len(batch.requests) > BATCH_REQUEST_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_REQUEST_MAX_ITEMS} requests per batch")
+    for index, item in enumerate(batch.requests):
+        path = item.path.partition("?")[0]
+        if not path.startswith("/api/") or path.rstrip("/") == "/api/batch":
+            raise HTTPException(
+                status_code=400,
+                detail=f"Request {index}: path must be an /api endpoint other than /api/batch",
+            )
+    
+    body = await batch_dispatcher.run(request.scope, [item.dict() for item in batch.requests])
+    return Response(body, media_type="application/json")
+
 # Health check endpoint
 @api_router.get("/")
 async def root():
     return {"message": "Portfolio API is running!", "version": "1.0.0"}
 
+def collect_stats() -> dict:
+    return {
+        "portfolio_cache": portfolio_cache.stats(),
+        "single_flight": db_manager.flight.stats(),
+        "contact_queue": contact_queue.stats(),
+        "contact_rate_limit": {
+            "ip": contact_ip_limiter.stats(),
+            "email": contact_email_limiter.stats(),
+        },
+        "contact_dedup": contact_dedup.stats(),
+        "profiling": profiler.stats(),
+        "cache_invalidation": cache_invalidator.stats(),
+        "compression_cache": compressed_cache.stats(),
+        "message_stream": message_events.stats(),
+        "search_index": search_index.stats(),
+        "project_facets_cache": project_facets_cache.stats(),
+        "batch": batch_dispatcher.stats(),
+    }
+
+metrics_registry.register_collector(stats_gauges(
+    "portfolio_component_stat",
+    "In-process component counters, as reported by /api/stats",
+    collect_stats,
+))
+
+@api_router.get("/stats")
+async def get_stats():
+    """In-process cache counters for monitoring"""
+    return collect_stats()
+
+@api_router.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of request, database and component metrics"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -203,8 +877,28 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "X-Next-Cursor"],
 )
 
+if COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=int(os.environ.get('COMPRESSION_MIN_SIZE', '500')),
+        gzip_level=int(os.environ.get('GZIP_LEVEL', '6')),
+        brotli_quality=int(os.environ.get('BROTLI_QUALITY', '5')),
+        cache=compressed_cache,
+    )
+
+if METRICS_ENABLED:
+    app.add_middleware(
+        MetricsMiddleware,
+        requests=http_requests_total,
+        latency=http_request_duration,
+    )
+
+if profiler.enabled:
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -212,6 +906,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def prepare_database():
+    try:
+        await db_manager.load_shared_versions()
+    except Exception as e:
+        logger.error(f"Error loading shared content versions: {str(e)}")
+    try:
+        await db_manager.migrate_singletons()
+    except Exception as e:
+        logger.error(f"Error migrating singleton documents: {str(e)}")
+    try:
+        await db_manager.ensure_project_facets()
+    except Exception as e:
+        logger.error(f"Error building project facets: {str(e)}")
+    
+    if os.environ.get('AUTO_INDEXES', '1') == '0':
+        return
+    try:
+        await db_manager.ensure_indexes()
+    except Exception as e:
+        # A conflicting or unbuildable index shouldn't keep the API down
+        logger.error(f"Error ensuring indexes: {str(e)}")
+
+@app.on_event("startup")
+async def build_search_index():
+    if SEARCH_ENGINE != 'index':
+        return
+    try:
+        await refresh_search_index()
+    except Exception as e:
+        logger.error(f"Error building search index: {str(e)}")
+
+@app.on_event("startup")
+async def start_contact_queue():
+    if CONTACT_WRITE_BEHIND:
+        await contact_queue.start()
+
+@app.on_event("startup")
+async def start_cache_invalidation():
+    if CACHE_INVALIDATION != 'off':
+        await cache_invalidator.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await cache_invalidator.stop()
+    # Flush buffered contact messages while the client is still open
+    await contact_queue.drain()
     client.close()
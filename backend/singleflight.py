@@ -0,0 +1,80 @@
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Collapse concurrent calls sharing a key into one in-flight execution.
+
+    The first caller for a key starts the work as its own task; everyone who
+    arrives before it finishes awaits that same task and gets the same result
+    (or exception). Results are shared, so callers must treat them as
+    read-only. Nothing is remembered once the task completes, and ``forget``
+    makes later callers start afresh instead of joining work already running.
+    Keys are ``(collection, ...)`` tuples naming what the work reads, so a
+    write to one collection only forgets the reads of that collection.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        # Shield so one caller giving up doesn't cancel the work for the rest
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        # A forgotten task must not remove the one that replaced it
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def forget(self, *collections: str) -> None:
+        """Don't hand running reads of ``collections`` (default: all) to new callers.
+
+        Callers already waiting still get the result.
+        """
+        if not collections:
+            self._inflight.clear()
+            return
+        for key in [key for key in self._inflight if key[0] in collections]:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
+
+
+def coalesce(collection: str) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Route a DatabaseManager read of ``collection`` through its ``flight`` keyed by call arguments.
+
+    The wrapped method also takes ``coalesced=False``, which runs the read on
+    its own instead of joining one already in flight.
+    """
+
+    def decorator(method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(method)
+        async def wrapper(self, *args, coalesced: bool = True, **kwargs):
+            key = (collection, method.__name__, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                coalesced = False
+            if not coalesced:
+                return await method(self, *args, **kwargs)
+            return await self.flight.do(key, method, self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,68 @@
+"""
+Materialized GET /api/portfolio response.
+
+The portfolio payload merges four collections. Instead of assembling it per
+request, it is validated against PortfolioResponse once, encoded to JSON and
+stored as a single ``portfolio_snapshot`` document keyed on SINGLETON_ID.
+Reads serve the stored bytes as-is. Writes that touch portfolio, skills,
+experience or projects rebuild it (see refresh_portfolio_snapshot in server.py),
+and ``python rebuild_snapshot.py`` rebuilds it by hand.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from conditional import last_modified
+from database import DatabaseManager
+from fastjson import dumps
+from models import PortfolioResponse
+from seed_data import seed_database
+
+
+async def load_portfolio_data(db_manager: DatabaseManager) -> dict:
+    """Read (seeding first if needed) and assemble the full portfolio payload.
+    
+    Reads bypass single-flight: a rebuild after a write must not share a
+    read that started before it.
+    """
+    portfolio, skills, experience, projects = await db_manager.get_portfolio_parts(coalesced=False)
+    
+    if not portfolio:
+        # If no portfolio exists, seed the database
+        await seed_database(db_manager)
+        portfolio, skills, experience, projects = await db_manager.get_portfolio_parts(coalesced=False)
+    
+    return {
+        **portfolio,
+        "skills": skills,
+        "experience": experience,
+        "projects": projects
+    }
+
+
+async def build_portfolio_snapshot(db_manager: DatabaseManager) -> Optional[dict]:
+    """Assemble, validate and encode the portfolio, then store it as the snapshot.
+    
+    Returns the stored snapshot document; if another process stored one built
+    from a later read in the meantime, that one is returned instead.
+    """
+    read_at = datetime.utcnow()
+    data = await load_portfolio_data(db_manager)
+    body = dumps(PortfolioResponse(**data).dict())
+    snapshot = {
+        "body": body,
+        # Content hash, so identical payloads share an ETag across rebuilds and processes
+        "etag": hashlib.sha256(body).hexdigest()[:32],
+        "last_modified": last_modified([
+            data,
+            data["skills"],
+            *data["experience"],
+            *data["projects"],
+        ]),
+        "size": len(body),
+    }
+    saved = await db_manager.save_portfolio_snapshot(snapshot, read_at)
+    if saved is None:
+        saved = await db_manager.get_portfolio_snapshot()
+    return saved
@@ -0,0 +1,33 @@
+"""
+Storage engine selection.
+
+DatabaseManager talks to its backend through the Motor collection API
+(find/find_one/insert_many/find_one_and_update/...). Two engines provide it:
+
+    mongo   AsyncIOMotorClient against MONGO_URL (the default)
+    memory  memory_store.MemoryClient, held in process and lost on exit
+
+STORAGE_ENGINE picks one. The memory engine needs no external service, which
+suits CI, load tests and read-only deployments serving the seeded portfolio.
+"""
+
+import os
+from typing import Any, Optional, Tuple
+
+ENGINES = ("mongo", "memory")
+
+
+def connect(engine: Optional[str] = None) -> Tuple[Any, Any]:
+    """Return ``(client, database)`` for ``engine`` (default: $STORAGE_ENGINE or mongo)"""
+    engine = (engine or os.environ.get('STORAGE_ENGINE', 'mongo')).lower()
+    if engine == "mongo":
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+        return client, client[os.environ['DB_NAME']]
+    if engine == "memory":
+        from memory_store import MemoryClient
+
+        client = MemoryClient()
+        return client, client[os.environ.get('DB_NAME', 'portfolio')]
+    raise ValueError(f"Unknown STORAGE_ENGINE {engine!r}; expected one of {', '.join(ENGINES)}")
@@ -0,0 +1,272 @@
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastjson import dumps
+
+logger = logging.getLogger(__name__)
+
+LOCK_SUFFIX = ".lock"
+
+
+class WriteBehindQueue:
+    """Accept documents immediately and persist them in batches in the background.
+
+    ``put`` appends the document to a spool file (fsynced) in ``spool_dir``
+    before it is queued, so anything acknowledged survives a crash. The
+    flusher hands batches to ``flush`` once ``max_batch`` documents are
+    waiting or ``max_delay`` seconds have passed, retrying with backoff while
+    it raises.
+
+    Each process spools to its own segment files, named after an owner id
+    whose ``.lock`` file it holds an flock on for as long as it runs, so
+    workers sharing a directory never touch each other's files. A segment is
+    sealed once it holds ``max_batch`` documents and deleted as soon as every
+    one of them is flushed, which keeps the spool bounded under steady
+    traffic. ``start`` adopts the segments of owners whose lock is free (the
+    process is gone) and replays them. ``flush`` must tolerate seeing a
+    document twice, since a crash between a flush and the delete replays it.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[dict]], Awaitable[None]],
+        spool_dir: Optional[Path] = None,
+        decode: Callable[[dict], dict] = dict,
+        max_batch: int = 100,
+        max_delay: float = 0.25,
+        max_pending: int = 10000,
+        enqueue_timeout: float = 1.0,
+    ):
+        self._flush = flush
+        self.spool_dir = Path(spool_dir) if spool_dir else None
+        self._decode = decode
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.enqueue_timeout = enqueue_timeout
+        # Items are (segment holding the document, document)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._spool_lock = asyncio.Lock()
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._owner_lock: Optional[int] = None
+        self._segment: Optional[Path] = None
+        self._segment_docs = 0
+        self._segment_seq = 0
+        # Unflushed documents per segment
+        self._segments: Dict[Path, int] = {}
+        self._unflushed = 0
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.accepted = 0
+        self.rejected = 0
+        self.flushed = 0
+        self.batches = 0
+        self.flush_errors = 0
+        self.replayed = 0
+
+    async def start(self) -> None:
+        """Replay what exited processes left in the spool, then start the background flusher"""
+        if self.spool_dir:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            self._owner_lock = await asyncio.to_thread(self._lock_owner)
+            for lock, lock_path, segments in await asyncio.to_thread(self._claim_orphans):
+                docs = []
+                for segment in segments:
+                    docs.extend(await asyncio.to_thread(self._read_spool, segment))
+                # Into our own spool before the orphan's files go, so nothing is lost in between
+                async with self._spool_lock:
+                    for item in await self._spool(docs):
+                        self._queue.put_nowait(item)
+                    self._unflushed += len(docs)
+                self.replayed += len(docs)
+                await asyncio.to_thread(self._release_orphan, lock, lock_path, segments)
+        self._task = asyncio.create_task(self._run())
+
+    async def put(self, doc: dict) -> None:
+        """Durably accept ``doc``; raises asyncio.QueueFull when the buffer stays full"""
+        if self._closed:
+            raise RuntimeError("write-behind queue is shut down")
+
+        # Backpressure: wait briefly for room rather than growing without bound.
+        # Room is checked under the spool lock, which every enqueue holds, so
+        # it is still there once the document is spooled; a rejected document
+        # is never spooled.
+        deadline = asyncio.get_running_loop().time() + self.enqueue_timeout
+        while True:
+            async with self._spool_lock:
+                if not self._queue.full():
+                    item, = await self._spool([doc])
+                    self._unflushed += 1
+                    self._queue.put_nowait(item)
+                    break
+            if asyncio.get_running_loop().time() >= deadline:
+                self.rejected += 1
+                raise asyncio.QueueFull()
+            await asyncio.sleep(0.01)
+        self.accepted += 1
+
+    async def drain(self, timeout: float = 10.0) -> None:
+        """Stop accepting, flush what is buffered and stop the flusher"""
+        self._closed = True
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            # Whatever is left stays in the spool and is replayed by the next start
+            logger.warning(f"Write-behind drain timed out with {self._queue.qsize()} documents pending")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._owner_lock is not None and self._unflushed == 0:
+            await asyncio.to_thread(self._release_orphan, self._owner_lock, self._lock_path(self.owner), [])
+            self._owner_lock = None
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize(),
+            "unflushed": self._unflushed,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "replayed": self.replayed,
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "flush_errors": self.flush_errors,
+            "spool_segments": len(self._segments),
+        }
+
+    async def _spool(self, docs: List[dict]) -> List[Tuple[Optional[Path], dict]]:
+        """Append ``docs`` to this process's spool, sealing segments as they fill; hold _spool_lock"""
+        if not self.spool_dir:
+            return [(None, doc) for doc in docs]
+        items = []
+        while len(items) < len(docs):
+            if self._segment is None:
+                self._segment_seq += 1
+                self._segment = self.spool_dir / f"{self.owner}.{self._segment_seq:08d}.jsonl"
+                self._segment_docs = 0
+                self._segments[self._segment] = 0
+            chunk = docs[len(items):len(items) + self.max_batch - self._segment_docs]
+            await asyncio.to_thread(
+                self._append_spool, self._segment, b"".join(dumps(doc) + b"\n" for doc in chunk)
+            )
+            items.extend((self._segment, doc) for doc in chunk)
+            self._segments[self._segment] += len(chunk)
+            self._segment_docs += len(chunk)
+            if self._segment_docs >= self.max_batch:
+                self._segment = None
+        return items
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush_batch(batch)
+
+    async def _flush_batch(self, batch: List[Tuple[Optional[Path], dict]]) -> None:
+        delay = 0.1
+        while True:
+            try:
+                await self._flush([doc for _, doc in batch])
+                break
+            except Exception as e:
+                self.flush_errors += 1
+                logger.warning(f"Write-behind flush of {len(batch)} documents failed, retrying: {str(e)}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 5.0)
+
+        self.flushed += len(batch)
+        self.batches += 1
+        async with self._spool_lock:
+            self._unflushed -= len(batch)
+            for segment, _ in batch:
+                if segment is not None:
+                    self._segments[segment] -= 1
+            done = [segment for segment, unflushed in self._segments.items() if unflushed == 0]
+            for segment in done:
+                del self._segments[segment]
+                if segment == self._segment:
+                    self._segment = None
+            if done:
+                await asyncio.to_thread(self._remove_files, done)
+        for _ in batch:
+            self._queue.task_done()
+
+    # Blocking file helpers, run in a worker thread
+    def _lock_path(self, owner: str) -> Path:
+        return self.spool_dir / f"{owner}{LOCK_SUFFIX}"
+
+    def _lock_owner(self) -> int:
+        fd = os.open(self._lock_path(self.owner), os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return fd
+
+    def _claim_orphans(self) -> List[Tuple[int, Path, List[Path]]]:
+        """Lock every other owner that is gone; its lock, lock file and segments, oldest first"""
+        claimed = []
+        for lock_path in sorted(self.spool_dir.glob(f"*{LOCK_SUFFIX}")):
+            owner = lock_path.name[:-len(LOCK_SUFFIX)]
+            if owner == self.owner:
+                continue
+            try:
+                fd = os.open(lock_path, os.O_RDWR)
+            except FileNotFoundError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Still running
+                os.close(fd)
+                continue
+            if os.fstat(fd).st_nlink == 0:
+                # Another process adopted it first
+                os.close(fd)
+                continue
+            claimed.append((fd, lock_path, sorted(self.spool_dir.glob(f"{owner}.*.jsonl"))))
+        return claimed
+
+    def _release_orphan(self, fd: int, lock_path: Path, segments: List[Path]) -> None:
+        self._remove_files(segments)
+        # Unlink while still locked, so nobody claims it in between
+        lock_path.unlink(missing_ok=True)
+        os.close(fd)
+
+    def _remove_files(self, paths: List[Path]) -> None:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def _append_spool(self, segment: Path, data: bytes) -> None:
+        with open(segment, "ab") as spool:
+            spool.write(data)
+            spool.flush()
+            os.fsync(spool.fileno())
+
+    def _read_spool(self, segment: Path) -> List[dict]:
+        docs = []
+        with open(segment, "rb") as spool:
+            for line in spool:
+                try:
+                    docs.append(self._decode(json.loads(line)))
+                except Exception as e:
+                    # A torn final line from a crash mid-append was never acknowledged
+                    logger.warning(f"Skipping unreadable spool entry: {str(e)}")
+        return docs
@@ -126,9 +126,10 @@ export const experienceAPI = {
 // Projects API endpoints
 export const projectsAPI = {
   // Get all projects
-  getProjects: async () => {
+  // params: { fields: 'title,category' } to fetch only the fields a view renders
+  getProjects: async (params = {}) => {
     try {
-      const response = await apiClient.get('/projects');
+      const response = await apiClient.get('/projects', { params });
       return { success: true, data: response.data };
     } catch (error) {
       return { 
@@ -167,11 +168,16 @@ export const contactAPI = {
     }
   },
 
-  // Get all messages (admin functionality)
-  getMessages: async () => {
+  // Get a page of messages (admin functionality)
+  // params: { limit, cursor, status } - pass nextCursor back as cursor for the next page
+  getMessages: async (params = {}) => {
     try {
-      const response = await apiClient.get('/contact/messages');
-      return { success: true, data: response.data };
+      const response = await apiClient.get('/contact/messages', { params });
+      return {
+        success: true,
+        data: response.data,
+        nextCursor: response.headers['x-next-cursor'] || null,
+      };
     } catch (error) {
       return { 
         success: false, 
@@ -181,6 +187,24 @@ export const contactAPI = {
   },
 };
 
+// Batch API endpoint
+export const batchAPI = {
+  // Run several requests in one round trip
+  // requests: [{ id, method, path: '/api/skills', params, body }] - each response
+  // comes back in the same order with its own status, headers and body
+  run: async (requests) => {
+    try {
+      const response = await apiClient.post('/batch', { requests });
+      return { success: true, data: response.data.responses };
+    } catch (error) {
+      return {
+        success: false,
+        error: error.response?.data?.detail || error.message || 'Failed to run batch request'
+      };
+    }
+  },
+};
+
 // Health check endpoint
 export const healthAPI = {
   // Check API health
@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# The API runs on the in-process storage engine; nothing here needs MongoDB
+os.environ.setdefault('STORAGE_ENGINE', 'memory')
+os.environ.setdefault('DB_NAME', 'portfolio_test')
+os.environ.setdefault('CACHE_INVALIDATION', 'off')
+os.environ.setdefault('CONTACT_WRITE_BEHIND', '0')
+os.environ.setdefault('CONTACT_SPOOL_DIR', tempfile.mkdtemp(prefix='contact-spool-'))
+for name in ('CONTACT_IP_BURST', 'CONTACT_EMAIL_BURST', 'CONTACT_IP_RATE_PER_MINUTE', 'CONTACT_EMAIL_RATE_PER_MINUTE'):
+    os.environ.setdefault(name, '1000000')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+def app():
+    """The server module, pointed at an empty memory database with cold caches"""
+    import server
+    from database import DatabaseManager
+    from memory_store import MemoryDatabase
+
+    server.db_manager = DatabaseManager(MemoryDatabase())
+    server.portfolio_cache.clear()
+    server.portfolio_validators.clear()
+    server.project_facets_cache.clear()
+    server.contact_dedup._seen.clear()
+    server.search_index_stale.update(server.SEARCH_COLLECTIONS)
+    return server
+
+
+@pytest.fixture
+async def client(app):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app.app)
+    # Uncompressed, so ETags come back exactly as the endpoints set them
+    headers = {'Accept-Encoding': 'identity'}
+    async with httpx.AsyncClient(transport=transport, base_url='http://testserver', headers=headers) as client:
+        yield client
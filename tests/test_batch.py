@@ -0,0 +1,99 @@
+import pytest
+
+from batch import query_string
+
+pytestmark = pytest.mark.anyio
+
+PROJECT = {
+    "title": "Batched",
+    "description": "Created inside a batch",
+    "technologies": ["Python"],
+    "category": "web",
+    "image": "batched.png",
+}
+
+
+def test_query_string_repeats_lists_and_keeps_the_path_query():
+    assert query_string({"technology": ["Go", "Rust"], "flag": True}, "fields=id") == (
+        "fields=id&technology=Go&technology=Rust&flag=true"
+    )
+    assert query_string({}, "a=1") == "a=1"
+
+
+async def test_responses_come_back_in_request_order(client):
+    response = await client.post("/api/batch", json={"requests": [
+        {"id": "projects", "path": "/api/projects", "params": {"fields": "id,title"}},
+        {"id": "missing", "method": "PATCH", "path": "/api/contact/messages/nope", "body": {"status": "read"}},
+        {"id": "create", "method": "POST", "path": "/api/projects", "body": PROJECT},
+        {"id": "health", "path": "/api/"},
+    ]})
+    responses = response.json()["responses"]
+
+    assert response.status_code == 200
+    assert [item["id"] for item in responses] == ["projects", "missing", "create", "health"]
+    assert [item["status"] for item in responses] == [200, 404, 200, 200]
+    assert all(set(item) == {"id", "title"} for item in responses[0]["body"])
+    assert responses[1]["body"] == {"detail": "Message not found"}
+    assert responses[3]["body"]["message"] == "Portfolio API is running!"
+
+
+async def test_sub_responses_keep_their_headers(client):
+    await client.get("/api/portfolio")
+
+    response = await client.post("/api/batch", json={"requests": [{"path": "/api/experience"}]})
+    item = response.json()["responses"][0]
+    direct = await client.get("/api/experience")
+
+    assert item["headers"]["etag"] == direct.headers["etag"]
+    assert "content-type" not in item["headers"]
+    assert item["body"] == direct.json()
+
+
+async def test_sub_request_headers_are_passed_on(client):
+    etag = (await client.get("/api/experience")).headers["etag"]
+
+    response = await client.post("/api/batch", json={"requests": [
+        {"path": "/api/experience", "headers": {"If-None-Match": etag}},
+    ]})
+    item = response.json()["responses"][0]
+
+    assert item["status"] == 304
+    assert item["body"] is None
+
+
+async def test_invalid_sub_request_body_is_a_422_for_that_item_only(client):
+    response = await client.post("/api/batch", json={"requests": [
+        {"method": "POST", "path": "/api/projects", "body": {"title": "Incomplete"}},
+        {"path": "/api/"},
+    ]})
+
+    assert [item["status"] for item in response.json()["responses"]] == [422, 200]
+
+
+async def test_slow_sub_request_times_out_alone(app, client, monkeypatch):
+    monkeypatch.setattr(app.batch_dispatcher, "timeout", 0.2)
+
+    response = await client.post("/api/batch", json={"requests": [
+        # An event stream never completes on its own
+        {"id": "stream", "path": "/api/contact/messages/stream"},
+        {"id": "health", "path": "/api/"},
+    ]})
+    stream, health = response.json()["responses"]
+
+    assert (stream["status"], stream["body"]) == (504, {"detail": "Batched request timed out"})
+    assert health["status"] == 200
+
+
+@pytest.mark.parametrize("path", ["/api/batch", "/docs", "https://example.com/api/projects"])
+async def test_paths_outside_the_api_are_rejected(client, path):
+    response = await client.post("/api/batch", json={"requests": [{"path": path}]})
+
+    assert response.status_code == 400
+
+
+async def test_too_many_requests_are_rejected(app, client, monkeypatch):
+    monkeypatch.setattr(app, "BATCH_REQUEST_MAX_ITEMS", 1)
+
+    response = await client.post("/api/batch", json={"requests": [{"path": "/api/"}, {"path": "/api/"}]})
+
+    assert response.status_code == 413
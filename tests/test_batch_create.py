@@ -0,0 +1,79 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def project(title):
+    return {
+        "title": title,
+        "description": f"{title} description",
+        "technologies": ["Python"],
+        "category": "web",
+        "image": "project.png",
+    }
+
+
+def experience(position):
+    return {
+        "position": position,
+        "company": "Acme",
+        "period": "2020 - 2022",
+        "responsibilities": ["Shipping"],
+    }
+
+
+async def test_unordered_batch_inserts_every_valid_item(client):
+    response = await client.post("/api/projects:batch", json=[project("One"), {"title": "Invalid"}, "nope", project("Two")])
+    body = response.json()
+    projects = (await client.get("/api/projects")).json()
+
+    assert response.status_code == 200
+    assert (body["created"], body["failed"]) == (2, 2)
+    assert [result["status"] for result in body["results"]] == ["created", "invalid", "invalid", "created"]
+    assert [result["index"] for result in body["results"]] == [0, 1, 2, 3]
+    assert body["results"][2]["error"] == "item must be a JSON object"
+    assert {"One", "Two"} <= {item["title"] for item in projects}
+
+
+async def test_ordered_batch_stops_at_the_first_invalid_item(client):
+    response = await client.post(
+        "/api/experience:batch",
+        params={"ordered": "true"},
+        json=[experience("First"), {"position": "Invalid"}, experience("Third")],
+    )
+    body = response.json()
+    positions = {item["position"] for item in (await client.get("/api/experience")).json()}
+
+    assert [result["status"] for result in body["results"]] == ["created", "invalid", "skipped"]
+    assert body["created"] == 1
+    assert "First" in positions
+    assert "Third" not in positions
+
+
+async def test_ordered_insert_reports_later_documents_as_not_attempted(app):
+    await app.db_manager.ensure_indexes()
+    docs = [{"id": "a", "title": "A"}, {"id": "a", "title": "Duplicate"}, {"id": "c", "title": "C"}]
+
+    errors = await app.db_manager.create_projects_many(docs, ordered=True)
+
+    assert errors[0] is None
+    assert errors[1] is not None
+    assert errors[2] == "not attempted: an earlier document failed"
+
+
+async def test_unordered_insert_keeps_going_past_a_duplicate(app):
+    await app.db_manager.ensure_indexes()
+    docs = [{"id": "a", "title": "A"}, {"id": "a", "title": "Duplicate"}, {"id": "c", "title": "C"}]
+
+    errors = await app.db_manager.create_projects_many(docs, ordered=False)
+
+    assert errors[0] is None and errors[2] is None
+    assert errors[1] is not None
+
+
+async def test_oversized_batch_is_rejected(app, client, monkeypatch):
+    monkeypatch.setattr(app, "BATCH_MAX_ITEMS", 2)
+
+    response = await client.post("/api/projects:batch", json=[project("1"), project("2"), project("3")])
+
+    assert response.status_code == 413
@@ -0,0 +1,102 @@
+import gzip
+
+import pytest
+
+from compression import CompressionMiddleware, accepted_encodings
+
+pytestmark = pytest.mark.anyio
+
+BODY = b'{"items": [' + b",".join(b'"item"' for _ in range(500)) + b"]}"
+
+
+def json_app(*messages):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json"), (b"etag", b'"abc"')],
+        })
+        for message in messages:
+            await send(message)
+
+    return app
+
+
+async def call(app, accept_encoding="gzip"):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/things",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    await CompressionMiddleware(app)(scope, None, send)
+    return sent
+
+
+def headers(message):
+    return dict(message["headers"])
+
+
+def test_accepted_encodings_skip_q_zero():
+    assert accepted_encodings("gzip;q=0.5, br;q=0, identity") == {"gzip", "identity"}
+
+
+async def test_complete_body_is_compressed_and_etag_weakened():
+    start, body = await call(json_app({"type": "http.response.body", "body": BODY}))
+
+    assert headers(start)[b"content-encoding"] == b"gzip"
+    assert headers(start)[b"etag"] == b'W/"abc"'
+    assert gzip.decompress(body["body"]) == BODY
+
+
+async def test_small_body_passes_through():
+    start, body = await call(json_app({"type": "http.response.body", "body": b"{}"}))
+
+    assert b"content-encoding" not in headers(start)
+    assert body["body"] == b"{}"
+
+
+async def test_streamed_body_is_compressed_chunk_by_chunk():
+    chunks = [BODY[:1000], BODY[1000:]]
+    sent = await call(json_app(
+        {"type": "http.response.body", "body": chunks[0], "more_body": True},
+        {"type": "http.response.body", "body": chunks[1], "more_body": False},
+    ))
+
+    start, *bodies = sent
+    assert headers(start)[b"content-encoding"] == b"gzip"
+    assert gzip.decompress(b"".join(message["body"] for message in bodies)) == BODY
+
+
+async def test_pathsend_releases_the_held_start_uncompressed():
+    pathsend = {"type": "http.response.pathsend", "path": "/srv/export.json"}
+
+    sent = await call(json_app(pathsend))
+
+    assert [message["type"] for message in sent] == ["http.response.start", "http.response.pathsend"]
+    assert b"content-encoding" not in headers(sent[0])
+    assert headers(sent[0])[b"etag"] == b'"abc"'
+
+
+async def test_write_response_etag_stays_usable_for_if_match(app):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        portfolio = (await client.get("/api/portfolio", headers={"Accept-Encoding": "gzip"})).json()
+        body = {field: portfolio[field] for field in ("personal", "about", "education", "certifications")}
+
+        first = await client.put("/api/portfolio", json=body, headers={"Accept-Encoding": "gzip"})
+        second = await client.put(
+            "/api/portfolio", json=body, headers={"Accept-Encoding": "gzip", "If-Match": first.headers["etag"]}
+        )
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["etag"] == f'"v{portfolio["version"] + 1}"'
+    assert second.status_code == 200
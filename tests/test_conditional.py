@@ -0,0 +1,76 @@
+import pytest
+
+from conditional import make_etag
+from database import DatabaseManager
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_list_etags_match_across_workers_and_restarts(app, client):
+    await app.db_manager.load_shared_versions()
+    await client.get("/api/portfolio")
+    etag = (await client.get("/api/skills")).headers["etag"]
+
+    # Another worker, or this one restarted, over the same database
+    app.db_manager = DatabaseManager(app.db_manager.db)
+    await app.db_manager.load_shared_versions()
+    response = await client.get("/api/skills", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+async def test_write_by_another_worker_moves_the_etag(app, client):
+    await app.db_manager.load_shared_versions()
+    await client.get("/api/portfolio")
+    etag = (await client.get("/api/skills")).headers["etag"]
+
+    other = DatabaseManager(app.db_manager.db)
+    await other.load_shared_versions()
+    await other.create_or_update_skills({"technical": ["Rust"], "transferable": []})
+    app.db_manager.apply_shared_versions(await app.db_manager.get_shared_versions())
+    response = await client.get("/api/skills", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["technical"] == ["Rust"]
+    assert response.headers["etag"] == make_etag(other.content_version("skills"))
+
+
+async def test_portfolio_revalidation_skips_the_database(app, client):
+    await client.get("/api/portfolio")
+    etag = (await client.get("/api/portfolio")).headers["etag"]
+    app.portfolio_cache.clear()
+    reads = 0
+    load = app.db_manager.get_portfolio_snapshot
+
+    async def counted():
+        nonlocal reads
+        reads += 1
+        return await load()
+
+    app.db_manager.get_portfolio_snapshot = counted
+    response = await client.get("/api/portfolio", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert reads == 0
+
+
+
+async def test_weak_and_listed_etags_match(client):
+    await client.get("/api/portfolio")
+    etag = (await client.get("/api/projects")).headers["etag"]
+
+    response = await client.get("/api/projects", headers={"If-None-Match": f'"other", W/{etag}'})
+
+    assert response.status_code == 304
+
+
+async def test_if_modified_since_is_answered_from_last_modified(client):
+    await client.get("/api/portfolio")
+    modified = (await client.get("/api/experience")).headers["last-modified"]
+
+    unchanged = await client.get("/api/experience", headers={"If-Modified-Since": modified})
+    stale = await client.get("/api/experience", headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+
+    assert unchanged.status_code == 304
+    assert stale.status_code == 200
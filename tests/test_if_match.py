@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from memory_store import MemoryDatabase
+from database import DatabaseManager
+
+pytestmark = pytest.mark.anyio
+
+PORTFOLIO_FIELDS = ("personal", "about", "education", "certifications")
+SKILLS = {"technical": ["Python"], "transferable": ["Writing"]}
+
+
+async def current_portfolio(client):
+    response = await client.get("/api/portfolio")
+    assert response.status_code == 200
+    data = response.json()
+    return data["version"], {field: data[field] for field in PORTFOLIO_FIELDS}
+
+
+async def test_put_with_current_version_succeeds(client):
+    version, portfolio = await current_portfolio(client)
+    portfolio["about"]["content"] = "Updated"
+
+    response = await client.put("/api/portfolio", json=portfolio, headers={"If-Match": f'"v{version}"'})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == f'"v{version + 1}"'
+    assert (await client.get("/api/portfolio")).json()["about"]["content"] == "Updated"
+
+
+async def test_put_with_stale_version_is_412(client):
+    version, portfolio = await current_portfolio(client)
+    await client.put("/api/portfolio", json=portfolio)
+
+    response = await client.put("/api/portfolio", json=portfolio, headers={"If-Match": f'"v{version}"'})
+
+    assert response.status_code == 412
+
+
+async def test_put_with_foreign_etag_is_412(client):
+    _, portfolio = await current_portfolio(client)
+    etag = (await client.get("/api/portfolio")).headers["etag"]
+
+    response = await client.put("/api/portfolio", json=portfolio, headers={"If-Match": etag})
+
+    assert response.status_code == 412
+
+
+async def test_skills_put_returns_the_version_the_next_put_must_match(client):
+    await client.get("/api/portfolio")
+    version = (await client.get("/api/skills")).json()["version"]
+
+    first = await client.put("/api/skills", json=SKILLS, headers={"If-Match": f'"v{version}"'})
+    second = await client.put("/api/skills", json=SKILLS, headers={"If-Match": f'"v{version}"'})
+    third = await client.put("/api/skills", json=SKILLS, headers={"If-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert second.status_code == 412
+    assert third.status_code == 200
+
+
+async def test_if_match_star_requires_an_existing_document(client):
+    # Nothing is seeded until the first read
+    missing = await client.put("/api/skills", json=SKILLS, headers={"If-Match": "*"})
+    await client.get("/api/portfolio")
+    present = await client.put("/api/skills", json=SKILLS, headers={"If-Match": "*"})
+
+    assert missing.status_code == 412
+    assert present.status_code == 200
+
+
+async def test_concurrent_first_writes_leave_one_singleton():
+    manager = DatabaseManager(MemoryDatabase())
+
+    results = await asyncio.gather(*(manager.create_or_update_skills(dict(SKILLS)) for _ in range(5)))
+
+    assert sorted(result["version"] for result in results) == [1, 2, 3, 4, 5]
+    assert await manager.skills_collection.count_documents({}) == 1
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from database import DatabaseManager
+from invalidation import CacheInvalidator
+from memory_store import MemoryDatabase
+from snapshot import build_portfolio_snapshot
+
+pytestmark = pytest.mark.anyio
+
+
+async def wait_for(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("mode, expected_mode", [("auto", "changestream"), ("poll", "poll")])
+async def test_write_by_one_manager_reaches_the_other(mode, expected_mode):
+    db = MemoryDatabase()
+    writer, reader = DatabaseManager(db), DatabaseManager(db)
+    await writer.load_shared_versions()
+    await reader.load_shared_versions()
+    changed = []
+    invalidator = CacheInvalidator(
+        reader, ("skills", "projects"), changed.append, mode=mode, poll_interval=0.02
+    )
+    await invalidator.start()
+    try:
+        await wait_for(lambda: invalidator.mode == expected_mode)
+        await asyncio.sleep(0.05)
+        changed.clear()
+
+        await writer.create_or_update_skills({"technical": ["Go"], "transferable": []})
+        await wait_for(lambda: "skills" in changed)
+        await wait_for(lambda: reader.content_version("skills") == writer.content_version("skills"))
+    finally:
+        await invalidator.stop()
+
+    assert "projects" not in changed
+    assert reader.content_version("projects") == writer.content_version("projects")
+
+
+async def test_poll_failure_reports_every_collection_changed():
+    manager = DatabaseManager(MemoryDatabase())
+    changed = []
+
+    async def unavailable():
+        raise ConnectionError("database unreachable")
+
+    manager.get_shared_versions = unavailable
+    invalidator = CacheInvalidator(manager, ("skills", "projects"), changed.append, mode="poll", poll_interval=0.02)
+    await invalidator.start()
+    try:
+        await wait_for(lambda: invalidator.errors > 0)
+    finally:
+        await invalidator.stop()
+
+    assert {"skills", "projects"} <= set(changed)
+
+
+async def test_portfolio_follows_another_workers_write(app, client):
+    await client.get("/api/portfolio")
+    etag = (await client.get("/api/portfolio")).headers["etag"]
+    invalidator = CacheInvalidator(
+        app.db_manager, app.cache_invalidator.collections, app.invalidate_local_caches, poll_interval=0.02
+    )
+    await invalidator.start()
+    try:
+        await wait_for(lambda: invalidator.mode == "changestream")
+        other = DatabaseManager(app.db_manager.db)
+        await other.create_or_update_skills({"technical": ["Elixir"], "transferable": []})
+        await build_portfolio_snapshot(other)
+        await wait_for(
+            lambda: app.db_manager.content_version("portfolio_snapshot") == other.content_version("portfolio_snapshot")
+        )
+        # Neither the cached snapshot nor the remembered validators may answer
+        response = await client.get("/api/portfolio", headers={"If-None-Match": etag})
+    finally:
+        await invalidator.stop()
+
+    assert response.status_code == 200
+    assert response.json()["skills"]["technical"] == ["Elixir"]
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from memory_store import MemoryDatabase
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_find_filters_sorts_and_projects():
+    projects = MemoryDatabase().projects
+    await projects.insert_many([
+        {"id": "a", "category": "web", "stars": 5},
+        {"id": "b", "category": "ml", "stars": 9},
+        {"id": "c", "category": "web", "stars": 7},
+    ])
+
+    docs = await projects.find(
+        {"category": "web", "stars": {"$gte": 5}}, {"_id": 0, "id": 1}
+    ).sort("stars", -1).to_list(None)
+
+    assert docs == [{"id": "c"}, {"id": "a"}]
+    assert await projects.count_documents({"category": {"$in": ["ml"]}}) == 1
+    assert await projects.find_one({"missing": {"$exists": False}, "id": "b"}, {"_id": 0, "stars": 1}) == {"stars": 9}
+
+
+async def test_upsert_applies_set_on_insert_only_when_inserting():
+    counters = MemoryDatabase().content_versions
+    update = {"$inc": {"skills": 1}, "$setOnInsert": {"epoch": "first"}}
+
+    created = await counters.find_one_and_update(
+        {"_id": "singleton"}, update, upsert=True, return_document=ReturnDocument.AFTER
+    )
+    update["$setOnInsert"] = {"epoch": "second"}
+    updated = await counters.find_one_and_update(
+        {"_id": "singleton"}, update, {"_id": 0}, upsert=True, return_document=ReturnDocument.AFTER
+    )
+
+    assert created == {"_id": "singleton", "skills": 1, "epoch": "first"}
+    assert updated == {"skills": 2, "epoch": "first"}
+
+
+async def test_unique_index_rejects_duplicates():
+    messages = MemoryDatabase().contact_messages
+    await messages.create_index("id", unique=True)
+    await messages.insert_one({"id": "m1"})
+
+    with pytest.raises(DuplicateKeyError):
+        await messages.insert_one({"id": "m1"})
+    # An upsert whose filter misses still inserts, and so still collides
+    with pytest.raises(DuplicateKeyError):
+        await messages.update_one({"_id": "m1", "id": {"$exists": False}}, {"$set": {"id": "m1"}}, upsert=True)
+    assert await messages.count_documents({}) == 1
+
+
+async def test_watch_reports_writes_to_matched_collections_only():
+    db = MemoryDatabase()
+    async with db.watch([{"$match": {"ns.coll": {"$in": ["skills"]}}}]) as stream:
+        await db.projects.insert_one({"id": "p"})
+        await db.skills.update_one({"_id": "singleton"}, {"$set": {"technical": []}}, upsert=True)
+        change = await asyncio.wait_for(stream.__anext__(), 1)
+
+    assert change["ns"]["coll"] == "skills"
+    assert stream.resume_token == change["_id"]
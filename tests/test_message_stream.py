@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+
+from broadcast import EventBroadcaster
+
+pytestmark = pytest.mark.anyio
+
+
+def parse(frame):
+    """(id, event, data) of an SSE message frame"""
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().splitlines())
+    return fields["id"], fields["event"], json.loads(fields["data"])
+
+
+async def frames(broadcaster, count, last_event_id=None):
+    """The first ``count`` frames after the connect preamble"""
+    received = []
+    stream = broadcaster.subscribe(last_event_id)
+    try:
+        assert (await stream.__anext__()).startswith(b"retry: ")
+        while len(received) < count:
+            received.append(await asyncio.wait_for(stream.__anext__(), 1))
+    finally:
+        await stream.aclose()
+    return received
+
+
+async def test_every_subscriber_gets_each_event():
+    broadcaster = EventBroadcaster()
+    readers = [asyncio.create_task(frames(broadcaster, 2)) for _ in range(3)]
+    # Let every reader get past the preamble and start waiting
+    await asyncio.sleep(0.05)
+
+    broadcaster.publish("created", {"n": 1})
+    broadcaster.publish("created", {"n": 2})
+
+    for received in await asyncio.gather(*readers):
+        assert [parse(frame)[2] for frame in received] == [{"n": 1}, {"n": 2}]
+    assert broadcaster.subscribers == 0
+
+
+async def test_reconnect_resumes_after_last_event_id():
+    broadcaster = EventBroadcaster()
+    first = broadcaster.publish("created", {"n": 1})
+    broadcaster.publish("created", {"n": 2})
+    broadcaster.publish("created", {"n": 3})
+
+    received = await frames(broadcaster, 2, last_event_id=first)
+
+    assert [parse(frame)[2] for frame in received] == [{"n": 2}, {"n": 3}]
+
+
+async def test_unknown_last_event_id_gets_a_reset():
+    broadcaster = EventBroadcaster()
+    broadcaster.publish("created", {"n": 1})
+
+    received = await frames(broadcaster, 1, last_event_id="another-process-7")
+
+    assert parse(received[0])[1:] == ("reset", {"reason": "unknown_last_event_id"})
+
+
+async def test_events_aged_out_of_history_get_a_reset():
+    broadcaster = EventBroadcaster(history=2)
+    first = broadcaster.publish("created", {"n": 1})
+    for n in range(2, 5):
+        broadcaster.publish("created", {"n": n})
+
+    received = await frames(broadcaster, 1, last_event_id=first)
+
+    assert parse(received[0])[1:] == ("reset", {"reason": "lagged"})
+
+
+async def test_idle_stream_sends_keep_alives():
+    broadcaster = EventBroadcaster(heartbeat=0.01)
+
+    assert await frames(broadcaster, 1) == [b": keep-alive\n\n"]
+
+
+async def test_contact_writes_are_published(app, client, monkeypatch):
+    broadcaster = EventBroadcaster()
+    monkeypatch.setattr(app, "message_events", broadcaster)
+    submitted = await client.post("/api/contact/messages", json={
+        "name": "Visitor", "email": "visitor@example.com", "subject": "Hi", "message": "Hello",
+    })
+    message_id = submitted.json()["id"]
+    await client.patch(f"/api/contact/messages/{message_id}", json={"status": "read"})
+
+    # Resuming from before the first event replays both
+    received = await frames(broadcaster, 2, last_event_id=broadcaster.event_id(0))
+
+    (_, created, message), (_, status, change) = [parse(frame) for frame in received]
+    assert (created, message["id"]) == ("created", message_id)
+    assert (status, change) == ("status", {"id": message_id, "status": "read", "previous_status": "unread"})
+
+
+async def test_stream_endpoint_is_an_uncached_event_stream(app):
+    response = await app.stream_contact_messages(type("Request", (), {"headers": {}})())
+
+    assert response.media_type == "text/event-stream"
+    assert response.headers["cache-control"] == "no-cache"
+    await response.body_iterator.aclose()
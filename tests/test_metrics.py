@@ -0,0 +1,69 @@
+import pytest
+
+from metrics import Registry, stats_gauges
+
+pytestmark = pytest.mark.anyio
+
+
+def samples(text):
+    """Exposition lines keyed by series (name and labels), comments skipped"""
+    series = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            series[name] = float(value)
+    return series
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, "/a")
+
+    series = samples(registry.render())
+
+    assert series['latency_seconds_bucket{route="/a",le="0.1"}'] == 1
+    assert series['latency_seconds_bucket{route="/a",le="1.0"}'] == 2
+    assert series['latency_seconds_bucket{route="/a",le="+Inf"}'] == 3
+    assert series['latency_seconds_count{route="/a"}'] == 3
+    assert series['latency_seconds_sum{route="/a"}'] == pytest.approx(5.55)
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    registry.counter("things_total", "Things", ("name",)).inc('say "hi"\n')
+
+    assert 'things_total{name="say \\"hi\\"\\n"} 1' in registry.render()
+
+
+def test_stats_gauges_flatten_nested_stats():
+    collect = stats_gauges("component_stat", "Stats", lambda: {"cache": {"hits": 3, "enabled": True, "name": "x"}})
+
+    assert collect()[2:] == ['component_stat{component="cache",stat="hits"} 3']
+
+
+async def test_scrape_reports_requests_by_route_template(app, client):
+    await client.get("/api/projects")
+    await client.patch("/api/contact/messages/missing", json={"status": "read"})
+
+    response = await client.get("/api/metrics")
+    series = samples(response.text)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert series['portfolio_http_requests_total{method="GET",route="/api/projects",status="200"}'] >= 1
+    # Route templates, not raw paths, so ids don't explode the label space
+    assert series['portfolio_http_requests_total{method="PATCH",route="/api/contact/messages/{message_id}",status="404"}'] >= 1
+    assert 'portfolio_http_request_duration_seconds_bucket{method="GET",route="/api/projects",le="+Inf"}' in series
+    assert not any("/missing" in name for name in series)
+
+
+async def test_scrape_reports_database_operations(app, client):
+    app.instrument_database_manager(app.db_manager, app.db_operation_duration, app.db_operation_errors)
+
+    await client.get("/api/projects")
+    series = samples((await client.get("/api/metrics")).text)
+
+    assert series['portfolio_db_operation_duration_seconds_count{collection="projects",operation="find"}'] >= 1
+    assert any(name.startswith("portfolio_component_stat{") for name in series)
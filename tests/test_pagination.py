@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from models import ContactMessage
+from pagination import decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+
+def test_cursor_round_trips():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 250000)
+
+    token = encode_cursor({"created_at": created_at, "id": "msg-1"})
+
+    assert decode_cursor(token) == (created_at, "msg-1")
+
+
+@pytest.mark.parametrize("token", ["", "not base64!", "eyJjIjoxfQ"])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+
+async def test_pages_cover_every_message_once_newest_first(app, client):
+    # Ties on created_at are broken by id, so none fall between pages
+    same_time = datetime(2024, 1, 1)
+    docs = [
+        ContactMessage(
+            name="Visitor",
+            email=f"visitor{i}@example.com",
+            subject="Hello",
+            message="A message long enough to be valid",
+            created_at=same_time if i % 2 else datetime(2024, 1, 2, 0, i),
+        ).dict()
+        for i in range(7)
+    ]
+    await app.db_manager.messages_collection.insert_many(docs)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/contact/messages", params=params)
+        assert response.status_code == 200
+        seen.extend(message["id"] for message in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    expected = sorted(docs, key=lambda doc: (doc["created_at"], doc["id"]), reverse=True)
+    assert seen == [doc["id"] for doc in expected]
+
+
+async def test_invalid_cursor_is_a_bad_request(client):
+    response = await client.get("/api/contact/messages", params={"cursor": "garbage"})
+
+    assert response.status_code == 400
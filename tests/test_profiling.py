@@ -0,0 +1,95 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from profiling import Profiler, RequestProfile, _current, instrument_methods, span
+
+pytestmark = pytest.mark.anyio
+
+BACKEND = Path(__file__).resolve().parent.parent / "backend"
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def entry(duration_ms):
+    return {"method": "GET", "path": "/api/portfolio", "route": "/api/portfolio", "status": 200, "duration_ms": duration_ms}
+
+
+def test_spans_are_no_ops_outside_a_profiled_request():
+    with span("db.get_portfolio"):
+        pass
+
+
+async def test_spans_nest_under_their_caller():
+    class Manager:
+        async def outer(self):
+            with span("inner"):
+                return "done"
+
+    manager = Manager()
+    instrument_methods(manager, "db")
+    profile = RequestProfile()
+    token = _current.set(profile)
+    try:
+        assert await manager.outer() == "done"
+    finally:
+        _current.reset(token)
+
+    assert [(s["name"], s["depth"]) for s in profile.spans] == [("inner", 2), ("db.outer", 1)]
+
+
+def test_only_requests_over_the_threshold_are_written(tmp_path):
+    profiler = Profiler(tmp_path / "requests.jsonl", threshold_ms=50)
+
+    profiler.record(entry(10), RequestProfile(), sampled=False)
+    profiler.record(entry(75), RequestProfile(), sampled=False)
+
+    records = read_records(tmp_path / "requests.jsonl")
+    assert [record["duration_ms"] for record in records] == [75]
+    assert records[0]["sampled"] is False
+    assert profiler.stats()["profiled"] == 2
+    assert profiler.stats()["written"] == 1
+
+
+def test_sampled_requests_are_written_whatever_their_duration(tmp_path):
+    profiler = Profiler(tmp_path / "requests.jsonl", sample_rate=1.0)
+
+    profiler.record(entry(1), RequestProfile(), sampled=profiler.should_sample())
+
+    assert read_records(tmp_path / "requests.jsonl")[0]["sampled"] is True
+
+
+def test_server_writes_span_breakdowns_when_enabled(tmp_path):
+    # Profiling is wired up at import, so it needs a fresh interpreter
+    log = tmp_path / "profiles" / "requests.jsonl"
+    script = textwrap.dedent("""
+        import asyncio
+        import httpx
+        import server
+
+        async def main():
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+                assert (await client.get("/api/portfolio")).status_code == 200
+                response = await client.put("/api/skills", json={"technical": ["Profiled"], "transferable": []})
+                assert response.status_code == 200
+
+        asyncio.run(main())
+    """)
+    env = dict(os.environ, PROFILE_SAMPLE_RATE="1", PROFILE_LOG=str(log))
+
+    subprocess.run([sys.executable, "-c", script], cwd=BACKEND, env=env, check=True, timeout=60)
+
+    records = read_records(log)
+    assert [(record["method"], record["route"]) for record in records] == [
+        ("GET", "/api/portfolio"), ("PUT", "/api/skills"),
+    ]
+    names = {s["name"] for s in records[0]["spans"]}
+    assert {"endpoint", "db.get_portfolio_snapshot"} <= names
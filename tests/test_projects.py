@@ -0,0 +1,73 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def project(title, category, technologies):
+    return {
+        "title": title,
+        "description": f"{title} description",
+        "technologies": technologies,
+        "category": category,
+        "image": "project.png",
+    }
+
+
+def counts(facets, field):
+    return {facet["value"]: facet["count"] for facet in facets[field]}
+
+
+async def test_facets_follow_batch_creates_and_deletes(app, client):
+    await client.get("/api/portfolio")
+    before = (await client.get("/api/projects/facets")).json()
+
+    response = await client.post("/api/projects:batch", json=[
+        project("Alpha", "Tooling", ["Zig", "Python"]),
+        project("Beta", "Tooling", ["Zig", "Zig"]),
+        {"title": "Invalid"},
+    ])
+    created = [result["id"] for result in response.json()["results"] if result["status"] == "created"]
+    after_create = (await client.get("/api/projects/facets")).json()
+    await app.db_manager.delete_project(created[0])
+    after_delete = (await client.get("/api/projects/facets")).json()
+
+    assert len(created) == 2
+    assert after_create["total"] == before["total"] + 2
+    assert counts(after_create, "category")["Tooling"] == 2
+    # A technology listed twice still counts its project once
+    assert counts(after_create, "technologies")["Zig"] == 2
+    assert after_delete["total"] == before["total"] + 1
+    assert counts(after_delete, "category")["Tooling"] == 1
+    assert counts(after_delete, "technologies")["Zig"] == 1
+    assert "Python" not in counts(after_delete, "technologies")
+
+
+async def test_filters_select_projects(client):
+    await client.post("/api/projects:batch", json=[
+        project("Alpha", "Tooling", ["Zig", "Python"]),
+        project("Beta", "Tooling", ["Zig"]),
+        project("Gamma", "Games", ["Python"]),
+    ])
+
+    tooling = (await client.get("/api/projects", params={"category": "Tooling"})).json()
+    both = (await client.get("/api/projects", params=[("technology", "Python"), ("technology", "Zig")])).json()
+
+    assert sorted(item["title"] for item in tooling) == ["Alpha", "Beta"]
+    assert [item["title"] for item in both] == ["Alpha"]
+
+
+async def test_filtered_lists_have_their_own_etags(client):
+    await client.get("/api/portfolio")
+    everything = await client.get("/api/projects")
+    filtered = await client.get("/api/projects", params={"category": "Web"})
+    reordered = [
+        await client.get("/api/projects", params=[("technology", a), ("technology", b)])
+        for a, b in (("React", "Python"), ("Python", "React"))
+    ]
+
+    assert everything.headers["etag"] != filtered.headers["etag"]
+    assert reordered[0].headers["etag"] == reordered[1].headers["etag"] != everything.headers["etag"]
+    response = await client.get(
+        "/api/projects", params={"category": "Web"}, headers={"If-None-Match": everything.headers["etag"]}
+    )
+    assert response.status_code == 200
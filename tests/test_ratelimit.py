@@ -0,0 +1,83 @@
+import pytest
+
+from ratelimit import DuplicateSuppressor, TokenBucketLimiter
+
+pytestmark = pytest.mark.anyio
+
+
+def message(text, email="visitor@example.com"):
+    return {"name": "Visitor", "email": email, "subject": "Hello", "message": text}
+
+
+def test_bucket_spends_its_burst_then_says_when_to_retry():
+    limiter = TokenBucketLimiter(rate=0.5, burst=2)
+
+    assert limiter.allow("a") == (True, 0.0)
+    assert limiter.allow("a") == (True, 0.0)
+    allowed, retry_after = limiter.allow("a")
+
+    assert not allowed
+    assert 0 < retry_after <= 2
+    # Other keys have buckets of their own
+    assert limiter.allow("b") == (True, 0.0)
+
+
+def test_bucket_forgets_the_least_recent_key_past_max_keys():
+    limiter = TokenBucketLimiter(rate=0.01, burst=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.allow(key)
+
+    assert limiter.evictions == 1
+    # "a" was evicted, so it starts over with a full bucket
+    assert limiter.allow("a") == (True, 0.0)
+
+
+def test_suppressor_remembers_until_the_window_ends(monkeypatch):
+    suppressor = DuplicateSuppressor(window=10)
+    fingerprint = suppressor.fingerprint("a", "b")
+    suppressor.remember(fingerprint, "id-1")
+
+    assert suppressor.lookup(fingerprint) == "id-1"
+    monkeypatch.setattr("ratelimit.time.monotonic", lambda: float("inf"))
+    assert suppressor.lookup(fingerprint) is None
+
+
+async def test_flood_from_one_ip_gets_429_with_retry_after(app, client, monkeypatch):
+    monkeypatch.setattr(app, "contact_ip_limiter", TokenBucketLimiter(rate=0.01, burst=2))
+
+    statuses = []
+    for index in range(3):
+        response = await client.post("/api/contact/messages", json=message(f"Message {index}"))
+        statuses.append(response.status_code)
+
+    assert statuses == [200, 200, 429]
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+async def test_each_address_is_limited_whatever_its_case(app, client, monkeypatch):
+    monkeypatch.setattr(app, "contact_email_limiter", TokenBucketLimiter(rate=0.01, burst=1))
+
+    first = await client.post("/api/contact/messages", json=message("First"))
+    second = await client.post("/api/contact/messages", json=message("Second", email="VISITOR@example.com"))
+    other = await client.post("/api/contact/messages", json=message("Third", email="other@example.com"))
+
+    assert (first.status_code, second.status_code, other.status_code) == (200, 429, 200)
+
+
+async def test_repeated_submission_returns_the_same_id_once_stored(client):
+    first = await client.post("/api/contact/messages", json=message("Same text"))
+    repeat = await client.post("/api/contact/messages", json=message("  Same text  "))
+    stored = (await client.get("/api/contact/messages")).json()
+
+    assert repeat.status_code == 200
+    assert repeat.json()["id"] == first.json()["id"]
+    assert [msg["id"] for msg in stored] == [first.json()["id"]]
+
+
+async def test_repeat_is_not_counted_against_the_address(app, client, monkeypatch):
+    monkeypatch.setattr(app, "contact_email_limiter", TokenBucketLimiter(rate=0.01, burst=1))
+
+    first = await client.post("/api/contact/messages", json=message("Same text"))
+    repeat = await client.post("/api/contact/messages", json=message("Same text"))
+
+    assert (first.status_code, repeat.status_code) == (200, 200)
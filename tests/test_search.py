@@ -0,0 +1,78 @@
+import pytest
+
+from search import SearchIndex
+
+pytestmark = pytest.mark.anyio
+
+
+def project(id, title, description="", technologies=(), category="web"):
+    return {"id": id, "title": title, "description": description, "technologies": list(technologies), "category": category}
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.add_many("project", [
+        project("title", "Kafka pipeline", "Streams events"),
+        project("description", "Event system", "Moves records through kafka"),
+        project("repeated", "Queue", "kafka consumers and kafka producers"),
+        project("unrelated", "Portfolio site", "Static pages", ["React"]),
+    ])
+    index.add("experience", {
+        "id": "job", "position": "Data engineer", "company": "Acme", "responsibilities": ["Ran kafka clusters"],
+    })
+    return index
+
+
+def test_title_matches_outrank_description_matches(index):
+    total, hits = index.search("kafka", kinds=["project"])
+
+    assert total == 3
+    assert hits[0]["id"] == "title"
+    assert hits[-1]["id"] == "description"
+    assert [hit["score"] for hit in hits] == sorted((hit["score"] for hit in hits), reverse=True)
+
+
+def test_rare_terms_weigh_more_than_common_ones(index):
+    _, hits = index.search("kafka events")
+
+    # "events" is in one document only; matching it beats one more "kafka"
+    assert hits[0]["id"] == "title"
+
+
+def test_last_term_matches_as_prefix(index):
+    total, hits = index.search("kaf")
+
+    assert total == 4
+    assert index.search("portfolio si")[1][0]["id"] == "unrelated"
+
+
+def test_filters_and_paging(index):
+    total, page = index.search("kafka", limit=2, offset=2)
+
+    assert total == 4
+    assert len(page) == 2
+    assert [hit["type"] for hit in index.search("kafka", kinds=["experience"])[1]] == ["experience"]
+    assert index.search("kafka", category="ml") == (0, [])
+
+
+def test_removed_and_replaced_documents_stop_matching(index):
+    index.remove("project", "title")
+    assert "title" not in [hit["id"] for hit in index.search("kafka")[1]]
+
+    index.replace("project", [project("new", "Kafka connectors")])
+
+    assert [hit["id"] for hit in index.search("kafka", kinds=["project"])[1]] == ["new"]
+
+
+async def test_search_endpoint_ranks_seeded_documents(client):
+    await client.get("/api/portfolio")
+    projects = (await client.get("/api/projects")).json()
+    title = projects[0]["title"]
+
+    response = await client.get("/api/search", params={"q": title, "type": "project"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] >= 1
+    assert body["results"][0]["id"] == projects[0]["id"]
@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"value": calls}
+
+    waiters = [asyncio.ensure_future(flight.do("key", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+
+async def test_errors_reach_every_waiter_and_are_not_kept():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("down")
+
+    results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+    assert flight.stats()["in_flight"] == 0
+
+
+async def test_one_caller_cancelling_does_not_cancel_the_others():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("key", load))
+    second = asyncio.ensure_future(flight.do("key", load))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
+
+
+async def test_callers_after_forget_start_afresh():
+    flight = SingleFlight()
+    releases = [asyncio.Event(), asyncio.Event()]
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        call = calls
+        await releases[call - 1].wait()
+        return call
+
+    before = asyncio.ensure_future(flight.do("key", load))
+    await asyncio.sleep(0)
+    flight.forget()
+    after = asyncio.ensure_future(flight.do("key", load))
+    await asyncio.sleep(0)
+    releases[0].set()
+    assert await before == 1
+    # The forgotten task finishing must not drop its replacement
+    assert flight.stats()["in_flight"] == 1
+    releases[1].set()
+
+    assert await after == 2
+
+
+async def test_read_after_write_does_not_join_a_read_from_before_it(app, client):
+    # Regression: a GET issued after a PUT returned the skills a slower GET,
+    # started before the PUT, had read
+    await client.get("/api/portfolio")
+    skills = app.db_manager.skills_collection
+    find_one = skills.find_one
+
+    async def slow_find_one(*args, **kwargs):
+        doc = await find_one(*args, **kwargs)
+        await asyncio.sleep(0.3)
+        return doc
+
+    skills.find_one = slow_find_one
+    before = asyncio.ensure_future(client.get("/api/skills"))
+    await asyncio.sleep(0.05)
+    skills.find_one = find_one
+
+    response = await client.put("/api/skills", json={"technical": ["NEW"], "transferable": []})
+    assert response.status_code == 200
+    after = await client.get("/api/skills")
+    await before
+    app.portfolio_cache.clear()
+    portfolio = await client.get("/api/portfolio")
+
+    assert after.json()["technical"] == ["NEW"]
+    assert portfolio.json()["skills"]["technical"] == ["NEW"]
+
+
+async def test_forget_drops_only_the_written_collections_reads():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def load(name):
+        await release.wait()
+        return name
+
+    skills = asyncio.ensure_future(flight.do(("skills", "get_skills"), load, "skills"))
+    projects = asyncio.ensure_future(flight.do(("projects", "get_all_projects"), load, "projects"))
+    await asyncio.sleep(0)
+    flight.forget("skills")
+
+    assert flight.stats()["in_flight"] == 1
+    joined = asyncio.ensure_future(flight.do(("projects", "get_all_projects"), load, "projects"))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(skills, projects, joined)
+    assert flight.stats()["coalesced"] == 1
+
+
+async def test_contact_submissions_do_not_break_coalescing(app, client):
+    await client.get("/api/portfolio")
+    projects = app.db_manager.projects_collection
+    find = projects.find
+    release = asyncio.Event()
+
+    class SlowCursor:
+        def __init__(self, cursor):
+            self.cursor = cursor
+
+        def __getattr__(self, name):
+            return getattr(self.cursor, name)
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            await release.wait()
+            return await self.cursor.__anext__()
+
+    projects.find = lambda *args, **kwargs: SlowCursor(find(*args, **kwargs))
+    first = asyncio.ensure_future(app.db_manager.get_all_projects())
+    await asyncio.sleep(0)
+    message = {"name": "Visitor", "email": "visitor@example.com", "subject": "Hi", "message": "Hello there, nice site"}
+    assert (await client.post("/api/contact/messages", json=message)).status_code == 200
+    second = asyncio.ensure_future(app.db_manager.get_all_projects())
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first is await second
+    projects.find = find
+
+
+async def test_reads_work_with_profiling_instrumentation(app, client):
+    # Profiling wraps each DatabaseManager method per instance; uncoalesced
+    # snapshot rebuilds go through those wrappers too
+    app.instrument_methods(app.db_manager, "db")
+
+    assert (await client.get("/api/portfolio")).status_code == 200
+    response = await client.put("/api/skills", json={"technical": ["Profiled"], "transferable": []})
+    assert response.status_code == 200
+    app.portfolio_cache.clear()
+    assert (await client.get("/api/portfolio")).json()["skills"]["technical"] == ["Profiled"]
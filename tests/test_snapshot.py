@@ -0,0 +1,77 @@
+import json
+from datetime import timedelta
+
+import pytest
+
+from snapshot import build_portfolio_snapshot
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_build_seeds_and_stores_the_encoded_payload(app):
+    snapshot = await build_portfolio_snapshot(app.db_manager)
+    stored = await app.db_manager.get_portfolio_snapshot(coalesced=False)
+
+    payload = json.loads(snapshot["body"])
+    assert payload["projects"] and payload["experience"]
+    assert stored["etag"] == snapshot["etag"]
+    assert stored["size"] == len(snapshot["body"])
+    assert stored["version"] == 1
+
+
+async def test_unchanged_content_keeps_its_etag_across_rebuilds(app):
+    first = await build_portfolio_snapshot(app.db_manager)
+    second = await build_portfolio_snapshot(app.db_manager)
+
+    assert second["version"] == first["version"] + 1
+    assert second["etag"] == first["etag"]
+
+
+async def test_an_older_read_never_replaces_a_newer_snapshot(app):
+    current = await build_portfolio_snapshot(app.db_manager)
+    stale = {"body": b"{}", "etag": "stale", "last_modified": None, "size": 2}
+
+    saved = await app.db_manager.save_portfolio_snapshot(stale, current["read_at"] - timedelta(seconds=1))
+    stored = await app.db_manager.get_portfolio_snapshot(coalesced=False)
+
+    assert saved is None
+    assert stored["etag"] == current["etag"]
+    assert stored["version"] == current["version"]
+
+
+async def test_portfolio_is_served_from_the_snapshot(app, client):
+    await client.get("/api/portfolio")
+    stored = await app.db_manager.get_portfolio_snapshot(coalesced=False)
+    # Changed behind the API's back, so only the snapshot has it
+    await app.db_manager.snapshot_collection.update_one(
+        {"_id": stored["_id"]}, {"$set": {"body": b'{"served": "snapshot"}'}}
+    )
+    app.portfolio_cache.clear()
+
+    response = await client.get("/api/portfolio")
+
+    assert response.json() == {"served": "snapshot"}
+
+
+async def test_a_write_rebuilds_the_snapshot(app, client):
+    await client.get("/api/portfolio")
+    before = await app.db_manager.get_portfolio_snapshot(coalesced=False)
+
+    await client.put("/api/skills", json={"technical": ["Rebuilt"], "transferable": []})
+    after = await app.db_manager.get_portfolio_snapshot(coalesced=False)
+
+    assert after["version"] > before["version"]
+    assert after["read_at"] > before["read_at"]
+    assert json.loads(after["body"])["skills"]["technical"] == ["Rebuilt"]
+    assert (await client.get("/api/portfolio")).json()["skills"]["technical"] == ["Rebuilt"]
+
+
+async def test_a_missing_snapshot_is_rebuilt_on_read(app, client):
+    await client.get("/api/portfolio")
+    await app.db_manager.delete_portfolio_snapshot()
+    app.portfolio_cache.clear()
+
+    response = await client.get("/api/portfolio")
+
+    assert response.status_code == 200
+    assert await app.db_manager.get_portfolio_snapshot(coalesced=False) is not None
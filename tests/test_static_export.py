@@ -0,0 +1,82 @@
+import gzip
+import json
+
+import pytest
+
+from export_static import MANIFEST_NAME, export_portfolio, read_manifest, write_export
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def export_dir(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "STATIC_EXPORT_DIR", tmp_path)
+    return tmp_path
+
+
+def test_export_writes_hashed_files_and_the_manifest(tmp_path):
+    manifest = write_export(b'{"a": 1}', "0123456789abcdef0123", tmp_path)
+
+    name = "portfolio.0123456789abcdef.json"
+    assert manifest["portfolio"] == name
+    assert read_manifest(tmp_path) == manifest
+    assert (tmp_path / name).read_bytes() == b'{"a": 1}'
+    assert gzip.decompress((tmp_path / (name + ".gz")).read_bytes()) == b'{"a": 1}'
+    assert manifest["size"]["identity"] == 8
+
+
+def test_old_exports_are_kept_up_to_keep(tmp_path):
+    for index in range(3):
+        write_export(b"{}", f"{index:016x}", tmp_path, keep=2)
+
+    manifest = read_manifest(tmp_path)
+    assert manifest["history"] == [f"portfolio.{index:016x}.json" for index in (2, 1)]
+    assert not (tmp_path / f"portfolio.{0:016x}.json").exists()
+    assert not (tmp_path / f"portfolio.{0:016x}.json.gz").exists()
+    assert (tmp_path / f"portfolio.{1:016x}.json").exists()
+
+
+async def test_exported_payload_matches_the_api(app, client, export_dir):
+    manifest = await export_portfolio(app.db_manager, export_dir)
+
+    exported = json.loads((export_dir / manifest["portfolio"]).read_bytes())
+    assert exported == (await client.get("/api/portfolio")).json()
+
+
+async def test_hashed_export_is_served_immutable(app, client, export_dir):
+    manifest = await export_portfolio(app.db_manager, export_dir)
+
+    response = await client.get(f"/api/static/{manifest['portfolio']}")
+
+    assert response.status_code == 200
+    assert "immutable" in response.headers["cache-control"]
+    assert "content-encoding" not in response.headers
+    assert response.content == (export_dir / manifest["portfolio"]).read_bytes()
+
+
+async def test_precompressed_variant_is_chosen_by_accept_encoding(app, client, export_dir):
+    manifest = await export_portfolio(app.db_manager, export_dir)
+    name = manifest["portfolio"]
+
+    response = await client.get(f"/api/static/{name}", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == (export_dir / (name + ".gz")).stat().st_size
+    assert response.content == (export_dir / name).read_bytes()
+
+
+async def test_manifest_is_revalidated(app, client, export_dir):
+    manifest = await export_portfolio(app.db_manager, export_dir)
+
+    response = await client.get(f"/api/static/{MANIFEST_NAME}")
+
+    assert "immutable" not in response.headers["cache-control"]
+    assert response.json()["portfolio"] == manifest["portfolio"]
+
+
+@pytest.mark.parametrize("filename", ["other.json", "portfolio.0123456789abcdef.json"])
+async def test_unknown_or_missing_files_are_404(client, export_dir, filename):
+    response = await client.get(f"/api/static/{filename}")
+
+    assert response.status_code == 404
@@ -0,0 +1,107 @@
+import asyncio
+import os
+
+import pytest
+
+from write_behind import WriteBehindQueue
+
+pytestmark = pytest.mark.anyio
+
+
+def spool_files(spool_dir, suffix=".jsonl"):
+    return sorted(path.name for path in spool_dir.iterdir() if path.name.endswith(suffix))
+
+
+async def never_flush(batch):
+    await asyncio.Event().wait()
+
+
+def crash(queue):
+    """Stop ``queue`` the way a killed process would: nothing flushed, lock released"""
+    queue._task.cancel()
+    os.close(queue._owner_lock)
+
+
+async def test_flushed_segments_are_deleted(tmp_path):
+    flushed = []
+
+    async def flush(batch):
+        flushed.extend(batch)
+
+    queue = WriteBehindQueue(flush, spool_dir=tmp_path, max_batch=10, max_delay=0.01)
+    await queue.start()
+    for i in range(25):
+        await queue.put({"id": i})
+    await queue.drain()
+
+    assert [doc["id"] for doc in flushed] == list(range(25))
+    assert queue.stats()["spool_segments"] == 0
+    assert spool_files(tmp_path) == []
+    assert spool_files(tmp_path, ".lock") == []
+
+
+async def test_documents_of_an_exited_process_are_replayed(tmp_path):
+    crashed = WriteBehindQueue(never_flush, spool_dir=tmp_path, max_delay=0.01)
+    await crashed.start()
+    for i in range(3):
+        await crashed.put({"id": i})
+    crash(crashed)
+    # A torn final line was never acknowledged, so it is skipped
+    segment, = spool_files(tmp_path)
+    with open(tmp_path / segment, "ab") as spool:
+        spool.write(b'{"id": 3')
+
+    flushed = []
+
+    async def flush(batch):
+        flushed.extend(batch)
+
+    queue = WriteBehindQueue(flush, spool_dir=tmp_path, max_delay=0.01)
+    await queue.start()
+    await queue.drain()
+
+    assert sorted(doc["id"] for doc in flushed) == [0, 1, 2]
+    assert queue.stats()["replayed"] == 3
+    assert spool_files(tmp_path) == []
+
+
+async def test_a_running_process_keeps_its_own_segments(tmp_path):
+    busy = WriteBehindQueue(never_flush, spool_dir=tmp_path, max_delay=0.01)
+    await busy.start()
+    await busy.put({"id": "busy"})
+
+    flushed = []
+
+    async def flush(batch):
+        flushed.extend(batch)
+
+    queue = WriteBehindQueue(flush, spool_dir=tmp_path, max_delay=0.01)
+    await queue.start()
+    await queue.put({"id": "own"})
+    await queue.drain()
+
+    assert flushed == [{"id": "own"}]
+    assert queue.stats()["replayed"] == 0
+    assert [name.split(".")[0] for name in spool_files(tmp_path)] == [busy.owner]
+    crash(busy)
+
+
+async def test_rejected_documents_are_not_spooled(tmp_path):
+    queue = WriteBehindQueue(
+        never_flush, spool_dir=tmp_path, max_batch=1, max_delay=0.01, max_pending=2, enqueue_timeout=0.05
+    )
+    await queue.start()
+    # The flusher takes this one and never finishes it
+    await queue.put({"id": "stuck"})
+    while queue.stats()["pending"]:
+        await asyncio.sleep(0.01)
+
+    results = await asyncio.gather(*(queue.put({"id": i}) for i in range(6)), return_exceptions=True)
+
+    rejected = [result for result in results if isinstance(result, asyncio.QueueFull)]
+    stats = queue.stats()
+    assert len(rejected) == stats["rejected"] == 4
+    assert stats["accepted"] == stats["unflushed"] == 3
+    spooled = b"".join((tmp_path / segment).read_bytes() for segment in spool_files(tmp_path))
+    assert len(spooled.splitlines()) == 3
+    crash(queue)